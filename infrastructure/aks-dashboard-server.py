@@ -7,148 +7,642 @@ Flask server to serve the AKS HTML dashboard with refresh functionality.
 """
 
 import json
+import math
 import os
-import subprocess
 import sys
+import threading
+import time
+from dataclasses import replace
 from datetime import datetime
-from flask import Flask, render_template_string, jsonify, request, send_from_directory
-from pathlib import Path
+from flask import Flask, Response, jsonify, request, send_from_directory
+from typing import Optional
 
 # Import the dashboard generator
-import sys
-import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-from aks_html_dashboard import AKSDashboardGenerator
+from aks_html_dashboard import AKSDashboardGenerator, ClusterTarget, load_cluster_targets
+from aks_ages import age_seconds, format_ages, parse_age, select_by_age
+from aks_collector import CollectionResult, DashboardCollector
+from aks_fleet import ClusterCollection, FleetCollector
+from aks_diff import PodHashes
+from aks_events import DEFAULT_MAX_CLIENTS, EventBroker
+from aks_fragment_cache import FragmentCache
+from aks_history import SnapshotHistory
+from aks_history_store import DEFAULT_HISTORY_PATH, HistoryStore
+from aks_http_cache import CachedPage
+from aks_pod_index import PodIndex
+from aks_snapshot import DEFAULT_MIN_INTERVAL, ClusterSnapshot, DashboardSnapshot, SnapshotRefresher
+from aks_snapshot_store import DEFAULT_SNAPSHOT_PATH, SnapshotStore, StoredCluster, StoredSnapshot
+from aks_templates import IMMUTABLE_CACHE_CONTROL, STATIC_DIR, STATIC_URL, get_templates
 
-app = Flask(__name__)
+app = Flask(__name__, static_folder=str(STATIC_DIR), static_url_path=STATIC_URL)
 
-# Global variable to store the dashboard generator
-dashboard_generator = None
+# Global variables to store the generators (one per subscription), collectors and snapshot refresher
+dashboard_generators = {}
+dashboard_collectors = {}
+# Rendered namespace/node cards per cluster key, reused across refreshes
+fragment_caches = {}
+# Lazily loaded namespace and node details of the current snapshot generation, by (cluster key, kind, name)
+fragment_pages = {}
+fragment_pages_generation = 0
+fragment_pages_lock = threading.Lock()
+fleet_collector = None
+snapshot_refresher = None
+# Pushes snapshot deltas to open pages over Server-Sent Events
+event_broker = EventBroker()
+# Keeps the latest snapshot on disk for warm starts
+snapshot_store = None
+# Health time series recorded from every collected snapshot
+snapshot_history = SnapshotHistory()
 
 def load_config():
-    """Load Azure configuration"""
+    """Load the dashboard configuration file"""
     try:
         with open('azure-visualization-config.json', 'r') as f:
-            config = json.load(f)
-        return config['azure']
+            return json.load(f)
     except Exception as e:
         print(f"Error loading config: {e}")
         return None
 
+def get_generator(target: ClusterTarget) -> AKSDashboardGenerator:
+    """Get the dashboard generator for a cluster's subscription"""
+    return dashboard_generators[target.subscription_id]
+
+def get_collector(target: ClusterTarget) -> DashboardCollector:
+    """Get the concurrent collector for a cluster's subscription"""
+    return dashboard_collectors[target.subscription_id]
+
+def get_fragment_cache(target: ClusterTarget) -> FragmentCache:
+    """Get the page fragment cache of a cluster"""
+    return fragment_caches.setdefault(target.key, FragmentCache())
+
+def render_cluster_page(target: ClusterTarget, cluster_info, resources, kubernetes_pods, pod_index: PodIndex,
+                        generation: Optional[int], last_modified: float) -> CachedPage:
+    """Render the detailed page of one cluster for a snapshot generation"""
+    # Stream the page straight into the hash and compressors; only the compressed copy is kept
+    chunks = get_generator(target)._iter_html_template(
+        cluster_info, resources, kubernetes_pods, pod_index=pod_index,
+        fragments=get_fragment_cache(target),
+        fragment_url=f"/cluster/{target.key}/fragment/",
+        generation=generation,
+        # Live updates are keyed by the configured target, which may differ from Azure's spelling
+        cluster_key=target.key
+    )
+    return CachedPage.from_chunks(chunks, last_modified)
+
+def build_cluster_snapshot(collection, previous: ClusterSnapshot = None, generation: int = None,
+                           collected_at: Optional[float] = None) -> ClusterSnapshot:
+    """Render one cluster's collection, keeping older data if this collection failed"""
+    result = collection.result
+    if collection.error and previous and previous.cluster_info:
+        # The kept data is rendered again so the page carries this generation; open pages
+        # would otherwise resume events from an old one and reset once it leaves the history
+        page = render_cluster_page(collection.target, previous.cluster_info, previous.resources,
+                                   previous.kubernetes_pods, previous.pod_index, generation,
+                                   previous.collected_at)
+        return replace(previous, error=collection.error, page=page)
+    if collection.error:
+        return ClusterSnapshot(
+            target=collection.target,
+            collected_at=collected_at or time.time(),
+            cluster_info=None,
+            resources=(),
+            kubernetes_pods=(),
+            timings=dict(result.timings) if result else {},
+            error=collection.error
+        )
+    
+    # A source that failed or timed out comes back empty; show its last known data instead
+    resources, kubernetes_pods = result.resources, result.kubernetes_pods
+    if previous and previous.cluster_info:
+        if 'resources' in result.errors:
+            resources = previous.resources
+        if 'kubernetes_pods' in result.errors:
+            kubernetes_pods = previous.kubernetes_pods
+    
+    # One pass over the pods feeds the page sections and the status aggregates
+    pod_index = PodIndex(kubernetes_pods)
+    collected_at = collected_at or time.time()
+    return ClusterSnapshot(
+        target=collection.target,
+        collected_at=collected_at,
+        cluster_info=result.cluster_info,
+        resources=tuple(resources),
+        kubernetes_pods=tuple(kubernetes_pods),
+        page=render_cluster_page(collection.target, result.cluster_info, resources, kubernetes_pods, pod_index,
+                                 generation, collected_at),
+        timings=dict(result.timings, total=result.elapsed),
+        source_errors={name: error for name, error in result.errors.items() if name != 'cluster_info'},
+        aggregates=pod_index.to_dict(),
+        health=pod_index.rollups.health(),
+        pod_index=pod_index,
+        pod_hashes=PodHashes(kubernetes_pods)
+    )
+
+def collect_snapshot(generation: int) -> DashboardSnapshot:
+    """Collect all clusters and render them into a new snapshot"""
+    previous = snapshot_refresher.current() if snapshot_refresher else None
+    collections = fleet_collector.collect()
+    
+    clusters = tuple(
+        build_cluster_snapshot(collection, previous.cluster(key) if previous else None, generation)
+        for key, collection in collections.items()
+    )
+    if not any(cluster.cluster_info for cluster in clusters):
+        raise RuntimeError("; ".join(f"{c.key}: {c.error}" for c in clusters))
+    
+    return build_dashboard_snapshot(clusters, generation, time.time())
+
+def build_dashboard_snapshot(clusters, generation: int, collected_at: float,
+                             restored: bool = False) -> DashboardSnapshot:
+    """Wrap rendered clusters into a snapshot with its landing page"""
+    # A single cluster keeps its detailed page as the landing page
+    if len(clusters) == 1:
+        page = clusters[0].page
+    else:
+        chunks = get_generator(clusters[0].target)._iter_fleet_html_template(list(clusters), generation=generation)
+        page = CachedPage.from_chunks(chunks, collected_at)
+    
+    return DashboardSnapshot(
+        generation=generation,
+        collected_at=collected_at,
+        clusters=clusters,
+        page=page,
+        restored=restored
+    )
+
+def save_snapshot(previous: Optional[DashboardSnapshot], snapshot: DashboardSnapshot):
+    """SnapshotRefresher listener: persist the collected data of each new snapshot"""
+    snapshot_store.save(StoredSnapshot(
+        generation=snapshot.generation,
+        collected_at=snapshot.collected_at,
+        clusters=[
+            StoredCluster(
+                target=cluster.target,
+                collected_at=cluster.collected_at,
+                cluster_info=cluster.cluster_info,
+                resources=list(cluster.resources),
+                kubernetes_pods=list(cluster.kubernetes_pods),
+                timings=dict(cluster.timings),
+                error=cluster.error,
+                source_errors=dict(cluster.source_errors)
+            )
+            for cluster in snapshot.clusters
+        ]
+    ))
+
+def restore_snapshot(targets) -> Optional[DashboardSnapshot]:
+    """Render the stored snapshot of the configured clusters, to serve while the first collection runs"""
+    stored = snapshot_store.load()
+    if not stored:
+        return None
+    
+    by_key = {cluster.target.key: cluster for cluster in stored.clusters}
+    if any(target.key not in by_key for target in targets):
+        # Pages and events would be missing clusters; wait for a full collection instead
+        print("ℹ️ Stored snapshot doesn't cover the configured clusters, not restoring it")
+        return None
+    
+    clusters = []
+    for target in targets:
+        cluster = by_key[target.key]
+        # Data kept from an earlier collection is stored with the error of the failed one
+        failed = cluster.cluster_info is None
+        collection = ClusterCollection(
+            target=target,
+            result=None if failed else CollectionResult(
+                cluster_info=cluster.cluster_info,
+                resources=cluster.resources,
+                kubernetes_pods=cluster.kubernetes_pods,
+                timings=cluster.timings,
+                errors=cluster.source_errors,
+                elapsed=cluster.timings.get('total', 0.0)
+            ),
+            error=cluster.error if failed else None
+        )
+        built = build_cluster_snapshot(collection, generation=stored.generation, collected_at=cluster.collected_at)
+        clusters.append(replace(built, error=cluster.error))
+    return build_dashboard_snapshot(tuple(clusters), stored.generation, stored.collected_at, restored=True)
+
+def create_resource_inventory(config, targets):
+    """Create the bulk Resource Graph inventory when the config asks for it"""
+    inventory_config = config.get('resource_inventory') or {}
+    if inventory_config.get('backend') != 'resource_graph':
+        return None
+    
+    from azure.identity import ClientSecretCredential
+    from aks_resource_graph import RESOURCE_GRAPH_ENDPOINT, DEFAULT_MAX_AGE, ResourceGraphInventory
+    
+    azure_config = config['azure']
+    inventory = ResourceGraphInventory(
+        ClientSecretCredential(
+            tenant_id=azure_config['tenant_id'],
+            client_id=azure_config['client_id'],
+            client_secret=azure_config['client_secret']
+        ),
+        endpoint=inventory_config.get('endpoint', RESOURCE_GRAPH_ENDPOINT),
+        types=inventory_config.get('types'),
+        tags=inventory_config.get('tags'),
+        max_age=inventory_config.get('max_age', DEFAULT_MAX_AGE)
+    )
+    # Every configured group goes into the same query from the first collection on
+    for target in targets:
+        inventory.register(target.subscription_id, target.resource_group)
+    return inventory
+
 def initialize_dashboard():
-    """Initialize the dashboard generator"""
-    global dashboard_generator
+    """Initialize the dashboard generators and start background collection"""
+    global fleet_collector, snapshot_refresher, event_broker, snapshot_store, snapshot_history
     
-    azure_config = load_config()
-    if not azure_config:
+    config = load_config()
+    if not config or 'azure' not in config:
         print("❌ Failed to load Azure configuration")
         return False
+    azure_config = config['azure']
     
     try:
-        dashboard_generator = AKSDashboardGenerator(
-            subscription_id=azure_config['subscription_id'],
-            tenant_id=azure_config['tenant_id'],
-            client_id=azure_config['client_id'],
-            client_secret=azure_config['client_secret']
+        # Compile the page templates up front rather than on the first collection
+        get_templates()
+        targets = load_cluster_targets(config)
+        resource_inventory = create_resource_inventory(config, targets)
+        for target in targets:
+            if target.subscription_id not in dashboard_generators:
+                generator = AKSDashboardGenerator(
+                    subscription_id=target.subscription_id,
+                    tenant_id=azure_config['tenant_id'],
+                    client_id=azure_config['client_id'],
+                    client_secret=azure_config['client_secret'],
+                    resource_inventory=resource_inventory
+                )
+                dashboard_generators[target.subscription_id] = generator
+                dashboard_collectors[target.subscription_id] = DashboardCollector(generator)
+            get_generator(target).start_pod_informer(target.resource_group, target.name)
+        
+        if config.get('collector') == 'async':
+            # Optional asyncio path; needs aiohttp for the shared HTTP session
+            from aks_async_collector import AsyncFleetCollector
+            fleet_collector = AsyncFleetCollector(
+                targets,
+                tenant_id=azure_config['tenant_id'],
+                client_id=azure_config['client_id'],
+                client_secret=azure_config['client_secret'],
+                pods_for=lambda target: get_generator(target).get_kubernetes_containers(
+                    target.resource_group, target.name, strict=True
+                ),
+                pod_workers=config.get('max_parallel_clusters', 4),
+                inventory=resource_inventory
+            )
+        else:
+            fleet_collector = FleetCollector(
+                targets, get_collector, max_workers=config.get('max_parallel_clusters', 4)
+            )
+        snapshot_refresher = SnapshotRefresher(
+            collect_snapshot, min_interval=config.get('min_refresh_interval', DEFAULT_MIN_INTERVAL)
         )
+        event_broker = EventBroker(max_clients=config.get('max_event_clients', DEFAULT_MAX_CLIENTS))
+        snapshot_refresher.add_listener(event_broker.publish_snapshot)
+        snapshot_history = SnapshotHistory(config.get('history_retention'))
+        history_path = config.get('history_store', DEFAULT_HISTORY_PATH)
+        if history_path:
+            try:
+                history = SnapshotHistory(config.get('history_retention'), store=HistoryStore(history_path))
+                print(f"✅ Loaded {history.load()} history frames from {history_path}")
+                snapshot_history = history
+            except Exception as e:
+                print(f"⚠️ Could not load the history store, keeping history in memory only: {e}")
+        snapshot_refresher.add_listener(snapshot_history.record_snapshot)
+        
+        store_path = config.get('snapshot_store', DEFAULT_SNAPSHOT_PATH)
+        if store_path:
+            snapshot_store = SnapshotStore(store_path)
+            try:
+                restored = restore_snapshot(targets)
+            except Exception as e:
+                print(f"⚠️ Could not restore the stored snapshot: {e}")
+                restored = None
+            if restored:
+                # Served (marked stale) until the first collection replaces it
+                snapshot_refresher.restore(restored)
+                event_broker.resume(restored.generation)
+                print(f"✅ Serving stored snapshot from {datetime.fromtimestamp(restored.collected_at)}")
+            snapshot_refresher.add_listener(save_snapshot)
+        snapshot_refresher.start()
         return True
     except Exception as e:
         print(f"❌ Failed to initialize dashboard: {e}")
         return False
 
+def snapshot_unavailable():
+    """Build the response used before the first snapshot exists"""
+    if not snapshot_refresher:
+        return "Dashboard not initialized", 500
+    if snapshot_refresher.last_error:
+        return f"Error generating dashboard: {snapshot_refresher.last_error}", 500
+    return "Dashboard data is being collected, please retry shortly", 503, {"Retry-After": "5"}
+
+@app.after_request
+def cache_static_assets(response):
+    """Let browsers keep content-versioned static assets for good"""
+    if request.endpoint == 'static' and response.status_code == 200:
+        name = request.view_args.get('filename')
+        if request.args.get('v') == get_templates().asset_versions.get(name):
+            response.headers['Cache-Control'] = IMMUTABLE_CACHE_CONTROL
+    return response
+
+def snapshot_headers(snapshot: DashboardSnapshot):
+    """Response headers describing the snapshot being served"""
+    headers = {
+        "X-Snapshot-Generation": str(snapshot.generation),
+        "X-Snapshot-Age": f"{snapshot.age_seconds:.0f}"
+    }
+    if snapshot.restored:
+        # Saved by an earlier run; a fresh collection is on its way
+        headers["X-Snapshot-Stale"] = "restored"
+    return headers
+
 @app.route('/')
 def dashboard():
-    """Serve the main dashboard"""
-    try:
-        # Generate fresh dashboard
-        if not dashboard_generator:
-            return "Dashboard not initialized", 500
-        
-        # Get cluster info
-        cluster_info = dashboard_generator.get_aks_cluster_info("rg-modular-demo", "transact")
-        if not cluster_info:
-            return "Failed to get cluster info", 500
-        
-        # Get resources
-        resources = dashboard_generator.get_resource_group_resources("rg-modular-demo")
-        
-        # Get Kubernetes pods
-        kubernetes_pods = dashboard_generator.get_kubernetes_containers("rg-modular-demo", "transact")
-        
-        # Generate HTML content
-        html_content = dashboard_generator._create_html_template(
-            cluster_info, {}, resources, kubernetes_pods
-        )
-        
-        return html_content
-        
-    except Exception as e:
-        return f"Error generating dashboard: {e}", 500
+    """Serve the main (or aggregated) dashboard from the latest snapshot"""
+    snapshot = snapshot_refresher.current() if snapshot_refresher else None
+    if not snapshot:
+        return snapshot_unavailable()
+    
+    return snapshot.page.respond(request, snapshot_headers(snapshot))
+
+@app.route('/cluster/<resource_group>/<cluster_name>')
+def cluster_dashboard(resource_group, cluster_name):
+    """Serve the detailed dashboard of one cluster"""
+    snapshot = snapshot_refresher.current() if snapshot_refresher else None
+    if not snapshot:
+        return snapshot_unavailable()
+    
+    cluster = snapshot.cluster(f"{resource_group}/{cluster_name}")
+    if not cluster:
+        return "Unknown cluster", 404
+    if not cluster.page:
+        return f"Error collecting cluster: {cluster.error}", 502
+    
+    return cluster.page.respond(request, snapshot_headers(snapshot))
+
+def fragment_page(snapshot: DashboardSnapshot, cluster: ClusterSnapshot, kind: str, name: str) -> Optional[CachedPage]:
+    """Pods of one namespace or node, rendered at most once per snapshot generation"""
+    global fragment_pages_generation
+    groups = getattr(cluster.pod_index, f"{kind}s") if cluster.pod_index else {}
+    group = groups.get(name)
+    if group is None:
+        return None
+    
+    key = (cluster.key, kind, name)
+    with fragment_pages_lock:
+        if snapshot.generation > fragment_pages_generation:
+            fragment_pages.clear()
+            fragment_pages_generation = snapshot.generation
+        page = fragment_pages.get(key) if snapshot.generation == fragment_pages_generation else None
+    if page:
+        return page
+    
+    if kind == "namespace":
+        html = get_templates().render("_namespace_details.html", namespace=group,
+                                      ages=format_ages([pod.created_at for pod in group.pods]))
+    else:
+        html = get_templates().render("_node_pods.html", node=group)
+    # Built while the request waits, so compressed for speed rather than size
+    page = CachedPage.build(html, cluster.collected_at, fast=True)
+    with fragment_pages_lock:
+        if snapshot.generation == fragment_pages_generation:
+            fragment_pages[key] = page
+    return page
+
+@app.route('/cluster/<resource_group>/<cluster_name>/fragment/<any(namespace, node):kind>/<name>')
+def cluster_fragment(resource_group, cluster_name, kind, name):
+    """Serve the pods of a namespace or node when it is expanded on the page"""
+    snapshot = snapshot_refresher.current() if snapshot_refresher else None
+    if not snapshot:
+        return snapshot_unavailable()
+    
+    cluster = snapshot.cluster(f"{resource_group}/{cluster_name}")
+    page = fragment_page(snapshot, cluster, kind, name) if cluster else None
+    if not page:
+        return f"Unknown {kind}", 404
+    return page.respond(request, snapshot_headers(snapshot))
 
 @app.route('/refresh-dashboard', methods=['POST'])
 def refresh_dashboard():
-    """Handle dashboard refresh request"""
-    try:
-        # Regenerate the dashboard
-        if not dashboard_generator:
-            return jsonify({"error": "Dashboard not initialized"}), 500
-        
-        # Get fresh data
-        cluster_info = dashboard_generator.get_aks_cluster_info("rg-modular-demo", "transact")
-        if not cluster_info:
-            return jsonify({"error": "Failed to get cluster info"}), 500
-        
-        resources = dashboard_generator.get_resource_group_resources("rg-modular-demo")
-        kubernetes_pods = dashboard_generator.get_kubernetes_containers("rg-modular-demo", "transact")
-        
-        # Generate new HTML content
-        html_content = dashboard_generator._create_html_template(
-            cluster_info, {}, resources, kubernetes_pods
-        )
-        
-        # Write to file
-        with open('aks-dashboard.html', 'w', encoding='utf-8') as f:
-            f.write(html_content)
-        
-        return jsonify({
-            "success": True,
-            "message": "Dashboard refreshed successfully",
-            "timestamp": datetime.now().isoformat(),
-            "pods_count": len(kubernetes_pods),
-            "resources_count": len(resources)
-        })
-        
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+    """Schedule a snapshot refresh, joining one that is already running
+
+    With `?wait=<seconds>` the request blocks until the refresh completes.
+    """
+    if not snapshot_refresher:
+        return jsonify({"error": "Dashboard not initialized"}), 500
+    
+    generation = snapshot_refresher.trigger()
+    wait = request.args.get('wait', type=float)
+    if wait:
+        snapshot = snapshot_refresher.wait_for(generation, timeout=min(wait, 120))
+        if snapshot and snapshot.generation > generation:
+            return jsonify({
+                "success": True,
+                "message": "Dashboard refreshed",
+                "timestamp": datetime.now().isoformat(),
+                "generation": snapshot.generation
+            })
+    
+    return jsonify({
+        "success": True,
+        "message": "Dashboard refresh scheduled",
+        "timestamp": datetime.now().isoformat(),
+        "generation": generation
+    }), 202
+
+def cluster_status(cluster: ClusterSnapshot, restored: bool = False):
+    """Status summary of one cluster from its precomputed aggregates"""
+    cluster_info = cluster.cluster_info
+    target = cluster.target
+    informer = get_generator(target).pod_informers.get((target.resource_group, target.name))
+    live = informer and informer.synced.is_set()
+    return {
+        "key": cluster.key,
+        "name": target.name,
+        "resource_group": target.resource_group,
+        "subscription_id": target.subscription_id,
+        "nodes": cluster_info.node_count if cluster_info else 0,
+        "status": cluster_info.power_state if cluster_info else None,
+        "power_state": cluster_info.power_state if cluster_info else None,
+        "pods": len(cluster.kubernetes_pods),
+        "live_pods": informer.count if live else None,
+        "resources": len(cluster.resources),
+        "aggregates": cluster.aggregates,
+        # Kept current from watch events by the pod informer
+        "live_aggregates": informer.aggregates() if live else None,
+        "health": cluster.health,
+        "fragment_cache": dict(fragment_caches[cluster.key].stats) if cluster.key in fragment_caches else None,
+        "age_seconds": round(max(0.0, time.time() - cluster.collected_at), 1),
+        "stale": cluster.stale or restored,
+        "error": cluster.error,
+        "source_errors": cluster.source_errors,
+        "collection_timings": {name: round(t, 3) for name, t in cluster.timings.items()}
+    }
 
 @app.route('/api/status')
 def api_status():
-    """API endpoint to get current status"""
-    try:
-        if not dashboard_generator:
-            return jsonify({"error": "Dashboard not initialized"}), 500
-        
-        cluster_info = dashboard_generator.get_aks_cluster_info("rg-modular-demo", "transact")
-        resources = dashboard_generator.get_resource_group_resources("rg-modular-demo")
-        kubernetes_pods = dashboard_generator.get_kubernetes_containers("rg-modular-demo", "transact")
-        
+    """API endpoint to get current status from the latest snapshot
+
+    With `?since=<generation>&wait=<seconds>` the request long-polls until a
+    newer snapshot exists or the wait expires.
+    """
+    if not snapshot_refresher:
+        return jsonify({"error": "Dashboard not initialized"}), 500
+    
+    since = request.args.get('since', type=int)
+    wait = request.args.get('wait', type=float)
+    if since is not None and wait:
+        snapshot = snapshot_refresher.wait_for(since, timeout=min(wait, 60))
+    else:
+        snapshot = snapshot_refresher.current()
+    if not snapshot:
         return jsonify({
-            "cluster": {
-                "name": cluster_info.name if cluster_info else None,
-                "nodes": cluster_info.node_count if cluster_info else 0,
-                "status": cluster_info.power_state if cluster_info else None
-            },
-            "pods": len(kubernetes_pods),
-            "resources": len(resources),
-            "last_updated": datetime.now().isoformat()
-        })
-        
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+            "generation": 0,
+            "collecting": True,
+            "error": snapshot_refresher.last_error
+        }), 503
+    
+    clusters = [cluster_status(cluster, snapshot.restored) for cluster in snapshot.clusters]
+    primary = clusters[0]
+    return jsonify({
+        "cluster": {
+            "name": primary["name"],
+            "nodes": primary["nodes"],
+            "status": primary["status"]
+        },
+        "clusters": clusters,
+        "pods": sum(cluster["pods"] for cluster in clusters),
+        "containers": sum(cluster["aggregates"].get("totals", {}).get("containers", 0) for cluster in clusters),
+        "resources": sum(cluster["resources"] for cluster in clusters),
+        "generation": snapshot.generation,
+        "restored": snapshot.restored,
+        "age_seconds": round(snapshot.age_seconds, 1),
+        "last_updated": datetime.fromtimestamp(snapshot.collected_at).isoformat(),
+        "last_error": snapshot_refresher.last_error,
+        "refresh": dict(snapshot_refresher.stats),
+        "events": dict(event_broker.stats),
+        "snapshot_store": dict(snapshot_store.stats) if snapshot_store else None,
+        "history": snapshot_history.stats(),
+        "history_store": dict(snapshot_history.store.stats) if snapshot_history.store else None
+    })
+
+@app.route('/api/pods')
+def api_pods():
+    """API endpoint listing pods of one cluster with their ages
+
+    Query parameters: `cluster` (resource_group/name, default the first
+    cluster), `namespace`, `min_age` and `max_age` (e.g. "30m", "2d"),
+    `sort` (`age`, `-age` or `name`) and `limit`.
+    """
+    snapshot = snapshot_refresher.current() if snapshot_refresher else None
+    if not snapshot:
+        return jsonify({"error": "Dashboard data is not available yet"}), 503
+    
+    key = request.args.get('cluster')
+    cluster = snapshot.cluster(key) if key else snapshot.clusters[0]
+    if not cluster:
+        return jsonify({"error": f"Unknown cluster: {key}"}), 404
+    try:
+        min_age = parse_age(request.args['min_age']) if 'min_age' in request.args else None
+        max_age = parse_age(request.args['max_age']) if 'max_age' in request.args else None
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    sort = request.args.get('sort')
+    if sort not in (None, 'age', '-age', 'name'):
+        return jsonify({"error": f"Invalid sort: {sort!r}"}), 400
+    limit = request.args.get('limit', type=int)
+    
+    namespace = request.args.get('namespace')
+    pods = [pod for pod in cluster.kubernetes_pods if namespace is None or pod.namespace == namespace]
+    # One `now` for every pod, so ages are consistent across the response
+    now = time.time()
+    created_at = [pod.created_at for pod in pods]
+    seconds = age_seconds(created_at, now)
+    ages = format_ages(created_at, now)
+    
+    order = select_by_age(seconds, min_age, max_age, sort)
+    count = len(order)
+    if sort == 'name':
+        order.sort(key=lambda i: (pods[i].namespace, pods[i].name))
+    if limit is not None:
+        order = order[:max(limit, 0)]
+    
+    return jsonify({
+        "cluster": cluster.key,
+        "generation": snapshot.generation,
+        "count": count,
+        "pods": [
+            {
+                "name": pods[i].name,
+                "namespace": pods[i].namespace,
+                "status": pods[i].status,
+                "ready": pods[i].ready,
+                "node_name": pods[i].node_name,
+                "created_at": pods[i].created_at,
+                "age_seconds": None if math.isnan(seconds[i]) else int(seconds[i]),
+                "age": ages[i]
+            }
+            for i in order
+        ]
+    })
+
+@app.route('/api/history')
+def api_history():
+    """API endpoint with the health trend of a cluster, namespace, node or pod
+
+    Query parameters: `cluster` (resource_group/name, default the first
+    cluster), one of `namespace`, `node` or `pod` (namespace/name), `resolution`
+    (`raw`, `1m` or `1h`) and `since` (e.g. "6h" for the last six hours).
+    """
+    snapshot = snapshot_refresher.current() if snapshot_refresher else None
+    if not snapshot:
+        return jsonify({"error": "Dashboard data is not available yet"}), 503
+    
+    key = request.args.get('cluster') or snapshot.primary.key
+    kind, name = 'cluster', None
+    for candidate in ('namespace', 'node', 'pod'):
+        if candidate in request.args:
+            kind, name = candidate, request.args[candidate]
+    try:
+        since = time.time() - parse_age(request.args['since']) if 'since' in request.args else None
+        trend = snapshot_history.query(key, kind, name, request.args.get('resolution', 'raw'), since)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    if trend is None:
+        return jsonify({"error": f"No history for cluster: {key}"}), 404
+    return jsonify(dict(trend, cluster=key, kind=kind, name=name))
+
+@app.route('/events')
+def events():
+    """Stream snapshot deltas to a page as Server-Sent Events
+
+    Resumes after the Last-Event-ID header (sent by reconnecting browsers) or
+    the `since` generation the page was rendered from.
+    """
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('since')
+    try:
+        last_event_id = int(last_event_id) if last_event_id else None
+    except ValueError:
+        last_event_id = None
+    
+    stream = event_broker.connect(last_event_id)
+    if stream is None:
+        return "Too many event stream clients", 503, {"Retry-After": "30"}
+    return Response(stream, mimetype='text/event-stream', headers={
+        "Cache-Control": "no-cache",
+        # Keep reverse proxies from buffering the stream
+        "X-Accel-Buffering": "no"
+    })
 
 @app.route('/aks-dashboard.html')
 def serve_dashboard_file():
-    """Serve the static dashboard file"""
+    """Serve the dashboard file, from the in-memory snapshot when there is one"""
+    snapshot = snapshot_refresher.current() if snapshot_refresher else None
+    if snapshot:
+        return snapshot.page.respond(request, snapshot_headers(snapshot))
     return send_from_directory('.', 'aks-dashboard.html')
 
 def main():
@@ -166,6 +660,7 @@ def main():
     print("📱 Dashboard will be available at: http://localhost:5055")
     print("🔄 Refresh API available at: http://localhost:5055/refresh-dashboard")
     print("📊 Status API available at: http://localhost:5055/api/status")
+    print("📡 Live updates available at: http://localhost:5055/events")
     print("\nPress Ctrl+C to stop the server")
     
     # Start Flask server
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+AKS Pod Ages
+============
+
+Pods store their creation time as epoch seconds. Ages are derived from one
+`now` for a whole batch of pods when a page, fragment or API response is
+built, so cached snapshots never show ages frozen at collection time and pods
+can be sorted and filtered by age.
+"""
+
+import re
+import time
+from datetime import datetime
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+UNKNOWN_AGE = "Unknown"
+
+# Age units, largest first, as used in the age column ("2d", "5h", "3m", "42s")
+AGE_UNITS = {"d": 86400, "h": 3600, "m": 60, "s": 1}
+
+AGE_PATTERN = re.compile(r"^\s*(\d+)\s*([dhms]?)\s*$")
+
+def parse_created_at(timestamp: Optional[str]) -> Optional[int]:
+    """Epoch seconds of a Kubernetes creationTimestamp, or None when missing or malformed"""
+    if not timestamp:
+        return None
+    try:
+        return int(datetime.fromisoformat(timestamp.replace('Z', '+00:00')).timestamp())
+    except ValueError:
+        return None
+
+def parse_age(text: str) -> int:
+    """Seconds in an age such as "2d", "6h", "15m", "30s" or "90" """
+    match = AGE_PATTERN.match(text)
+    if not match:
+        raise ValueError(f"Invalid age: {text!r}")
+    return int(match.group(1)) * AGE_UNITS[match.group(2) or "s"]
+
+def age_seconds(created_at: Sequence[Optional[int]], now: Optional[float] = None) -> np.ndarray:
+    """Ages in seconds for a batch of creation times; NaN where the creation time is unknown"""
+    created = np.array([np.nan if value is None else value for value in created_at], dtype=np.float64)
+    now = time.time() if now is None else now
+    # Clock skew can put creation times slightly in the future
+    return np.maximum(np.floor(now - created), 0)
+
+def format_ages(created_at: Sequence[Optional[int]], now: Optional[float] = None) -> List[str]:
+    """Age strings ("2d", "5h", ...) for a batch of creation times"""
+    seconds = age_seconds(created_at, now)
+    known = ~np.isnan(seconds)
+    whole = np.where(known, seconds, 0).astype(np.int64)
+    days, within_day = np.divmod(whole, 86400)
+    # The largest unit that applies: days, else hours over an hour, minutes over a minute, else seconds
+    values = np.select(
+        [days > 0, within_day > 3600, within_day > 60],
+        [days, within_day // 3600, within_day // 60],
+        within_day
+    )
+    units = np.select([days > 0, within_day > 3600, within_day > 60], [0, 1, 2], 3)
+    unit_names = list(AGE_UNITS)
+    return [
+        f"{value}{unit_names[unit]}" if is_known else UNKNOWN_AGE
+        for value, unit, is_known in zip(values.tolist(), units.tolist(), known.tolist())
+    ]
+
+def select_by_age(seconds: np.ndarray, min_age: Optional[int] = None, max_age: Optional[int] = None,
+                  sort: Optional[str] = None) -> List[int]:
+    """Indices of the ages within the bounds, in order or sorted by age ("age" youngest first, "-age" oldest first)"""
+    # NaN (unknown age) compares false, so a bound drops pods without a creation time
+    selected = np.ones(len(seconds), dtype=bool)
+    if min_age is not None:
+        selected &= seconds >= min_age
+    if max_age is not None:
+        selected &= seconds <= max_age
+    order = np.flatnonzero(selected)
+    if sort == 'age':
+        # Stable; unknown ages sort last
+        order = order[np.argsort(seconds[order], kind='stable')]
+    elif sort == '-age':
+        order = order[np.argsort(-seconds[order], kind='stable')]
+    return order.tolist()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+AKS Pod Aggregates
+==================
+
+Pod, container, readiness and restart counters per namespace and per node.
+Counters are adjusted one pod at a time, so the pod informer can keep them
+current from watch events and status requests never walk the pod list.
+"""
+
+from dataclasses import asdict, dataclass
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Optional
+
+if TYPE_CHECKING:
+    from aks_html_dashboard import PodInfo
+
+@dataclass
+class PodCounts:
+    """Counters for one group of pods"""
+    pods: int = 0
+    running_pods: int = 0
+    containers: int = 0
+    ready_containers: int = 0
+    restarts: int = 0
+
+    def add(self, pod: "PodInfo", sign: int = 1):
+        """Add (sign=1) or subtract (sign=-1) one pod's contribution"""
+        self.pods += sign
+        if pod.status == "Running":
+            self.running_pods += sign
+        self.containers += sign * len(pod.containers)
+        for container in pod.containers:
+            if container.ready:
+                self.ready_containers += sign
+            self.restarts += sign * container.restart_count
+
+    def merge(self, other: "PodCounts"):
+        """Add another group's counters to this one"""
+        self.pods += other.pods
+        self.running_pods += other.running_pods
+        self.containers += other.containers
+        self.ready_containers += other.ready_containers
+        self.restarts += other.restarts
+
+class PodAggregates:
+    """Pod counters for the whole cluster, per namespace and per node"""
+
+    def __init__(self, pods: Iterable["PodInfo"] = ()):
+        self.totals = PodCounts()
+        self.namespaces: Dict[str, PodCounts] = {}
+        self.nodes: Dict[str, PodCounts] = {}
+        for pod in pods:
+            self.add(pod)
+
+    def add(self, pod: "PodInfo"):
+        self._apply(pod, 1)
+
+    def remove(self, pod: "PodInfo"):
+        self._apply(pod, -1)
+
+    def replace(self, old: Optional["PodInfo"], new: "PodInfo"):
+        """Swap a pod's previous state for its current one"""
+        if old is not None:
+            self.remove(old)
+        self.add(new)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the counters; cost grows with namespaces and nodes, not pods"""
+        return {
+            "totals": asdict(self.totals),
+            "namespaces": {name: asdict(counts) for name, counts in sorted(self.namespaces.items())},
+            "nodes": {name: asdict(counts) for name, counts in sorted(self.nodes.items())},
+        }
+
+    def _apply(self, pod: "PodInfo", sign: int):
+        self.totals.add(pod, sign)
+        for groups, key in ((self.namespaces, pod.namespace), (self.nodes, pod.node_name)):
+            counts = groups.setdefault(key, PodCounts())
+            counts.add(pod, sign)
+            if counts.pods == 0:
+                # Drop namespaces and nodes whose last pod went away
+                del groups[key]
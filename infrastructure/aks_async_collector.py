@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+AKS Async Fleet Collector
+=========================
+
+asyncio-based alternative to FleetCollector. Cluster info and resource
+lists for every cluster are fetched with the `.aio` Azure SDK clients on one
+event loop, sharing one async credential and one HTTP session, so polling
+dozens of clusters doesn't need a thread per call.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import aiohttp
+from azure.core.pipeline.transport import AioHttpTransport
+from azure.identity.aio import ClientSecretCredential
+from azure.mgmt.containerservice.aio import ContainerServiceClient
+from azure.mgmt.resource.resources.aio import ResourceManagementClient
+
+from aks_collector import DEFAULT_DEADLINES, CollectionResult
+from aks_fleet import DEFAULT_CLUSTER_DEADLINE, ClusterCollection
+from aks_html_dashboard import AKSDashboardGenerator, ClusterTarget, PodInfo
+
+if TYPE_CHECKING:
+    from aks_resource_graph import ResourceGraphInventory
+
+logger = logging.getLogger(__name__)
+
+# Threads available for the synchronous pod listings (informer reads are in-memory)
+DEFAULT_POD_WORKERS = 4
+
+class AsyncFleetCollector:
+    """Collects all configured clusters on a single background event loop"""
+
+    def __init__(self, targets: List[ClusterTarget], tenant_id: str, client_id: str, client_secret: str,
+                 pods_for: Callable[[ClusterTarget], List[PodInfo]],
+                 deadlines: Optional[Dict[str, float]] = None,
+                 cluster_deadline: float = DEFAULT_CLUSTER_DEADLINE,
+                 pod_workers: int = DEFAULT_POD_WORKERS,
+                 inventory: Optional["ResourceGraphInventory"] = None):
+        self.targets = targets
+        self.tenant_id = tenant_id
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.pods_for = pods_for
+        self.deadlines = dict(DEFAULT_DEADLINES)
+        if deadlines:
+            self.deadlines.update(deadlines)
+        self.cluster_deadline = cluster_deadline
+        self.inventory = inventory
+
+        self._credential = None
+        self._session = None
+        self._transport = None
+        self._container_clients: Dict[str, ContainerServiceClient] = {}
+        self._resource_clients: Dict[str, ResourceManagementClient] = {}
+
+        self._loop = asyncio.new_event_loop()
+        self._loop.set_default_executor(ThreadPoolExecutor(pod_workers, thread_name_prefix="async-pods"))
+        self._thread = threading.Thread(target=self._loop.run_forever, name="async-collector", daemon=True)
+        self._thread.start()
+
+    def collect(self) -> Dict[str, ClusterCollection]:
+        """Collect every cluster and return the outcomes keyed by cluster key, in config order"""
+        return asyncio.run_coroutine_threadsafe(self._collect_all(), self._loop).result()
+
+    def shutdown(self):
+        """Close the SDK clients and HTTP session, then stop the event loop"""
+        asyncio.run_coroutine_threadsafe(self._close(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+
+    async def _collect_all(self) -> Dict[str, ClusterCollection]:
+        tasks = {target.key: asyncio.ensure_future(self._collect_cluster(target)) for target in self.targets}
+        await asyncio.wait(tasks.values(), timeout=self.cluster_deadline)
+
+        collections = {}
+        for target in self.targets:
+            task = tasks[target.key]
+            if task.done() and not task.cancelled() and task.exception() is None:
+                collections[target.key] = task.result()
+                continue
+            if task.done() and not task.cancelled():
+                error = str(task.exception())
+                logger.error(f"Collection of cluster {target.key} failed: {error}")
+            else:
+                task.cancel()
+                error = f"Timed out after {self.cluster_deadline:.0f}s"
+                logger.warning(f"Collection of cluster {target.key} exceeded its deadline")
+            collections[target.key] = ClusterCollection(target, None, error, self.cluster_deadline)
+        return collections
+
+    async def _collect_cluster(self, target: ClusterTarget) -> ClusterCollection:
+        """Fetch one cluster's sources concurrently with per-source deadlines"""
+        started = time.perf_counter()
+        sources: Dict[str, Tuple[Awaitable[Any], Any]] = {
+            "cluster_info": (self._get_cluster_info(target), None),
+            "resources": (self._get_resources(target), []),
+            "kubernetes_pods": (self._loop.run_in_executor(None, self.pods_for, target), []),
+        }
+        outcomes = await asyncio.gather(*(
+            self._timed(name, awaitable) for name, (awaitable, _) in sources.items()
+        ))
+
+        values, timings, errors = {}, {}, {}
+        for (name, (_, default)), (value, elapsed, error) in zip(sources.items(), outcomes):
+            values[name] = default if error else value
+            timings[name] = elapsed
+            if error:
+                errors[name] = error
+
+        result = CollectionResult(
+            cluster_info=values["cluster_info"],
+            resources=values["resources"],
+            kubernetes_pods=values["kubernetes_pods"],
+            timings=timings,
+            errors=errors,
+            elapsed=time.perf_counter() - started
+        )
+        error = None
+        if not result.cluster_info:
+            error = errors.get("cluster_info", "Failed to get cluster info")
+        return ClusterCollection(target, result, error, result.elapsed)
+
+    async def _timed(self, name: str, awaitable: Awaitable[Any]):
+        """Await one source and return (value, elapsed, error)"""
+        started = time.perf_counter()
+        try:
+            value = await asyncio.wait_for(awaitable, self.deadlines[name])
+            return value, time.perf_counter() - started, None
+        except asyncio.TimeoutError:
+            logger.warning(f"Collection of {name} exceeded its deadline")
+            return None, self.deadlines[name], f"Timed out after {self.deadlines[name]:.0f}s"
+        except Exception as e:
+            logger.error(f"Collection of {name} failed: {e}")
+            return None, time.perf_counter() - started, str(e)
+
+    async def _get_cluster_info(self, target: ClusterTarget):
+        client = await self._container_client(target.subscription_id)
+        cluster = await client.managed_clusters.get(target.resource_group, target.name)
+        return AKSDashboardGenerator._to_cluster_info(cluster, target.resource_group)
+
+    async def _get_resources(self, target: ClusterTarget):
+        if self.inventory:
+            # One bulk query serves every cluster; it blocks, so it runs on the executor
+            return await self._loop.run_in_executor(
+                None, self.inventory.get_resources, target.subscription_id, target.resource_group
+            )
+        client = await self._resource_client(target.subscription_id)
+        return [
+            AKSDashboardGenerator._to_resource_info(resource, target.resource_group)
+            async for resource in client.resources.list_by_resource_group(target.resource_group)
+        ]
+
+    async def _open(self):
+        """Create the shared HTTP session, transport and credential on first use"""
+        if self._transport is None:
+            self._session = aiohttp.ClientSession()
+            self._transport = AioHttpTransport(session=self._session, session_owner=False)
+            self._credential = ClientSecretCredential(
+                self.tenant_id, self.client_id, self.client_secret, transport=self._transport
+            )
+
+    async def _container_client(self, subscription_id: str) -> ContainerServiceClient:
+        if subscription_id not in self._container_clients:
+            await self._open()
+            self._container_clients[subscription_id] = ContainerServiceClient(
+                self._credential, subscription_id, transport=self._transport
+            )
+        return self._container_clients[subscription_id]
+
+    async def _resource_client(self, subscription_id: str) -> ResourceManagementClient:
+        if subscription_id not in self._resource_clients:
+            await self._open()
+            self._resource_clients[subscription_id] = ResourceManagementClient(
+                self._credential, subscription_id, transport=self._transport
+            )
+        return self._resource_clients[subscription_id]
+
+    async def _close(self):
+        for client in list(self._container_clients.values()) + list(self._resource_clients.values()):
+            await client.close()
+        if self._credential:
+            await self._credential.close()
+        if self._session:
+            await self._session.close()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+AKS Dashboard Collector
+=======================
+
+Runs the cluster info, resource list and pod inventory collectors
+concurrently so a refresh takes about as long as the slowest source.
+"""
+
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from aks_html_dashboard import AKSDashboardGenerator, ClusterInfo, ResourceInfo, PodInfo
+
+logger = logging.getLogger(__name__)
+
+# Per-source deadlines in seconds, measured from the start of the collection
+DEFAULT_DEADLINES = {
+    "cluster_info": 20.0,
+    "resources": 30.0,
+    "kubernetes_pods": 45.0,
+}
+
+@dataclass
+class CollectionResult:
+    """Combined result of one concurrent collection"""
+    cluster_info: Optional[ClusterInfo]
+    resources: List[ResourceInfo]
+    kubernetes_pods: List[PodInfo]
+    timings: Dict[str, float] = field(default_factory=dict)
+    # Sources that failed or missed their deadline; their value is the empty default
+    errors: Dict[str, str] = field(default_factory=dict)
+    elapsed: float = 0.0
+
+class DashboardCollector:
+    """Collects all dashboard data sources in parallel with per-source deadlines"""
+
+    def __init__(self, generator: AKSDashboardGenerator, deadlines: Optional[Dict[str, float]] = None):
+        self.generator = generator
+        self.deadlines = dict(DEFAULT_DEADLINES)
+        if deadlines:
+            self.deadlines.update(deadlines)
+
+    def collect(self, resource_group: str, cluster_name: str) -> CollectionResult:
+        """Fetch cluster info, resources and pods concurrently"""
+        sources = {
+            "cluster_info": (lambda: self.generator.get_aks_cluster_info(resource_group, cluster_name), None),
+            "resources": (lambda: self.generator.get_resource_group_resources(resource_group, strict=True), []),
+            "kubernetes_pods": (lambda: self.generator.get_kubernetes_containers(
+                resource_group, cluster_name, strict=True
+            ), []),
+        }
+        values: Dict[str, Any] = {}
+        timings: Dict[str, float] = {}
+        errors: Dict[str, str] = {}
+
+        started = time.perf_counter()
+        # A timed-out source keeps its worker thread, so each collection gets its own pool
+        executor = ThreadPoolExecutor(max_workers=len(sources), thread_name_prefix="collector")
+        try:
+            futures = {
+                name: executor.submit(self._timed, fetch)
+                for name, (fetch, _) in sources.items()
+            }
+            for name, future in futures.items():
+                remaining = self.deadlines[name] - (time.perf_counter() - started)
+                try:
+                    values[name], timings[name] = future.result(timeout=max(0.0, remaining))
+                except FutureTimeoutError:
+                    future.cancel()
+                    timings[name] = self.deadlines[name]
+                    errors[name] = f"Timed out after {self.deadlines[name]:.0f}s"
+                    logger.warning(f"Collection of {name} exceeded its deadline")
+                except Exception as e:
+                    timings[name] = time.perf_counter() - started
+                    errors[name] = str(e)
+                    logger.error(f"Collection of {name} failed: {e}")
+        finally:
+            executor.shutdown(wait=False)
+
+        for name, (_, default) in sources.items():
+            values.setdefault(name, default)
+
+        return CollectionResult(
+            cluster_info=values["cluster_info"],
+            resources=values["resources"],
+            kubernetes_pods=values["kubernetes_pods"],
+            timings=timings,
+            errors=errors,
+            elapsed=time.perf_counter() - started
+        )
+
+    @staticmethod
+    def _timed(fetch: Callable[[], Any]):
+        """Run one source and return its value with the time it took"""
+        started = time.perf_counter()
+        value = fetch()
+        return value, time.perf_counter() - started
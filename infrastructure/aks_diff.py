@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+AKS Snapshot Diff
+=================
+
+What changed between two pod collections: pods added, removed and changed,
+and within changed pods the containers added, removed and changed (phase,
+readiness, restarts, image). Every pod gets a hash of the fields that are
+compared, computed once per snapshot, so a diff is one dictionary pass and
+unchanged pods are never compared field by field.
+"""
+
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Tuple
+
+if TYPE_CHECKING:
+    from aks_html_dashboard import ContainerInfo, PodInfo
+
+# Compared fields of pods and containers, in the order they are hashed
+POD_FIELDS = ("status", "ready", "node_name")
+CONTAINER_FIELDS = ("image", "status", "ready", "restart_count")
+
+PodKey = Tuple[str, str]
+
+def pod_record(pod: "PodInfo") -> Tuple[Any, ...]:
+    """The compared fields of a pod and its containers, as one hashable tuple
+
+    Spelled out rather than looped over POD_FIELDS/CONTAINER_FIELDS, since this
+    runs for every pod of every snapshot.
+    """
+    return (pod.status, pod.ready, pod.node_name, tuple([
+        (c.name, c.image, c.status, c.ready, c.restart_count) for c in pod.containers
+    ]))
+
+class PodHashes:
+    """Per-pod hashes of one snapshot, keyed by (namespace, name)"""
+
+    def __init__(self, pods: Iterable["PodInfo"] = ()):
+        self.pods: Dict[PodKey, Tuple[int, "PodInfo"]] = {
+            (pod.namespace, pod.name): (hash(pod_record(pod)), pod) for pod in pods
+        }
+
+    def __len__(self) -> int:
+        return len(self.pods)
+
+@dataclass
+class ContainerChange:
+    """A container present in both snapshots whose compared fields differ"""
+    name: str
+    # Field name -> (old value, new value)
+    fields: Dict[str, Tuple[Any, Any]]
+
+@dataclass
+class PodChange:
+    """A pod present in both snapshots whose compared fields differ"""
+    pod: "PodInfo"
+    fields: Dict[str, Tuple[Any, Any]] = field(default_factory=dict)
+    added_containers: List[str] = field(default_factory=list)
+    removed_containers: List[str] = field(default_factory=list)
+    changed_containers: List[ContainerChange] = field(default_factory=list)
+
+    @property
+    def key(self) -> PodKey:
+        return (self.pod.namespace, self.pod.name)
+
+@dataclass
+class SnapshotDiff:
+    """Pods added, removed and changed between two snapshots"""
+    added: List["PodInfo"] = field(default_factory=list)
+    removed: List["PodInfo"] = field(default_factory=list)
+    changed: List[PodChange] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.added) + len(self.removed) + len(self.changed)
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+def compare_fields(old: Any, new: Any, names: Iterable[str]) -> Dict[str, Tuple[Any, Any]]:
+    """The named attributes that differ, as name -> (old, new)"""
+    return {name: (getattr(old, name), getattr(new, name))
+            for name in names if getattr(old, name) != getattr(new, name)}
+
+def compare_pods(old: "PodInfo", new: "PodInfo") -> PodChange:
+    """Field-level changes of a pod whose hash changed"""
+    change = PodChange(pod=new, fields=compare_fields(old, new, POD_FIELDS))
+    old_containers = {container.name: container for container in old.containers}
+    for container in new.containers:
+        previous = old_containers.pop(container.name, None)
+        if previous is None:
+            change.added_containers.append(container.name)
+            continue
+        fields = compare_fields(previous, container, CONTAINER_FIELDS)
+        if fields:
+            change.changed_containers.append(ContainerChange(container.name, fields))
+    change.removed_containers.extend(old_containers)
+    return change
+
+def diff_pods(previous: PodHashes, current: PodHashes) -> SnapshotDiff:
+    """Diff two snapshots in O(pods); only pods whose hash changed are compared in detail"""
+    diff = SnapshotDiff()
+    for key, (digest, pod) in current.pods.items():
+        old = previous.pods.get(key)
+        if old is None:
+            diff.added.append(pod)
+        elif old[0] != digest:
+            change = compare_pods(old[1], pod)
+            # A different hash can also come from containers that were only reordered
+            if change.fields or change.added_containers or change.removed_containers or change.changed_containers:
+                diff.changed.append(change)
+    diff.removed.extend(pod for key, (_, pod) in previous.pods.items() if key not in current.pods)
+    return diff
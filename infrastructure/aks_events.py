@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+AKS Dashboard Events
+====================
+
+Server-Sent Events for open dashboard pages. Each new snapshot is published
+as a delta against the previous one (changed pods, counters and cluster
+state) with the snapshot generation as event id, so pages patch themselves
+in place instead of reloading. Recent deltas are kept for clients that
+reconnect with Last-Event-ID.
+"""
+
+import json
+import threading
+from collections import deque
+from typing import TYPE_CHECKING, Any, Deque, Dict, Iterator, List, Optional, Tuple
+
+from aks_diff import PodHashes, diff_pods
+
+if TYPE_CHECKING:
+    from aks_html_dashboard import PodInfo
+    from aks_snapshot import ClusterSnapshot, DashboardSnapshot
+
+# Seconds between heartbeat comments on an idle stream
+DEFAULT_HEARTBEAT = 15.0
+
+# Concurrent event streams; each one holds a server thread
+DEFAULT_MAX_CLIENTS = 32
+
+# Deltas kept for replay to reconnecting clients
+DEFAULT_HISTORY = 64
+
+# Pod changes per cluster beyond which a delta asks pages to reload instead
+MAX_POD_CHANGES = 500
+
+# Milliseconds the browser waits before reconnecting a dropped stream
+RETRY_MS = 5000
+
+def pod_summary(pod: "PodInfo") -> Dict[str, Any]:
+    """The pod fields a page patches into its namespace and node cards"""
+    return {
+        "namespace": pod.namespace,
+        "name": pod.name,
+        "status": pod.status,
+        "ready": pod.ready,
+        "node": pod.node_name,
+        "containers": len(pod.containers),
+        "ready_containers": sum(1 for container in pod.containers if container.ready),
+        "restarts": sum(container.restart_count for container in pod.containers),
+    }
+
+def cluster_state(cluster: "ClusterSnapshot") -> Dict[str, Any]:
+    """Cluster-level fields shown in page metrics and fleet rows"""
+    cluster_info = cluster.cluster_info
+    return {
+        "power_state": cluster_info.power_state if cluster_info else None,
+        "nodes": cluster_info.node_count if cluster_info else 0,
+        "resources": len(cluster.resources),
+        "stale": cluster.stale,
+        "error": cluster.error,
+    }
+
+def pod_changes(previous: Optional["ClusterSnapshot"], current: "ClusterSnapshot") -> Dict[str, List[Dict[str, Any]]]:
+    """Pods added, removed or changed between two snapshots of a cluster"""
+    diff = diff_pods(cluster_hashes(previous), cluster_hashes(current))
+    return {
+        "added": [pod_summary(pod) for pod in diff.added],
+        "removed": [{"namespace": pod.namespace, "name": pod.name} for pod in diff.removed],
+        "changed": [pod_summary(change.pod) for change in diff.changed],
+    }
+
+def cluster_hashes(cluster: Optional["ClusterSnapshot"]) -> PodHashes:
+    """Pod hashes of a snapshot, computed here for snapshots built without them"""
+    if cluster is None:
+        return PodHashes()
+    return cluster.pod_hashes or PodHashes(cluster.kubernetes_pods)
+
+def counter_changes(previous: Dict[str, Any], current: Dict[str, Any]) -> Dict[str, Any]:
+    """Totals plus the namespaces and nodes whose counters changed; removed ones map to None"""
+    changes = {"totals": current.get("totals", {})}
+    for level in ("namespaces", "nodes"):
+        old_groups, new_groups = previous.get(level, {}), current.get(level, {})
+        changes[level] = {name: counts for name, counts in new_groups.items() if old_groups.get(name) != counts}
+        changes[level].update({name: None for name in old_groups if name not in new_groups})
+    return changes
+
+def snapshot_delta(previous: Optional["DashboardSnapshot"], snapshot: "DashboardSnapshot") -> Dict[str, Any]:
+    """What changed in each cluster since the previous snapshot"""
+    clusters = {}
+    for cluster in snapshot.clusters:
+        old = previous.cluster(cluster.key) if previous else None
+        if old is cluster:
+            continue
+        pods = pod_changes(old, cluster)
+        truncated = sum(len(changes) for changes in pods.values()) > MAX_POD_CHANGES
+        clusters[cluster.key] = {
+            "state": cluster_state(cluster),
+            "counters": counter_changes(old.aggregates if old else {}, cluster.aggregates),
+            "pods": None if truncated else pods,
+            "truncated": truncated,
+        }
+    return {"generation": snapshot.generation, "collected_at": snapshot.collected_at, "clusters": clusters}
+
+def format_event(event_id: Optional[int], name: str, data: str) -> str:
+    """Encode one Server-Sent Event"""
+    lines = [f"id: {event_id}"] if event_id is not None else []
+    lines.append(f"event: {name}")
+    lines.extend(f"data: {line}" for line in data.splitlines() or [""])
+    return "\n".join(lines) + "\n\n"
+
+class EventBroker:
+    """Fans published events out to a bounded number of streaming clients"""
+
+    def __init__(self, max_clients: int = DEFAULT_MAX_CLIENTS, history: int = DEFAULT_HISTORY,
+                 heartbeat: float = DEFAULT_HEARTBEAT):
+        self.max_clients = max_clients
+        self.heartbeat = heartbeat
+        self.stats = {"published": 0, "clients": 0, "rejected": 0, "resets": 0}
+        self._events: Deque[Tuple[int, str, str]] = deque(maxlen=history)
+        self._last_id = 0
+        self._closed = False
+        self._changed = threading.Condition()
+
+    def publish(self, event_id: int, name: str, data: Dict[str, Any]):
+        """Publish an event; ids must increase"""
+        payload = json.dumps(data, separators=(",", ":"))
+        with self._changed:
+            self._events.append((event_id, name, payload))
+            self._last_id = event_id
+            self.stats["published"] += 1
+            self._changed.notify_all()
+
+    def resume(self, event_id: int):
+        """Continue event ids after `event_id`, e.g. the generation of a restored snapshot"""
+        with self._changed:
+            if not self._events:
+                self._last_id = max(self._last_id, event_id)
+
+    def publish_snapshot(self, previous: Optional["DashboardSnapshot"], snapshot: "DashboardSnapshot"):
+        """SnapshotRefresher listener: publish the delta of a new snapshot"""
+        self.publish(snapshot.generation, "snapshot", snapshot_delta(previous, snapshot))
+
+    def connect(self, last_event_id: Optional[int]) -> Optional["EventStream"]:
+        """Open a stream that resumes after `last_event_id`, or None when the client cap is reached"""
+        with self._changed:
+            if self.stats["clients"] >= self.max_clients:
+                self.stats["rejected"] += 1
+                return None
+            self.stats["clients"] += 1
+        return EventStream(self, last_event_id)
+
+    def close(self):
+        """End all streams, e.g. on shutdown"""
+        with self._changed:
+            self._closed = True
+            self._changed.notify_all()
+
+    def _disconnect(self):
+        with self._changed:
+            self.stats["clients"] -= 1
+
+    def _events_after(self, last_event_id: int) -> Optional[List[Tuple[int, str, str]]]:
+        """Buffered events newer than `last_event_id`, or None when the client can't catch up"""
+        if last_event_id > self._last_id:
+            # The id comes from before a server restart
+            return None
+        if self._events and last_event_id < self._events[0][0] - 1:
+            return None
+        if not self._events and last_event_id < self._last_id:
+            # Resumed from a restored snapshot; what came before it isn't buffered
+            return None
+        return [event for event in self._events if event[0] > last_event_id]
+
+    def _next(self, last_event_id: int) -> Tuple[Optional[List[Tuple[int, str, str]]], bool]:
+        """Wait up to one heartbeat for events after `last_event_id`; also reports closing"""
+        with self._changed:
+            self._changed.wait_for(lambda: self._closed or self._last_id != last_event_id, self.heartbeat)
+            events = self._events_after(last_event_id)
+            if events is None:
+                self.stats["resets"] += 1
+            return events, self._closed
+
+class EventStream:
+    """One client's event stream; iterating yields encoded events"""
+
+    def __init__(self, broker: EventBroker, last_event_id: Optional[int]):
+        self.broker = broker
+        self.last_event_id = last_event_id
+        self._closed = False
+
+    def __iter__(self) -> Iterator[str]:
+        try:
+            yield f"retry: {RETRY_MS}\n\n"
+            if self.last_event_id is None:
+                # A new client starts from the current generation
+                self.last_event_id = self.broker._last_id
+            while True:
+                events, closed = self.broker._next(self.last_event_id)
+                if closed:
+                    return
+                if events is None:
+                    # The events this client missed are gone; it must reload
+                    self.last_event_id = self.broker._last_id
+                    yield format_event(self.last_event_id, "reset", "{}")
+                    continue
+                if not events:
+                    yield ": heartbeat\n\n"
+                for event_id, name, payload in events:
+                    self.last_event_id = event_id
+                    yield format_event(event_id, name, payload)
+        finally:
+            self.close()
+
+    def close(self):
+        """Release the client slot; called by the server when the response ends"""
+        if not self._closed:
+            self._closed = True
+            self.broker._disconnect()
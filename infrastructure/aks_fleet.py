@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+AKS Fleet Collector
+===================
+
+Collects several clusters across resource groups and subscriptions in
+parallel on a bounded worker pool. Each cluster succeeds or fails on its
+own, and a slow cluster can't hold up the others past its deadline.
+"""
+
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+from aks_collector import CollectionResult, DashboardCollector
+from aks_html_dashboard import ClusterTarget
+
+logger = logging.getLogger(__name__)
+
+# Upper bound for one cluster's collection, on top of the per-source deadlines
+DEFAULT_CLUSTER_DEADLINE = 90.0
+
+DEFAULT_MAX_WORKERS = 4
+
+@dataclass
+class ClusterCollection:
+    """Outcome of collecting one cluster"""
+    target: ClusterTarget
+    result: Optional[CollectionResult]
+    error: Optional[str] = None
+    elapsed: float = 0.0
+
+class FleetCollector:
+    """Collects all configured clusters in parallel with per-cluster isolation"""
+
+    def __init__(self, targets: List[ClusterTarget],
+                 collector_for: Callable[[ClusterTarget], DashboardCollector],
+                 max_workers: int = DEFAULT_MAX_WORKERS,
+                 cluster_deadline: float = DEFAULT_CLUSTER_DEADLINE):
+        self.targets = targets
+        self.collector_for = collector_for
+        self.cluster_deadline = cluster_deadline
+        self.max_workers = max_workers
+        # Cluster tasks are bounded by the collector's per-source deadlines, so the pool is reused
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="fleet")
+
+    def collect(self) -> Dict[str, ClusterCollection]:
+        """Collect every cluster and return the outcomes keyed by cluster key, in config order"""
+        # A cluster's deadline runs from when a worker picks it up, so clusters queued
+        # behind slow ones still get their full deadline
+        started: Dict[str, float] = {}
+        futures = {
+            target.key: self.executor.submit(self._collect_cluster, target, started)
+            for target in self.targets
+        }
+        # Queued clusters wait for at most one deadline per round of clusters ahead of them
+        rounds = -(-len(self.targets) // self.max_workers)
+        give_up = time.perf_counter() + self.cluster_deadline * rounds
+        pending = set(futures)
+        while pending:
+            now = time.perf_counter()
+            pending = {key for key in pending if now - started.get(key, now) < self.cluster_deadline}
+            if not pending or now >= give_up:
+                break
+            expiries = [started[key] + self.cluster_deadline for key in pending if key in started]
+            wait([futures[key] for key in pending], timeout=min(expiries + [give_up]) - now,
+                 return_when=FIRST_COMPLETED)
+            pending = {key for key in pending if not futures[key].done()}
+
+        collections = {}
+        for target in self.targets:
+            future = futures[target.key]
+            if future.done():
+                collections[target.key] = future.result()
+            elif target.key in started:
+                logger.warning(f"Collection of cluster {target.key} exceeded its deadline")
+                collections[target.key] = ClusterCollection(
+                    target=target,
+                    result=None,
+                    error=f"Timed out after {self.cluster_deadline:.0f}s",
+                    elapsed=self.cluster_deadline
+                )
+            else:
+                future.cancel()
+                logger.warning(f"Collection of cluster {target.key} never got a worker")
+                collections[target.key] = ClusterCollection(
+                    target=target,
+                    result=None,
+                    error="Timed out waiting for a free worker"
+                )
+        return collections
+
+    def shutdown(self):
+        """Release the worker pool"""
+        self.executor.shutdown(wait=False)
+
+    def _collect_cluster(self, target: ClusterTarget, started_at: Dict[str, float]) -> ClusterCollection:
+        """Collect one cluster, turning any failure into an error outcome"""
+        started = started_at[target.key] = time.perf_counter()
+        try:
+            result = self.collector_for(target).collect(target.resource_group, target.name)
+            error = None
+            if not result.cluster_info:
+                error = result.errors.get("cluster_info", "Failed to get cluster info")
+            return ClusterCollection(target, result, error, time.perf_counter() - started)
+        except Exception as e:
+            logger.error(f"Collection of cluster {target.key} failed: {e}")
+            return ClusterCollection(target, None, str(e), time.perf_counter() - started)
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+AKS Dashboard Fragment Cache
+============================
+
+Rendered namespace and node cards, keyed by a hash of the pods they show.
+Most namespaces don't change between refreshes, so a page is assembled from
+cached cards and only the cards whose pods changed are rendered again.
+"""
+
+import hashlib
+import threading
+from typing import Any, Callable, Dict, Iterable, Tuple
+
+from markupsafe import Markup
+
+class FragmentCache:
+    """Rendered fragments of one cluster's page, by kind and name"""
+
+    def __init__(self):
+        self._fragments: Dict[Tuple[str, str], Tuple[str, Markup]] = {}
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    @staticmethod
+    def digest(state: Iterable[Any]) -> str:
+        """Stable hash of the records a fragment is rendered from"""
+        digest = hashlib.blake2b(digest_size=16)
+        for record in state:
+            digest.update(repr(record).encode("utf-8"))
+        return digest.hexdigest()
+
+    def get(self, kind: str, name: str, state: Iterable[Any], render: Callable[[], str]) -> Markup:
+        """Cached fragment for `state`, rendered again only when the state changed"""
+        digest = self.digest(state)
+        with self._lock:
+            cached = self._fragments.get((kind, name))
+            if cached and cached[0] == digest:
+                self.stats["hits"] += 1
+                return cached[1]
+            self.stats["misses"] += 1
+        fragment = Markup(render())
+        with self._lock:
+            self._fragments[(kind, name)] = (digest, fragment)
+        return fragment
+
+    def retain(self, kind: str, names: Iterable[str]):
+        """Evict fragments of a kind whose name is no longer on the page"""
+        keep = set(names)
+        with self._lock:
+            for key in [key for key in self._fragments if key[0] == kind and key[1] not in keep]:
+                del self._fragments[key]
+                self.stats["evictions"] += 1
+
+    def __len__(self) -> int:
+        return len(self._fragments)
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+AKS Health History
+==================
+
+Time series of every snapshot's health: pod/container counters of the
+cluster, each namespace and each node, pod phases and readiness, and the
+restart counter of every container. Samples are kept at three resolutions
+(every snapshot, the last one of each minute, the last one of each hour), each
+in a ring buffer of frames. A frame stores only the series whose value changed
+since the frame before it, so unchanged pods and containers cost nothing per
+sample. With a HistoryStore the frames are also written to disk and loaded
+again on startup.
+"""
+
+import logging
+import threading
+from collections import deque
+from dataclasses import astuple
+from typing import TYPE_CHECKING, Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from aks_rollups import COUNT_FIELDS
+
+if TYPE_CHECKING:
+    from aks_history_store import HistoryStore
+    from aks_snapshot import ClusterSnapshot, DashboardSnapshot
+
+logger = logging.getLogger(__name__)
+
+# Seconds per frame of each tier; "raw" keeps every snapshot
+RESOLUTIONS = {"raw": 0, "1m": 60, "1h": 3600}
+
+# Frames kept per tier: a day of 5-minute snapshots, a day of minutes, 30 days of hours
+DEFAULT_RETENTION = {"raw": 288, "1m": 1440, "1h": 720}
+
+POD_FIELDS = ("status", "ready")
+
+SeriesKey = Tuple[str, ...]
+Frame = Tuple[float, Dict[SeriesKey, Any]]
+# A frame added to a tier, with the changes of the frame it evicted (if any)
+Appended = Tuple[Frame, Optional[Dict[SeriesKey, Any]]]
+
+# Marks a series that ended in a frame (its pod, namespace or node went away)
+REMOVED = None
+
+def health_state(cluster: "ClusterSnapshot") -> Dict[SeriesKey, Any]:
+    """Every series value of one cluster snapshot"""
+    index = cluster.pod_index
+    state: Dict[SeriesKey, Any] = {("cluster",): astuple(index.totals.counts)}
+    state.update((("namespace", name), astuple(group.counts)) for name, group in index.namespaces.items())
+    state.update((("node", name), astuple(group.counts)) for name, group in index.nodes.items())
+    for pod in cluster.kubernetes_pods:
+        state[("pod", pod.namespace, pod.name)] = (pod.status, pod.ready)
+        for container in pod.containers:
+            state[("container", pod.namespace, pod.name, container.name)] = container.restart_count
+    return state
+
+class HistoryTier:
+    """Delta-encoded frames at one resolution, in a ring buffer"""
+
+    def __init__(self, resolution: int, capacity: int):
+        self.resolution = resolution
+        self.capacity = capacity
+        self.frames: Deque[Frame] = deque()
+        # Series values before the oldest frame; evicted frames are folded into it
+        self.base: Dict[SeriesKey, Any] = {}
+        # Series values as of the newest frame
+        self.state: Dict[SeriesKey, Any] = {}
+        # Latest sample of the interval that is still open
+        self.pending: Optional[Frame] = None
+        # Frames appended since the tier was created; numbers the frames for the store
+        self.appended = 0
+
+    def record(self, timestamp: float, state: Dict[SeriesKey, Any]) -> Optional[Appended]:
+        """Add a sample; coarser tiers keep the last sample of each interval"""
+        if not self.resolution:
+            return self._append(timestamp, state)
+        start = timestamp - timestamp % self.resolution
+        appended = None
+        if self.pending and self.pending[0] != start:
+            appended = self._append(*self.pending)
+        self.pending = (start, state)
+        return appended
+
+    def restore(self, base: Dict[SeriesKey, Any], frames: List[Frame], appended: int):
+        """Load frames read back from a store, folding any beyond the capacity into the base"""
+        self.base = dict(base)
+        self.frames = deque(frames)
+        self.appended = appended
+        while len(self.frames) > self.capacity:
+            self._fold(self.frames.popleft()[1])
+        self.state = dict(self.base)
+        for _, changes in self.frames:
+            self._fold(changes, self.state)
+
+    def series(self, match: Callable[[SeriesKey], bool], since: float = 0.0) -> Dict[SeriesKey, List[Tuple[float, Any]]]:
+        """Decoded (timestamp, value) points of the matching series at or after `since`"""
+        values = {key: value for key, value in self.base.items() if match(key)}
+        points: Dict[SeriesKey, List[Tuple[float, Any]]] = {}
+        for timestamp, changes in self.frames:
+            for key, value in changes.items():
+                if match(key):
+                    if value is REMOVED:
+                        values.pop(key, None)
+                    else:
+                        values[key] = value
+            if timestamp >= since:
+                for key, value in values.items():
+                    points.setdefault(key, []).append((timestamp, value))
+        if self.pending and self.pending[0] >= since:
+            timestamp, state = self.pending
+            for key, value in state.items():
+                if match(key):
+                    points.setdefault(key, []).append((timestamp, value))
+        return points
+
+    @property
+    def stored_values(self) -> int:
+        """Series values held by the frames and the base"""
+        return len(self.base) + sum(len(changes) for _, changes in self.frames)
+
+    def _append(self, timestamp: float, state: Dict[SeriesKey, Any]) -> Appended:
+        previous = self.state
+        changes = {key: value for key, value in state.items() if previous.get(key, REMOVED) != value}
+        changes.update((key, REMOVED) for key in previous.keys() - state.keys())
+        frame = (timestamp, changes)
+        self.frames.append(frame)
+        self.appended += 1
+        self.state = state
+        evicted = None
+        if len(self.frames) > self.capacity:
+            _, evicted = self.frames.popleft()
+            self._fold(evicted)
+        return frame, evicted
+
+    def _fold(self, changes: Dict[SeriesKey, Any], values: Optional[Dict[SeriesKey, Any]] = None):
+        """Apply a frame's changes to the base, or to `values`"""
+        values = self.base if values is None else values
+        for key, value in changes.items():
+            if value is REMOVED:
+                values.pop(key, None)
+            else:
+                values[key] = value
+
+class ClusterHistory:
+    """Health history of one cluster at every resolution"""
+
+    def __init__(self, retention: Optional[Dict[str, int]] = None):
+        retention = dict(DEFAULT_RETENTION, **(retention or {}))
+        self.tiers = {name: HistoryTier(resolution, retention[name]) for name, resolution in RESOLUTIONS.items()}
+
+    def record(self, timestamp: float, state: Dict[SeriesKey, Any]) -> Dict[str, Appended]:
+        """Add a sample to every tier; returns the frames that were added, by tier"""
+        appended = {}
+        # Every tier shares the same state dict; frames only hold what changed
+        for name, tier in self.tiers.items():
+            frame = tier.record(timestamp, state)
+            if frame:
+                appended[name] = frame
+        return appended
+
+    def resume_pending(self):
+        """Reopen the current interval of the coarser tiers from the newest raw sample"""
+        raw = self.tiers["raw"]
+        if not raw.frames:
+            return
+        timestamp = raw.frames[-1][0]
+        for tier in self.tiers.values():
+            if not tier.resolution:
+                continue
+            start = timestamp - timestamp % tier.resolution
+            if not tier.frames or tier.frames[-1][0] < start:
+                tier.pending = (start, raw.state)
+
+    def query(self, kind: str, name: Optional[str] = None, resolution: str = "raw",
+              since: float = 0.0) -> Dict[str, Any]:
+        """Trend of the cluster, a namespace, a node ("namespace"/"node" + name) or a pod ("pod", "ns/name")"""
+        tier = self.tiers[resolution]
+        if kind == "pod":
+            namespace, _, pod = (name or "").partition("/")
+            points = tier.series(lambda key: key[0] in ("pod", "container") and key[1] == namespace and key[2] == pod,
+                                 since)
+            return {
+                "resolution": resolution,
+                "fields": list(POD_FIELDS),
+                "points": [[timestamp, *value] for timestamp, value in points.get(("pod", namespace, pod), [])],
+                # Restart counters of the pod's containers
+                "restarts": {
+                    key[3]: [[timestamp, value] for timestamp, value in container_points]
+                    for key, container_points in sorted(points.items()) if key[0] == "container"
+                },
+            }
+        if kind not in ("cluster", "namespace", "node"):
+            raise ValueError(f"Unknown history kind: {kind!r}")
+        target = ("cluster",) if kind == "cluster" else (kind, name)
+        points = tier.series(lambda key: key == target, since)
+        return {
+            "resolution": resolution,
+            "fields": list(COUNT_FIELDS),
+            "points": [[timestamp, *value] for timestamp, value in points.get(target, [])],
+        }
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        return {
+            name: {"frames": len(tier.frames), "values": tier.stored_values, "series": len(tier.state)}
+            for name, tier in self.tiers.items()
+        }
+
+class SnapshotHistory:
+    """Health history of every cluster, recorded from each collected snapshot"""
+
+    def __init__(self, retention: Optional[Dict[str, int]] = None, store: Optional["HistoryStore"] = None):
+        self.retention = retention
+        self.store = store
+        self.clusters: Dict[str, ClusterHistory] = {}
+        self._lock = threading.Lock()
+
+    def load(self) -> int:
+        """Restore the history kept by the store; returns the number of frames loaded"""
+        if not self.store:
+            return 0
+        loaded = 0
+        with self._lock:
+            for key, tiers in self.store.load().items():
+                history = self.clusters[key] = ClusterHistory(self.retention)
+                for name, (base, frames, appended) in tiers.items():
+                    tier = history.tiers.get(name)
+                    if tier is None:
+                        continue
+                    tier.restore(base, frames, appended)
+                    loaded += len(tier.frames)
+                    if len(tier.frames) < len(frames):
+                        # Retention was lowered; keep the store in step with the folded base
+                        self.store.rewrite_base(key, name, tier)
+                history.resume_pending()
+        return loaded
+
+    def record_snapshot(self, previous: Optional["DashboardSnapshot"], snapshot: "DashboardSnapshot"):
+        """SnapshotRefresher listener: add a sample for every freshly collected cluster"""
+        for cluster in snapshot.clusters:
+            # Clusters whose collection failed still show older data; that isn't a new sample
+            if cluster.error or 'kubernetes_pods' in cluster.source_errors or not cluster.pod_index:
+                continue
+            state = health_state(cluster)
+            with self._lock:
+                history = self.clusters.get(cluster.key)
+                if history is None:
+                    history = self.clusters[cluster.key] = ClusterHistory(self.retention)
+                appended = history.record(cluster.collected_at, state)
+                if self.store and appended:
+                    self.store.append(cluster.key, history.tiers, appended)
+
+    def query(self, cluster: str, kind: str, name: Optional[str] = None, resolution: str = "raw",
+              since: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Trend of one cluster's series, or None for a cluster with no history"""
+        if resolution not in RESOLUTIONS:
+            raise ValueError(f"Unknown resolution: {resolution!r}")
+        with self._lock:
+            history = self.clusters.get(cluster)
+            if history is None:
+                return None
+            return history.query(kind, name, resolution, since or 0.0)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {key: history.stats() for key, history in self.clusters.items()}
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+AKS History Store
+=================
+
+Keeps the health history on disk so it outlives the process. Frames are
+append-only rows in a SQLite file; when a tier evicts its oldest frame, only
+the series that frame changed are folded into the stored base, so each sample
+writes about as much as it changed.
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+from typing import Any, Dict, List, Tuple
+
+from aks_history import REMOVED, Appended, Frame, HistoryTier, SeriesKey
+
+logger = logging.getLogger(__name__)
+
+# Default file of the store, next to the snapshot store
+DEFAULT_HISTORY_PATH = "aks-dashboard-history.db"
+
+# Bumped when the schema or encoding changes; stored history of other versions is dropped
+FORMAT_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS frames (
+    cluster TEXT NOT NULL, tier TEXT NOT NULL, seq INTEGER NOT NULL, timestamp REAL NOT NULL, changes TEXT NOT NULL,
+    PRIMARY KEY (cluster, tier, seq)
+);
+CREATE TABLE IF NOT EXISTS base (
+    cluster TEXT NOT NULL, tier TEXT NOT NULL, series TEXT NOT NULL, value TEXT NOT NULL,
+    PRIMARY KEY (cluster, tier, series)
+);
+"""
+
+# Base, frames and the number of frames ever appended, of one stored tier
+StoredTier = Tuple[Dict[SeriesKey, Any], List[Frame], int]
+
+def decode_value(value: Any) -> Any:
+    """Series values are tuples (counters, pod state), ints (restarts) or REMOVED"""
+    return tuple(value) if isinstance(value, list) else value
+
+class HistoryStore:
+    """Append-only SQLite copy of the history frames of every cluster and tier"""
+
+    def __init__(self, path: str = DEFAULT_HISTORY_PATH):
+        self.path = path
+        self.stats = {"frames": 0, "failures": 0}
+        self._lock = threading.Lock()
+        # Written from the refresher's listener thread, read once on startup
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode = WAL")
+        with self._connection:
+            self._connection.executescript(SCHEMA)
+            version = self._connection.execute("SELECT value FROM meta WHERE key = 'format_version'").fetchone()
+            if version and int(version[0]) != FORMAT_VERSION:
+                logger.warning(f"Dropping history in {path} of format {version[0]}")
+                self._connection.execute("DELETE FROM frames")
+                self._connection.execute("DELETE FROM base")
+            self._connection.execute("INSERT OR REPLACE INTO meta VALUES ('format_version', ?)", (str(FORMAT_VERSION),))
+
+    def load(self) -> Dict[str, Dict[str, StoredTier]]:
+        """Every stored tier, by cluster key and tier name"""
+        clusters: Dict[str, Dict[str, StoredTier]] = {}
+        with self._lock:
+            for cluster, tier, series, value in self._connection.execute("SELECT * FROM base"):
+                base = clusters.setdefault(cluster, {}).setdefault(tier, ({}, [], 0))[0]
+                base[tuple(json.loads(series))] = decode_value(json.loads(value))
+            for cluster, tier, seq, timestamp, changes in self._connection.execute(
+                    "SELECT * FROM frames ORDER BY cluster, tier, seq"):
+                base, frames, _ = clusters.setdefault(cluster, {}).get(tier, ({}, [], 0))
+                frames.append((timestamp, {tuple(key): decode_value(value) for key, value in json.loads(changes)}))
+                clusters[cluster][tier] = (base, frames, seq + 1)
+        return clusters
+
+    def append(self, cluster: str, tiers: Dict[str, HistoryTier], appended: Dict[str, Appended]):
+        """Write the frames one sample added, and fold evicted frames into the stored base"""
+        try:
+            with self._lock, self._connection:
+                for name, ((timestamp, changes), evicted) in appended.items():
+                    tier = tiers[name]
+                    self._connection.execute("INSERT INTO frames VALUES (?, ?, ?, ?, ?)", (
+                        cluster, name, tier.appended - 1, timestamp,
+                        json.dumps([[key, value] for key, value in changes.items()])
+                    ))
+                    if evicted is not None:
+                        self._fold(cluster, name, evicted)
+                        self._drop_evicted(cluster, name, tier)
+        except sqlite3.Error as e:
+            self.stats["failures"] += 1
+            logger.error(f"Failed to write history of {cluster}: {e}")
+            return
+        self.stats["frames"] += len(appended)
+
+    def rewrite_base(self, cluster: str, name: str, tier: HistoryTier):
+        """Replace the stored base of a tier, after frames were folded into it in memory"""
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM base WHERE cluster = ? AND tier = ?", (cluster, name))
+            self._fold(cluster, name, tier.base)
+            self._drop_evicted(cluster, name, tier)
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+    def _fold(self, cluster: str, name: str, changes: Dict[SeriesKey, Any]):
+        removed = [(cluster, name, json.dumps(key)) for key, value in changes.items() if value is REMOVED]
+        self._connection.executemany("DELETE FROM base WHERE cluster = ? AND tier = ? AND series = ?", removed)
+        self._connection.executemany("INSERT OR REPLACE INTO base VALUES (?, ?, ?, ?)", [
+            (cluster, name, json.dumps(key), json.dumps(value))
+            for key, value in changes.items() if value is not REMOVED
+        ])
+
+    def _drop_evicted(self, cluster: str, name: str, tier: HistoryTier):
+        self._connection.execute("DELETE FROM frames WHERE cluster = ? AND tier = ? AND seq < ?",
+                                 (cluster, name, tier.appended - len(tier.frames)))
@@ -7,23 +7,39 @@ Generates an interactive HTML dashboard to visualize AKS container data.
 """
 
 import json
+import os
+import tempfile
 import matplotlib.pyplot as plt
 import matplotlib.patches as patches
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Any, Mapping, Optional, Sequence
 from dataclasses import dataclass, asdict
 import logging
-import subprocess
+from sys import intern
+import time
 import yaml
-import tempfile
-import os
 
 # Azure SDK imports
 from azure.identity import ClientSecretCredential
 from azure.mgmt.containerservice import ContainerServiceClient
 from azure.mgmt.resource import ResourceManagementClient
 
+from aks_kube_api import (
+    KubeApiClient, KubeAuthError, PodSource, KubeApiPodSource, KubectlPodSource, FallbackPodSource
+)
+from aks_ages import format_ages, parse_created_at
+from aks_fragment_cache import FragmentCache
+from aks_kubeconfig import KubeconfigCache
+from aks_pod_informer import PodInformer
+from aks_pod_index import PodGroup, PodIndex
+from aks_templates import get_templates
+
+if TYPE_CHECKING:
+    from aks_resource_graph import ResourceGraphInventory
+    from aks_snapshot import ClusterSnapshot
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -40,6 +56,33 @@ class ClusterInfo:
     fqdn: str
     resource_group: str
 
+@dataclass(frozen=True)
+class ClusterTarget:
+    """AKS cluster to collect, as configured in azure-visualization-config.json"""
+    name: str
+    resource_group: str
+    subscription_id: str
+
+    @property
+    def key(self) -> str:
+        """Stable identifier used in drill-down URLs"""
+        return f"{self.resource_group}/{self.name}"
+
+# Cluster collected when the config has no "clusters" list
+DEFAULT_CLUSTERS = [{"name": "transact", "resource_group": "rg-modular-demo"}]
+
+def load_cluster_targets(config: Dict[str, Any]) -> List[ClusterTarget]:
+    """Read the cluster list from a loaded config file"""
+    default_subscription = config['azure']['subscription_id']
+    return [
+        ClusterTarget(
+            name=cluster['name'],
+            resource_group=cluster['resource_group'],
+            subscription_id=cluster.get('subscription_id', default_subscription)
+        )
+        for cluster in config.get('clusters', DEFAULT_CLUSTERS)
+    ]
+
 @dataclass
 class ResourceInfo:
     """Resource information"""
@@ -49,9 +92,17 @@ class ResourceInfo:
     resource_group: str
     tags: Dict[str, str]
 
+# Resources of containers parsed from the pod status, which doesn't report them;
+# read-only so every container can share it
+NO_RESOURCES: Mapping[str, str] = MappingProxyType({})
+
+# Pods and containers are kept for every pod of every cluster, so they are
+# slotted (no per-instance __dict__) and repeated strings are interned when parsed
+
 @dataclass
 class ContainerInfo:
     """Kubernetes container information"""
+    __slots__ = ("name", "namespace", "pod_name", "image", "status", "ready", "restart_count", "ports", "resources")
     name: str
     namespace: str
     pod_name: str
@@ -59,24 +110,27 @@ class ContainerInfo:
     status: str
     ready: bool
     restart_count: int
-    ports: List[str]
-    resources: Dict[str, str]
+    ports: Sequence[str]
+    resources: Mapping[str, str]
 
 @dataclass
 class PodInfo:
     """Kubernetes pod information"""
+    __slots__ = ("name", "namespace", "status", "ready", "containers", "node_name", "created_at")
     name: str
     namespace: str
     status: str
     ready: str
     containers: List[ContainerInfo]
     node_name: str
-    age: str
+    # Epoch seconds; ages are computed in batches when rendering (see aks_ages)
+    created_at: Optional[int]
 
 class AKSDashboardGenerator:
     """AKS HTML Dashboard Generator"""
     
-    def __init__(self, subscription_id: str, tenant_id: str, client_id: str, client_secret: str):
+    def __init__(self, subscription_id: str, tenant_id: str, client_id: str, client_secret: str,
+                 pod_source: str = "api", resource_inventory: Optional["ResourceGraphInventory"] = None):
         self.subscription_id = subscription_id
         self.tenant_id = tenant_id
         self.client_id = client_id
@@ -84,6 +138,13 @@ class AKSDashboardGenerator:
         self.credential = None
         self.container_client = None
         self.resource_client = None
+        self.kubeconfig_caches = {}
+        # "api" talks to the API server directly with kubectl as fallback; "kubectl" only forks kubectl
+        self.pod_source = pod_source
+        self.pod_sources = {}
+        self.pod_informers = {}
+        # Bulk Resource Graph inventory shared across generators; None pages ARM per group
+        self.resource_inventory = resource_inventory
         
     def _get_credential(self):
         """Get Azure credential"""
@@ -115,124 +176,204 @@ class AKSDashboardGenerator:
             container_client = self._get_container_client()
             cluster = container_client.managed_clusters.get(resource_group, cluster_name)
             
-            cluster_info = ClusterInfo(
-                name=cluster.name,
-                location=cluster.location,
-                kubernetes_version=cluster.kubernetes_version,
-                node_count=cluster.agent_pool_profiles[0].count if cluster.agent_pool_profiles else 0,
-                vm_size=cluster.agent_pool_profiles[0].vm_size if cluster.agent_pool_profiles else 'Unknown',
-                power_state=cluster.power_state.code if cluster.power_state else 'Unknown',
-                fqdn=cluster.fqdn,
-                resource_group=resource_group
-            )
-            
-            return cluster_info
+            return self._to_cluster_info(cluster, resource_group)
         except Exception as e:
             logger.error(f"Error getting cluster info: {e}")
             return None
     
-    def get_resource_group_resources(self, resource_group: str) -> List[ResourceInfo]:
-        """Get all resources in a resource group"""
+    def get_resource_group_resources(self, resource_group: str, strict: bool = False) -> List[ResourceInfo]:
+        """Get all resources in a resource group; `strict` raises errors instead of returning none"""
         try:
+            if self.resource_inventory:
+                return self.resource_inventory.get_resources(self.subscription_id, resource_group)
+            
             resource_client = self._get_resource_client()
             resources = resource_client.resources.list_by_resource_group(resource_group)
             
-            resource_list = []
-            for resource in resources:
-                resource_info = ResourceInfo(
-                    name=resource.name,
-                    type=resource.type,
-                    location=resource.location,
-                    resource_group=resource_group,
-                    tags=resource.tags or {}
-                )
-                resource_list.append(resource_info)
-            
-            return resource_list
+            return [self._to_resource_info(resource, resource_group) for resource in resources]
         except Exception as e:
+            if strict:
+                raise
             logger.error(f"Error getting resources: {e}")
             return []
     
-    def get_kubernetes_containers(self, resource_group: str, cluster_name: str) -> List[PodInfo]:
-        """Get Kubernetes containers and pods from AKS cluster"""
-        try:
-            # Get cluster credentials
-            container_client = self._get_container_client()
-            credentials = container_client.managed_clusters.list_cluster_admin_credentials(
-                resource_group, cluster_name
+    @staticmethod
+    def _to_cluster_info(cluster, resource_group: str) -> ClusterInfo:
+        """Convert a ManagedCluster model into ClusterInfo"""
+        return ClusterInfo(
+            name=cluster.name,
+            location=cluster.location,
+            kubernetes_version=cluster.kubernetes_version,
+            node_count=cluster.agent_pool_profiles[0].count if cluster.agent_pool_profiles else 0,
+            vm_size=cluster.agent_pool_profiles[0].vm_size if cluster.agent_pool_profiles else 'Unknown',
+            power_state=cluster.power_state.code if cluster.power_state else 'Unknown',
+            fqdn=cluster.fqdn,
+            resource_group=resource_group
+        )
+    
+    @staticmethod
+    def _to_resource_info(resource, resource_group: str) -> ResourceInfo:
+        """Convert a GenericResource model into ResourceInfo"""
+        return ResourceInfo(
+            name=resource.name,
+            type=resource.type,
+            location=resource.location,
+            resource_group=resource_group,
+            tags=resource.tags or {}
+        )
+    
+    def _fetch_kubeconfig(self, resource_group: str, cluster_name: str) -> Optional[str]:
+        """Fetch the cluster admin kubeconfig from Azure"""
+        container_client = self._get_container_client()
+        credentials = container_client.managed_clusters.list_cluster_admin_credentials(
+            resource_group, cluster_name
+        )
+        
+        if not credentials.kubeconfigs:
+            logger.warning("No kubeconfig available")
+            return None
+        
+        return credentials.kubeconfigs[0].value.decode('utf-8')
+    
+    def _get_kubeconfig_cache(self, resource_group: str, cluster_name: str) -> KubeconfigCache:
+        """Get the kubeconfig cache for a cluster"""
+        key = (resource_group, cluster_name)
+        if key not in self.kubeconfig_caches:
+            self.kubeconfig_caches[key] = KubeconfigCache(
+                lambda: self._fetch_kubeconfig(resource_group, cluster_name)
             )
+        return self.kubeconfig_caches[key]
+    
+    def _get_pod_source(self, resource_group: str, cluster_name: str) -> Optional[PodSource]:
+        """Get the pod source for a cluster, rebuilding it when credentials change"""
+        kubeconfig_cache = self._get_kubeconfig_cache(resource_group, cluster_name)
+        kubeconfig_content = kubeconfig_cache.get_content()
+        if kubeconfig_content is None:
+            return None
+        
+        key = (resource_group, cluster_name)
+        cached = self.pod_sources.get(key)
+        if cached and cached[0] is kubeconfig_content:
+            return cached[1]
+        if cached:
+            cached[1].close()
+        
+        kubectl_source = KubectlPodSource(kubeconfig_cache.path)
+        pod_source = kubectl_source
+        if self.pod_source == "api":
+            try:
+                api_client = KubeApiClient.from_kubeconfig(kubeconfig_content)
+                pod_source = FallbackPodSource([KubeApiPodSource(api_client), kubectl_source])
+            except Exception as e:
+                logger.warning(f"Kubernetes API client unavailable, using kubectl: {e}")
+        
+        self.pod_sources[key] = (kubeconfig_content, pod_source)
+        return pod_source
+    
+    def start_pod_informer(self, resource_group: str, cluster_name: str) -> PodInformer:
+        """Start a watch-based pod cache that get_kubernetes_containers reads once synced"""
+        key = (resource_group, cluster_name)
+        if key not in self.pod_informers:
+            kubeconfig_cache = self._get_kubeconfig_cache(resource_group, cluster_name)
             
-            if not credentials.kubeconfigs:
-                logger.warning("No kubeconfig available")
-                return self._get_mock_kubernetes_data()
-            
-            # Write kubeconfig to temporary file
-            kubeconfig_content = credentials.kubeconfigs[0].value.decode('utf-8')
+            def client_factory():
+                kubeconfig_content = kubeconfig_cache.get_content()
+                if kubeconfig_content is None:
+                    raise RuntimeError("No kubeconfig available")
+                return KubeApiClient.from_kubeconfig(kubeconfig_content)
             
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False) as f:
-                f.write(kubeconfig_content)
-                kubeconfig_path = f.name
+            self.pod_informers[key] = PodInformer(
+                client_factory, self._parse_pod, on_auth_failure=kubeconfig_cache.invalidate
+            )
+            self.pod_informers[key].start()
+        return self.pod_informers[key]
+    
+    def get_kubernetes_containers(self, resource_group: str, cluster_name: str,
+                                  strict: bool = False) -> List[PodInfo]:
+        """Get Kubernetes containers and pods from AKS cluster
+        
+        Without `strict`, failures fall back to mock data for the standalone dashboard; the
+        server's collectors pass `strict` so a failure is reported instead of published.
+        """
+        # A synced informer already holds the live pod list
+        informer = self.pod_informers.get((resource_group, cluster_name))
+        if informer and informer.synced.is_set():
+            return informer.pods()
+        
+        try:
+            pod_source = self._get_pod_source(resource_group, cluster_name)
+            if not pod_source:
+                raise RuntimeError("No kubeconfig available")
             
             try:
-                # Get pods using kubectl
-                result = subprocess.run([
-                    'kubectl', '--kubeconfig', kubeconfig_path, 'get', 'pods', 
-                    '--all-namespaces', '-o', 'json'
-                ], capture_output=True, text=True, timeout=30)
-                
-                if result.returncode != 0:
-                    logger.warning(f"kubectl command failed: {result.stderr}")
-                    return self._get_mock_kubernetes_data()
-                
-                pods_data = json.loads(result.stdout)
-                pods = []
-                
-                for pod in pods_data.get('items', []):
-                    # Count ready containers in this pod
-                    container_statuses = pod['status'].get('containerStatuses', [])
-                    ready_containers = sum(1 for container in container_statuses if container.get('ready', False))
-                    total_containers = len(container_statuses)
-                    
-                    pod_info = PodInfo(
-                        name=pod['metadata']['name'],
-                        namespace=pod['metadata']['namespace'],
-                        status=pod['status']['phase'],
-                        ready=f"{ready_containers}/{total_containers}",
-                        containers=[],
-                        node_name=pod['status'].get('hostIP', 'Unknown'),
-                        age=self._calculate_age(pod['metadata']['creationTimestamp'])
-                    )
-                    
-                    # Get container information
-                    for container in container_statuses:
-                        container_info = ContainerInfo(
-                            name=container['name'],
-                            namespace=pod['metadata']['namespace'],
-                            pod_name=pod['metadata']['name'],
-                            image=container['image'],
-                            status=container['state'],
-                            ready=container['ready'],
-                            restart_count=container['restartCount'],
-                            ports=[],
-                            resources={}
-                        )
-                        pod_info.containers.append(container_info)
-                    
-                    pods.append(pod_info)
-                
-                return pods
-                
-            finally:
-                # Clean up temporary file
-                os.unlink(kubeconfig_path)
-                
+                return self._parse_pods(pod_source.iter_pods())
+            except KubeAuthError:
+                # Credentials were rotated or revoked; fetch new ones and retry once
+                self._get_kubeconfig_cache(resource_group, cluster_name).invalidate()
+                pod_source = self._get_pod_source(resource_group, cluster_name)
+                if not pod_source:
+                    raise RuntimeError("No kubeconfig available")
+                return self._parse_pods(pod_source.iter_pods())
+            
         except Exception as e:
+            if strict:
+                raise
             logger.error(f"Error getting Kubernetes containers: {e}")
             logger.info("Using mock Kubernetes data for demonstration")
             return self._get_mock_kubernetes_data()
     
+    def _parse_pods(self, pods: Iterable[Dict[str, Any]]) -> List[PodInfo]:
+        """Convert a stream of Kubernetes pod objects into PodInfo records"""
+        return [self._parse_pod(pod) for pod in pods]
+    
+    def _parse_pod(self, pod: Dict[str, Any]) -> PodInfo:
+        """Convert one Kubernetes pod object into a PodInfo record"""
+        # Count ready containers in this pod
+        container_statuses = pod['status'].get('containerStatuses', [])
+        ready_containers = sum(1 for container in container_statuses if container.get('ready', False))
+        total_containers = len(container_statuses)
+        
+        # Namespaces, nodes, images and states repeat across pods; share one copy of each
+        name = pod['metadata']['name']
+        namespace = intern(pod['metadata']['namespace'])
+        pod_info = PodInfo(
+            name=name,
+            namespace=namespace,
+            status=intern(pod['status']['phase']),
+            ready=intern(f"{ready_containers}/{total_containers}"),
+            containers=[],
+            node_name=intern(pod['status'].get('hostIP', 'Unknown')),
+            created_at=parse_created_at(pod['metadata'].get('creationTimestamp'))
+        )
+        
+        # Get container information
+        for container in container_statuses:
+            container_info = ContainerInfo(
+                name=intern(container['name']),
+                namespace=namespace,
+                pod_name=name,
+                image=intern(container['image']),
+                status=intern(self._container_state(container.get('state', {}))),
+                ready=container['ready'],
+                restart_count=container['restartCount'],
+                # Not reported by the pod status; every container shares the same empty values
+                ports=(),
+                resources=NO_RESOURCES
+            )
+            pod_info.containers.append(container_info)
+        
+        return pod_info
+    
+    def _container_state(self, state: Dict[str, Any]) -> str:
+        """Summarize a container state object as e.g. 'running' or 'waiting (CrashLoopBackOff)'"""
+        for state_name, details in state.items():
+            reason = (details or {}).get('reason')
+            return f"{state_name} ({reason})" if reason else state_name
+        return 'unknown'
+    
     def _get_mock_kubernetes_data(self) -> List[PodInfo]:
         """Generate mock Kubernetes data for demonstration"""
+        now = int(time.time())
         mock_pods = [
             PodInfo(
                 name="nginx-deployment-7d4f8b8b8b",
@@ -253,7 +394,7 @@ class AKSDashboardGenerator:
                     )
                 ],
                 node_name="aks-nodepool1-12345678-vmss000000",
-                age="2d"
+                created_at=now - 2 * 86400
             ),
             PodInfo(
                 name="redis-master-6b7d8c9d0e",
@@ -274,7 +415,7 @@ class AKSDashboardGenerator:
                     )
                 ],
                 node_name="aks-nodepool1-12345678-vmss000001",
-                age="1d"
+                created_at=now - 86400
             ),
             PodInfo(
                 name="postgres-db-9e8f7g6h5i",
@@ -295,7 +436,7 @@ class AKSDashboardGenerator:
                     )
                 ],
                 node_name="aks-nodepool1-12345678-vmss000002",
-                age="3d"
+                created_at=now - 3 * 86400
             ),
             PodInfo(
                 name="api-gateway-4j3k2l1m0n",
@@ -327,7 +468,7 @@ class AKSDashboardGenerator:
                     )
                 ],
                 node_name="aks-nodepool1-12345678-vmss000000",
-                age="6h"
+                created_at=now - 6 * 3600
             ),
             PodInfo(
                 name="monitoring-prometheus-5o4p3q2r1s",
@@ -348,7 +489,7 @@ class AKSDashboardGenerator:
                     )
                 ],
                 node_name="aks-nodepool1-12345678-vmss000001",
-                age="1d"
+                created_at=now - 86400
             ),
             PodInfo(
                 name="logging-fluentd-6t5u4v3w2x",
@@ -369,1086 +510,110 @@ class AKSDashboardGenerator:
                     )
                 ],
                 node_name="aks-nodepool1-12345678-vmss000002",
-                age="4d"
+                created_at=now - 4 * 86400
             )
         ]
         
         return mock_pods
     
-    def _calculate_age(self, creation_timestamp: str) -> str:
-        """Calculate age from creation timestamp"""
-        try:
-            from datetime import datetime, timezone
-            created = datetime.fromisoformat(creation_timestamp.replace('Z', '+00:00'))
-            now = datetime.now(timezone.utc)
-            diff = now - created
-            
-            if diff.days > 0:
-                return f"{diff.days}d"
-            elif diff.seconds > 3600:
-                return f"{diff.seconds // 3600}h"
-            elif diff.seconds > 60:
-                return f"{diff.seconds // 60}m"
-            else:
-                return f"{diff.seconds}s"
-        except:
-            return "Unknown"
-    
     def generate_html_dashboard(self, cluster_info: ClusterInfo, resources: List[ResourceInfo], 
                                kubernetes_pods: List[PodInfo], output_path: str = "aks-dashboard.html"):
         """Generate interactive HTML dashboard"""
         
-        # Group resources by type
-        resource_types = {}
-        for resource in resources:
-            resource_type = resource.type.split('/')[-1]
-            if resource_type not in resource_types:
-                resource_types[resource_type] = []
-            resource_types[resource_type].append(resource)
-        
-        # Filter for container-related resources
-        container_resources = [r for r in resources if any(keyword in r.type.lower() for keyword in 
-                                                         ['container', 'pod', 'deployment', 'service', 'namespace'])]
-        
-        # Group resources by type for better organization
-        containers_by_type = {}
-        for resource in container_resources:
-            resource_type = resource.type.split('/')[-1]
-            if resource_type not in containers_by_type:
-                containers_by_type[resource_type] = []
-            containers_by_type[resource_type].append(resource)
-        
-        # Create HTML content
-        html_content = self._create_html_template(cluster_info, containers_by_type, resources, kubernetes_pods)
-        
-        # Write to file
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+        # Stream the page to a staging file next to the output and swap it in once complete,
+        # so a failed render never leaves a truncated dashboard behind
+        directory = os.path.dirname(os.path.abspath(output_path))
+        fd, staging_path = tempfile.mkstemp(prefix=".aks-dashboard-", suffix=".html", dir=directory)
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                # The file is opened without the server, so CSS/JS are embedded
+                f.writelines(self._iter_html_template(
+                    cluster_info, resources, kubernetes_pods, inline_assets=True
+                ))
+                f.flush()
+                os.fsync(f.fileno())
+            # mkstemp creates the file readable by its owner only
+            os.chmod(staging_path, 0o644)
+            os.replace(staging_path, output_path)
+        except Exception:
+            os.unlink(staging_path)
+            raise
         
         logger.info(f"HTML dashboard saved to: {output_path}")
         return output_path
     
-    def _create_html_template(self, cluster_info: ClusterInfo, containers_by_type: Dict[str, List[ResourceInfo]], 
-                             all_resources: List[ResourceInfo], kubernetes_pods: List[PodInfo]) -> str:
-        """Create the HTML dashboard template"""
-        
-        # Count total containers
-        total_containers = sum(len(pod.containers) for pod in kubernetes_pods)
-        
-        html_template = f"""
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>AKS Container Dashboard - {cluster_info.name}</title>
-    
-    <!-- Bootstrap CSS -->
-    <link href="https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/css/bootstrap.min.css" rel="stylesheet">
-    <!-- Font Awesome -->
-    <link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.4.0/css/all.min.css">
+    def _create_html_template(self, cluster_info: ClusterInfo, all_resources: List[ResourceInfo],
+                             kubernetes_pods: List[PodInfo], inline_assets: bool = False) -> str:
+        """Create the HTML dashboard page"""
+        return "".join(self._iter_html_template(cluster_info, all_resources, kubernetes_pods, inline_assets))
     
-    <style>
-        body {{
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            min-height: 100vh;
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            font-size: 0.9rem;
-        }}
-        
-        .dashboard-container {{
-            background: rgba(255, 255, 255, 0.95);
-            border-radius: 20px;
-            box-shadow: 0 20px 40px rgba(0, 0, 0, 0.1);
-            margin: 20px;
-            padding: 30px;
-        }}
-        
-        .header {{
-            background: linear-gradient(135deg, #3498db, #2980b9);
-            color: white;
-            padding: 25px;
-            border-radius: 15px;
-            margin-bottom: 25px;
-            text-align: center;
-        }}
-        
-        .header h1 {{
-            font-size: 1.8rem;
-            margin-bottom: 0.5rem;
-        }}
-        
-        .header p {{
-            font-size: 0.9rem;
-            margin-bottom: 0;
-        }}
-        
-        .metric-card {{
-            background: white;
-            border-radius: 15px;
-            padding: 20px;
-            margin-bottom: 15px;
-            box-shadow: 0 10px 30px rgba(0, 0, 0, 0.1);
-            border-left: 5px solid #3498db;
-            transition: transform 0.3s ease;
-        }}
-        
-        .metric-card:hover {{
-            transform: translateY(-5px);
-        }}
-        
-        .metric-value {{
-            font-size: 2rem;
-            font-weight: bold;
-            color: #2c3e50;
-        }}
-        
-        .metric-label {{
-            color: #7f8c8d;
-            font-size: 0.85rem;
-            margin-top: 8px;
-        }}
-        
-        .container-section {{
-            background: white;
-            border-radius: 15px;
-            padding: 20px;
-            margin-bottom: 15px;
-            box-shadow: 0 10px 30px rgba(0, 0, 0, 0.1);
-        }}
-        
-        .container-section h4 {{
-            font-size: 1.1rem;
-            margin-bottom: 15px;
-        }}
-        
-        .container-type-header {{
-            background: linear-gradient(135deg, #3498db, #2980b9);
-            color: white;
-            padding: 12px 15px;
-            border-radius: 8px;
-            margin-bottom: 12px;
-            font-weight: bold;
-            display: flex;
-            align-items: center;
-            justify-content: space-between;
-            font-size: 0.9rem;
-            cursor: pointer;
-            transition: all 0.3s ease;
-        }}
-        
-        .container-type-header:hover {{
-            background: linear-gradient(135deg, #2980b9, #1f5f8b);
-            transform: translateY(-2px);
-        }}
-        
-        .container-type-header .toggle-btn {{
-            background: rgba(255, 255, 255, 0.2);
-            border: none;
-            color: white;
-            padding: 5px 10px;
-            border-radius: 15px;
-            font-size: 0.8rem;
-            cursor: pointer;
-            transition: all 0.3s ease;
-        }}
-        
-        .container-type-header .toggle-btn:hover {{
-            background: rgba(255, 255, 255, 0.3);
-        }}
-        
-        .status-indicator {{
-            display: inline-block;
-            width: 12px;
-            height: 12px;
-            border-radius: 50%;
-            margin-right: 8px;
-            border: 2px solid rgba(255, 255, 255, 0.3);
-        }}
-        
-        .status-all-healthy {{
-            background-color: #28a745;
-            box-shadow: 0 0 8px rgba(40, 167, 69, 0.6);
-        }}
-        
-        .status-has-issues {{
-            background-color: #dc3545;
-            box-shadow: 0 0 8px rgba(220, 53, 69, 0.6);
-        }}
-        
-        .namespace-summary {{
-            background: #f8f9fa;
-            border-radius: 8px;
-            padding: 15px;
-            margin-bottom: 10px;
-            border-left: 4px solid #3498db;
-            display: none;
-        }}
-        
-        .namespace-summary.show {{
-            display: block;
-        }}
-        
-        /* Hide all details sections by default */
-        [id^="details-"] {{
-            display: none;
-        }}
-        
-        /* Node Visualization Styles */
-        .node-visualization {{
-            margin-top: 30px;
-        }}
-        
-        .node-grid {{
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(350px, 1fr));
-            gap: 20px;
-            margin-top: 20px;
-        }}
-        
-        .node-box {{
-            background: white;
-            border-radius: 12px;
-            border: 2px solid #e9ecef;
-            box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
-            overflow: hidden;
-            transition: all 0.3s ease;
-        }}
-        
-        .node-box:hover {{
-            transform: translateY(-2px);
-            box-shadow: 0 8px 15px rgba(0, 0, 0, 0.15);
-        }}
-        
-        .node-box.node-healthy {{
-            border-color: #28a745;
-        }}
-        
-        .node-box.node-unhealthy {{
-            border-color: #dc3545;
-        }}
-        
-        .node-header {{
-            background: linear-gradient(135deg, #f8f9fa, #e9ecef);
-            padding: 15px 20px;
-            border-bottom: 1px solid #dee2e6;
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-        }}
-        
-        .node-header h5 {{
-            margin: 0;
-            color: #2c3e50;
-            font-size: 1.1rem;
-            font-weight: bold;
-        }}
-        
-        .node-stats {{
-            display: flex;
-            align-items: center;
-            gap: 10px;
-        }}
-        
-        .stat-badge {{
-            background: #6c757d;
-            color: white;
-            padding: 4px 8px;
-            border-radius: 12px;
-            font-size: 0.75rem;
-            font-weight: bold;
-        }}
-        
-        .health-indicator {{
-            width: 12px;
-            height: 12px;
-            border-radius: 50%;
-            border: 2px solid white;
-        }}
-        
-        .health-indicator.node-healthy {{
-            background-color: #28a745;
-            box-shadow: 0 0 8px rgba(40, 167, 69, 0.6);
-        }}
-        
-        .health-indicator.node-unhealthy {{
-            background-color: #dc3545;
-            box-shadow: 0 0 8px rgba(220, 53, 69, 0.6);
-        }}
-        
-        .node-content {{
-            padding: 15px 20px;
-            max-height: 400px;
-            overflow-y: auto;
-        }}
-        
-        .namespace-group {{
-            margin-bottom: 15px;
-            padding: 10px;
-            border-radius: 8px;
-            background: #f8f9fa;
-            border-left: 3px solid #6c757d;
-        }}
-        
-        .namespace-group.namespace-healthy {{
-            border-left-color: #28a745;
-            background: #f8fff9;
-        }}
-        
-        .namespace-group.namespace-unhealthy {{
-            border-left-color: #dc3545;
-            background: #fff8f8;
-        }}
-        
-        .namespace-label {{
-            display: flex;
-            align-items: center;
-            gap: 8px;
-            margin-bottom: 8px;
-            font-size: 0.9rem;
-        }}
-        
-        .namespace-status {{
-            width: 8px;
-            height: 8px;
-            border-radius: 50%;
-        }}
-        
-        .namespace-status.namespace-healthy {{
-            background-color: #28a745;
-        }}
-        
-        .namespace-status.namespace-unhealthy {{
-            background-color: #dc3545;
-        }}
-        
-        .container-list {{
-            margin-left: 15px;
-        }}
-        
-        .pod-item {{
-            display: flex;
-            align-items: center;
-            gap: 8px;
-            margin-bottom: 5px;
-            font-size: 0.8rem;
-            padding: 3px 0;
-        }}
-        
-        .pod-status {{
-            width: 6px;
-            height: 6px;
-            border-radius: 50%;
-        }}
-        
-        .pod-status.status-green {{
-            background-color: #28a745;
-        }}
-        
-        .pod-status.status-red {{
-            background-color: #dc3545;
-        }}
-        
-        .pod-status.status-yellow {{
-            background-color: #ffc107;
-        }}
-        
-        .pod-name {{
-            font-weight: 500;
-            color: #2c3e50;
-        }}
-        
-        .pod-containers {{
-            color: #6c757d;
-            font-size: 0.75rem;
-        }}
-        
-        .container-item {{
-            background: #f8f9fa;
-            border-radius: 8px;
-            padding: 15px;
-            margin-bottom: 12px;
-            border-left: 4px solid #3498db;
-            transition: all 0.3s ease;
-        }}
-        
-        .container-item:hover {{
-            background: #e9ecef;
-            transform: translateX(5px);
-        }}
-        
-        .container-name {{
-            font-size: 1rem;
-            font-weight: bold;
-            color: #2c3e50;
-            margin-bottom: 8px;
-        }}
-        
-        .container-details {{
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(150px, 1fr));
-            gap: 10px;
-            margin-top: 10px;
-        }}
-        
-        .detail-item {{
-            background: white;
-            padding: 8px 12px;
-            border-radius: 6px;
-            border: 1px solid #dee2e6;
-        }}
-        
-        .detail-label {{
-            font-size: 0.75rem;
-            color: #6c757d;
-            font-weight: bold;
-            margin-bottom: 3px;
-        }}
-        
-        .detail-value {{
-            color: #2c3e50;
-            font-weight: 500;
-            font-size: 0.8rem;
-        }}
-        
-        .status-badge {{
-            padding: 3px 10px;
-            border-radius: 15px;
-            font-size: 0.75rem;
-            font-weight: bold;
-        }}
-        
-        .status-running {{
-            background-color: #d4edda;
-            color: #155724;
-        }}
-        
-        .status-stopped {{
-            background-color: #f8d7da;
-            color: #721c24;
-        }}
-        
-        .status-pending {{
-            background-color: #fff3cd;
-            color: #856404;
-        }}
-        
-        .refresh-btn {{
-            background: linear-gradient(135deg, #3498db, #2980b9);
-            border: none;
-            border-radius: 25px;
-            padding: 10px 20px;
-            color: white;
-            font-weight: bold;
-            transition: all 0.3s ease;
-            font-size: 0.85rem;
-        }}
-        
-        .refresh-btn:hover {{
-            transform: scale(1.05);
-            box-shadow: 0 5px 15px rgba(52, 152, 219, 0.4);
-        }}
-        
-        .refresh-btn:disabled {{
-            opacity: 0.6;
-            cursor: not-allowed;
-            transform: none;
-        }}
-        
-        .loading {{
-            display: none;
-            text-align: center;
-            padding: 20px;
-        }}
-        
-        .spinner {{
-            border: 4px solid #f3f3f3;
-            border-top: 4px solid #3498db;
-            border-radius: 50%;
-            width: 40px;
-            height: 40px;
-            animation: spin 1s linear infinite;
-            margin: 0 auto 10px;
-        }}
-        
-        @keyframes spin {{
-            0% {{ transform: rotate(0deg); }}
-            100% {{ transform: rotate(360deg); }}
-        }}
-        
-        .no-containers {{
-            text-align: center;
-            padding: 30px;
-            color: #6c757d;
-            font-style: italic;
-            font-size: 0.9rem;
-        }}
-        
-        .container-count {{
-            background: rgba(255, 255, 255, 0.2);
-            padding: 3px 10px;
-            border-radius: 12px;
-            font-size: 0.75rem;
-        }}
-        
-        .table {{
-            font-size: 0.8rem;
-        }}
-        
-        .table th {{
-            font-size: 0.8rem;
-            padding: 8px 12px;
-        }}
-        
-        .table td {{
-            font-size: 0.8rem;
-            padding: 8px 12px;
-        }}
-        
-        .pod-container {{
-            background: #f8f9fa;
-            border-radius: 6px;
-            padding: 10px;
-            margin: 5px 0;
-            border-left: 3px solid #28a745;
-        }}
-        
-        .pod-container:hover {{
-            background: #e9ecef;
-        }}
-        
-        .container-status {{
-            display: inline-block;
-            width: 8px;
-            height: 8px;
-            border-radius: 50%;
-            margin-right: 5px;
-        }}
-        
-        .status-green {{
-            background-color: #28a745;
-        }}
-        
-        .status-red {{
-            background-color: #dc3545;
-        }}
-        
-        .status-yellow {{
-            background-color: #ffc107;
-        }}
-        
-        .summary-stats {{
-            display: flex;
-            gap: 15px;
-            flex-wrap: wrap;
-            margin-bottom: 10px;
-        }}
-        
-        .summary-stat {{
-            background: white;
-            padding: 8px 12px;
-            border-radius: 6px;
-            border: 1px solid #dee2e6;
-            font-size: 0.8rem;
-        }}
-        
-        .summary-stat .stat-value {{
-            font-weight: bold;
-            color: #2c3e50;
-        }}
-        
-        .summary-stat .stat-label {{
-            color: #6c757d;
-            font-size: 0.7rem;
-        }}
-    </style>
-</head>
-<body>
-    <div class="dashboard-container">
-        <!-- Header -->
-        <div class="header">
-            <h1><i class="fas fa-cube"></i> AKS Container Dashboard</h1>
-            <p class="mb-0">Real-time visualization of your Azure Kubernetes Service containers</p>
-            <button class="btn refresh-btn mt-3" onclick="refreshDashboard()" id="refreshBtn">
-                <i class="fas fa-sync-alt"></i> Refresh Data
-            </button>
-        </div>
-        
-        <!-- Loading Indicator -->
-        <div class="loading" id="loading">
-            <div class="spinner"></div>
-            <p>Refreshing dashboard data...</p>
-        </div>
-        
-        <!-- Metrics Row -->
-        <div class="row" id="metrics-row">
-            <div class="col-md-3">
-                <div class="metric-card">
-                    <div class="metric-value">{cluster_info.node_count}</div>
-                    <div class="metric-label">
-                        <i class="fas fa-server"></i> Kubernetes Nodes
-                    </div>
-                </div>
-            </div>
-            <div class="col-md-3">
-                <div class="metric-card">
-                    <div class="metric-value">{len(kubernetes_pods)}</div>
-                    <div class="metric-label">
-                        <i class="fas fa-cubes"></i> Kubernetes Pods
-                    </div>
-                </div>
-            </div>
-            <div class="col-md-3">
-                <div class="metric-card">
-                    <div class="metric-value">{total_containers}</div>
-                    <div class="metric-label">
-                        <i class="fas fa-box"></i> Total Containers
-                    </div>
-                </div>
-            </div>
-            <div class="col-md-3">
-                <div class="metric-card">
-                    <div class="metric-value">
-                        <span class="status-badge status-{cluster_info.power_state.lower()}">
-                            {cluster_info.power_state}
-                        </span>
-                    </div>
-                    <div class="metric-label">
-                        <i class="fas fa-power-off"></i> Cluster Status
-                    </div>
-                </div>
-            </div>
-        </div>
-        
-        <!-- Cluster Information -->
-        <div class="row">
-            <div class="col-12">
-                <div class="container-section">
-                    <h4><i class="fas fa-info-circle"></i> Cluster Information</h4>
-                    <div class="row">
-                        <div class="col-md-6">
-                            <table class="table table-borderless">
-                                <tr>
-                                    <td><strong>Cluster Name:</strong></td>
-                                    <td>{cluster_info.name}</td>
-                                </tr>
-                                <tr>
-                                    <td><strong>Resource Group:</strong></td>
-                                    <td>{cluster_info.resource_group}</td>
-                                </tr>
-                                <tr>
-                                    <td><strong>Location:</strong></td>
-                                    <td>{cluster_info.location}</td>
-                                </tr>
-                                <tr>
-                                    <td><strong>Kubernetes Version:</strong></td>
-                                    <td>{cluster_info.kubernetes_version}</td>
-                                </tr>
-                            </table>
-                        </div>
-                        <div class="col-md-6">
-                            <table class="table table-borderless">
-                                <tr>
-                                    <td><strong>VM Size:</strong></td>
-                                    <td>{cluster_info.vm_size}</td>
-                                </tr>
-                                <tr>
-                                    <td><strong>Power State:</strong></td>
-                                    <td>
-                                        <span class="status-badge status-{cluster_info.power_state.lower()}">
-                                            {cluster_info.power_state}
-                                        </span>
-                                    </td>
-                                </tr>
-                                <tr>
-                                    <td><strong>FQDN:</strong></td>
-                                    <td>{cluster_info.fqdn}</td>
-                                </tr>
-                                <tr>
-                                    <td><strong>Last Updated:</strong></td>
-                                    <td id="lastUpdated">{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</td>
-                                </tr>
-                            </table>
-                        </div>
-                    </div>
-                </div>
-            </div>
-        </div>
-        
-        <!-- Kubernetes Pods and Containers -->
-        <div class="row">
-            <div class="col-12">
-                <div class="container-section">
-                    <h4><i class="fas fa-cube"></i> Kubernetes Pods and Containers</h4>
-                    
-                    {self._generate_kubernetes_pods_section(kubernetes_pods) if kubernetes_pods else '<div class="no-containers"><i class="fas fa-info-circle fa-2x mb-3"></i><p>No Kubernetes pods found or unable to connect to cluster.</p><p>Make sure kubectl is installed and cluster credentials are available.</p></div>'}
-                </div>
-            </div>
-        </div>
-        
-        <!-- Node Visualization -->
-        <div class="row">
-            <div class="col-12">
-                <div class="container-section">
-                    <h4><i class="fas fa-server"></i> Pod Distribution by Node</h4>
-                    <p class="text-muted">Visual representation of pods and containers grouped by Kubernetes nodes</p>
-                    
-                    {self._generate_node_visualization_section(kubernetes_pods) if kubernetes_pods else '<div class="no-containers"><i class="fas fa-info-circle fa-2x mb-3"></i><p>No pods found for node visualization.</p></div>'}
-                </div>
-            </div>
-        </div>
-        
-        <!-- All Resources Table -->
-        <div class="row">
-            <div class="col-12">
-                <div class="container-section">
-                    <h4><i class="fas fa-database"></i> All Azure Resources</h4>
-                    <div class="table-responsive">
-                        <table class="table table-hover">
-                            <thead>
-                                <tr>
-                                    <th>Name</th>
-                                    <th>Type</th>
-                                    <th>Location</th>
-                                    <th>Resource Group</th>
-                                    <th>Tags</th>
-                                </tr>
-                            </thead>
-                            <tbody>
-                                {self._generate_resource_table_rows(all_resources)}
-                            </tbody>
-                        </table>
-                    </div>
-                </div>
-            </div>
-        </div>
-    </div>
-    
-    <!-- Bootstrap JS -->
-    <script src="https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/js/bootstrap.bundle.min.js"></script>
-    
-    <script>
-        // Global state
-        let isRefreshing = false;
-        
-        // Refresh function
-        async function refreshDashboard() {{
-            if (isRefreshing) return;
-            
-            isRefreshing = true;
-            const refreshBtn = document.getElementById('refreshBtn');
-            const loading = document.getElementById('loading');
-            const metricsRow = document.getElementById('metrics-row');
-            
-            // Update UI
-            refreshBtn.disabled = true;
-            refreshBtn.innerHTML = '<i class="fas fa-spinner fa-spin"></i> Refreshing...';
-            loading.style.display = 'block';
-            metricsRow.style.opacity = '0.5';
-            
-            try {{
-                // Call the Python script to refresh data
-                const response = await fetch('http://localhost:5055/refresh-dashboard', {{
-                    method: 'POST',
-                    headers: {{
-                        'Content-Type': 'application/json'
-                    }}
-                }});
-                
-                if (response.ok) {{
-                    // Reload the page with fresh data
-                    window.location.reload();
-                }} else {{
-                    throw new Error('Failed to refresh data');
-                }}
-            }} catch (error) {{
-                console.error('Refresh failed:', error);
-                alert('Failed to refresh dashboard. Please try again.');
-                
-                // Reset UI
-                refreshBtn.disabled = false;
-                refreshBtn.innerHTML = '<i class="fas fa-sync-alt"></i> Refresh Data';
-                loading.style.display = 'none';
-                metricsRow.style.opacity = '1';
-                isRefreshing = false;
-            }}
-        }}
-        
-        // Toggle namespace details
-        function toggleNamespace(namespaceId) {{
-            const summary = document.getElementById(`summary-${{namespaceId}}`);
-            const details = document.getElementById(`details-${{namespaceId}}`);
-            const toggleBtn = document.getElementById(`toggle-${{namespaceId}}`);
-            
-            if (summary.classList.contains('show')) {{
-                // Hide everything
-                summary.classList.remove('show');
-                details.style.display = 'none';
-                toggleBtn.innerHTML = '<i class="fas fa-chevron-down"></i> Show Details';
-            }} else {{
-                // Show everything
-                summary.classList.add('show');
-                details.style.display = 'block';
-                toggleBtn.innerHTML = '<i class="fas fa-chevron-up"></i> Hide Details';
-            }}
-        }}
-        
-        // Auto-refresh every 5 minutes
-        setInterval(() => {{
-            if (!isRefreshing) {{
-                console.log('Auto-refresh triggered');
-                refreshDashboard();
-            }}
-        }}, 300000);
-        
-        // Initialize tooltips
-        document.addEventListener('DOMContentLoaded', function() {{
-            // Add any initialization code here
-        }});
-    </script>
-</body>
-</html>
+    def _iter_html_template(self, cluster_info: ClusterInfo, all_resources: List[ResourceInfo],
+                            kubernetes_pods: List[PodInfo],
+                            inline_assets: bool = False, pod_index: Optional[PodIndex] = None,
+                            fragments: Optional[FragmentCache] = None,
+                            fragment_url: Optional[str] = None, generation: Optional[int] = None,
+                            cluster_key: Optional[str] = None) -> Iterator[str]:
+        """Render the HTML dashboard page as a stream of chunks
+        
+        With `fragment_url`, namespace and node cards carry summaries only and the
+        page loads their pods from `fragment_url` + "namespace/<name>" or
+        "node/<name>" when expanded.
+        With the snapshot `generation`, the page subscribes to live updates of
+        the configured cluster `cluster_key`.
         """
-        
-        return html_template
-    
-    def _generate_kubernetes_pods_section(self, pods: List[PodInfo]) -> str:
-        """Generate HTML section for Kubernetes pods and containers"""
-        if not pods:
-            return '<div class="no-containers"><p>No pods found</p></div>'
-        
-        sections = ""
-        
-        # Group pods by namespace
-        pods_by_namespace = {}
-        for pod in pods:
-            if pod.namespace not in pods_by_namespace:
-                pods_by_namespace[pod.namespace] = []
-            pods_by_namespace[pod.namespace].append(pod)
-        
-        for namespace, namespace_pods in pods_by_namespace.items():
-            # Calculate namespace health
-            total_pods = len(namespace_pods)
-            healthy_pods = sum(1 for pod in namespace_pods if pod.status == 'Running')
-            total_containers = sum(len(pod.containers) for pod in namespace_pods)
-            healthy_containers = sum(
-                sum(1 for container in pod.containers if container.ready)
-                for pod in namespace_pods
-            )
-            
-            # Determine if namespace is healthy (all containers ready)
-            is_healthy = healthy_containers == total_containers and total_containers > 0
-            status_class = "status-all-healthy" if is_healthy else "status-has-issues"
-            status_icon = "fas fa-check-circle" if is_healthy else "fas fa-exclamation-triangle"
-            
-            namespace_id = namespace.replace('-', '_').replace('.', '_')
-            
-            sections += f"""
-                <div class="container-type-header" onclick="toggleNamespace('{namespace_id}')">
-                    <span>
-                        <span class="status-indicator {status_class}"></span>
-                        <i class="{status_icon}"></i> Namespace: {namespace} ({total_pods} pods)
-                    </span>
-                    <div>
-                        <span class="container-count">{total_containers} containers</span>
-                        <button class="toggle-btn" id="toggle-{namespace_id}">
-                            <i class="fas fa-chevron-down"></i> Show Details
-                        </button>
-                    </div>
-                </div>
-                
-                <!-- Namespace Summary -->
-                <div class="namespace-summary" id="summary-{namespace_id}">
-                    <div class="summary-stats">
-                        <div class="summary-stat">
-                            <div class="stat-value">{total_pods}</div>
-                            <div class="stat-label">Total Pods</div>
-                        </div>
-                        <div class="summary-stat">
-                            <div class="stat-value">{healthy_pods}</div>
-                            <div class="stat-label">Healthy Pods</div>
-                        </div>
-                        <div class="summary-stat">
-                            <div class="stat-value">{total_containers}</div>
-                            <div class="stat-label">Total Containers</div>
-                        </div>
-                        <div class="summary-stat">
-                            <div class="stat-value">{healthy_containers}</div>
-                            <div class="stat-label">Healthy Containers</div>
-                        </div>
-                        <div class="summary-stat">
-                            <div class="stat-value">{total_pods - healthy_pods}</div>
-                            <div class="stat-label">Unhealthy Pods</div>
-                        </div>
-                    </div>
-                </div>
-                
-                <!-- Pod Details -->
-                <div id="details-{namespace_id}">
-            """
-            
-            for pod in namespace_pods:
-                # Determine pod status color
-                status_color = 'green' if pod.status == 'Running' else 'red' if pod.status == 'Failed' else 'yellow'
-                
-                sections += f"""
-                    <div class="container-item">
-                        <div class="container-name">
-                            <span class="container-status status-{status_color}"></span>
-                            <i class="fas fa-cube"></i> {pod.name} ({pod.status})
-                        </div>
-                        <div class="container-details">
-                            <div class="detail-item">
-                                <div class="detail-label">Namespace</div>
-                                <div class="detail-value">{pod.namespace}</div>
-                            </div>
-                            <div class="detail-item">
-                                <div class="detail-label">Status</div>
-                                <div class="detail-value">
-                                    <span class="status-badge status-{pod.status.lower()}">{pod.status}</span>
-                                </div>
-                            </div>
-                            <div class="detail-item">
-                                <div class="detail-label">Ready</div>
-                                <div class="detail-value">{pod.ready}</div>
-                            </div>
-                            <div class="detail-item">
-                                <div class="detail-label">Node</div>
-                                <div class="detail-value">{pod.node_name}</div>
-                            </div>
-                            <div class="detail-item">
-                                <div class="detail-label">Age</div>
-                                <div class="detail-value">{pod.age}</div>
-                            </div>
-                        </div>
-                """
-                
-                # Add containers for this pod
-                if pod.containers:
-                    sections += '<div style="margin-top: 10px; padding-left: 20px;">'
-                    sections += '<strong style="font-size: 0.8rem; color: #6c757d;">Containers:</strong>'
-                    
-                    for container in pod.containers:
-                        container_status_color = 'green' if container.ready else 'red'
-                        sections += f"""
-                            <div class="pod-container">
-                                <div style="font-weight: bold; font-size: 0.8rem; margin-bottom: 5px;">
-                                    <span class="container-status status-{container_status_color}"></span>
-                                    {container.name}
-                                </div>
-                                <div style="font-size: 0.75rem; color: #6c757d;">
-                                    <strong>Image:</strong> {container.image}<br>
-                                    <strong>Status:</strong> {container.status}<br>
-                                    <strong>Restarts:</strong> {container.restart_count}
-                                </div>
-                            </div>
-                        """
-                    
-                    sections += '</div>'
-                
-                sections += '</div>'
-            
-            sections += '</div>'  # Close details div
-        
-        return sections
+        # Every section reads the same index; callers that already built one pass it in
+        pod_index = pod_index or PodIndex(kubernetes_pods)
+        # Without a cache shared across refreshes every card is rendered
+        fragments = fragments if fragments is not None else FragmentCache()
+        namespaces = list(pod_index.namespaces.values())
+        nodes = list(pod_index.nodes.values())
+        fragments.retain("namespace", [namespace.name for namespace in namespaces])
+        fragments.retain("node", [node.name for node in nodes])
+        templates = get_templates()
+        
+        now = time.time()
+        
+        def namespace_card(namespace: PodGroup):
+            # Inline pod details show ages, which change even when the pods don't
+            ages = None if fragment_url else format_ages([pod.created_at for pod in namespace.pods], now)
+            return fragments.get("namespace", namespace.name, [namespace.pods, ages],
+                                 lambda: templates.render("_namespace_card.html", namespace=namespace,
+                                                          fragment_url=fragment_url, ages=ages))
+        
+        def node_card(node: PodGroup):
+            return fragments.get("node", node.name, node.pods,
+                                 lambda: templates.render("_node_card.html", node=node, fragment_url=fragment_url))
+        
+        return templates.generate(
+            "dashboard.html",
+            cluster_info=cluster_info,
+            total_pods=pod_index.totals.total_pods,
+            total_containers=pod_index.totals.total_containers,
+            namespaces=namespaces,
+            nodes=nodes,
+            namespace_card=namespace_card,
+            node_card=node_card,
+            generation=generation,
+            cluster_key=cluster_key,
+            resources=all_resources,
+            last_updated=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            inline_assets=inline_assets
+        )
     
-    def _generate_node_visualization_section(self, pods: List[PodInfo]) -> str:
-        """Generate HTML section for node-based pod visualization"""
-        if not pods:
-            return '<div class="no-containers"><p>No pods found for node visualization</p></div>'
-        
-        # Group pods by node
-        pods_by_node = {}
-        for pod in pods:
-            node_name = pod.node_name if pod.node_name != 'Unknown' else 'Unknown Node'
-            if node_name not in pods_by_node:
-                pods_by_node[node_name] = []
-            pods_by_node[node_name].append(pod)
-        
-        # Group pods by namespace within each node
-        node_sections = ""
-        for node_name, node_pods in pods_by_node.items():
-            # Group pods by namespace within this node
-            namespaces_in_node = {}
-            for pod in node_pods:
-                if pod.namespace not in namespaces_in_node:
-                    namespaces_in_node[pod.namespace] = []
-                namespaces_in_node[pod.namespace].append(pod)
-            
-            # Calculate node statistics
-            total_pods_in_node = len(node_pods)
-            healthy_pods_in_node = sum(1 for pod in node_pods if pod.status == 'Running')
-            total_containers_in_node = sum(len(pod.containers) for pod in node_pods)
-            healthy_containers_in_node = sum(
-                sum(1 for container in pod.containers if container.ready)
-                for pod in node_pods
-            )
-            
-            # Determine node health
-            is_node_healthy = healthy_containers_in_node == total_containers_in_node and total_containers_in_node > 0
-            node_status_class = "node-healthy" if is_node_healthy else "node-unhealthy"
-            
-            node_sections += f"""
-                <div class="node-box {node_status_class}">
-                    <div class="node-header">
-                        <h5><i class="fas fa-server"></i> {node_name}</h5>
-                        <div class="node-stats">
-                            <span class="stat-badge">{total_pods_in_node} pods</span>
-                            <span class="stat-badge">{total_containers_in_node} containers</span>
-                            <span class="health-indicator {node_status_class}"></span>
-                        </div>
-                    </div>
-                    <div class="node-content">
-            """
-            
-            for namespace, namespace_pods in namespaces_in_node.items():
-                # Calculate namespace health within this node
-                healthy_pods_in_namespace = sum(1 for pod in namespace_pods if pod.status == 'Running')
-                total_containers_in_namespace = sum(len(pod.containers) for pod in namespace_pods)
-                healthy_containers_in_namespace = sum(
-                    sum(1 for container in pod.containers if container.ready)
-                    for pod in namespace_pods
-                )
-                
-                is_namespace_healthy = healthy_containers_in_namespace == total_containers_in_namespace and total_containers_in_namespace > 0
-                namespace_status_class = "namespace-healthy" if is_namespace_healthy else "namespace-unhealthy"
-                
-                node_sections += f"""
-                        <div class="namespace-group {namespace_status_class}">
-                            <div class="namespace-label">
-                                <span class="namespace-status {namespace_status_class}"></span>
-                                <strong>{namespace}</strong> ({len(namespace_pods)} pods)
-                            </div>
-                            <div class="container-list">
-                """
-                
-                for pod in namespace_pods:
-                    pod_status_color = 'green' if pod.status == 'Running' else 'red' if pod.status == 'Failed' else 'yellow'
-                    node_sections += f"""
-                                <div class="pod-item">
-                                    <span class="pod-status status-{pod_status_color}"></span>
-                                    <span class="pod-name">{pod.name}</span>
-                                    <span class="pod-containers">({len(pod.containers)} containers)</span>
-                                </div>
-                    """
-                
-                node_sections += """
-                            </div>
-                        </div>
-                """
-            
-            node_sections += """
-                    </div>
-                </div>
-            """
-        
-        return f"""
-        <div class="node-visualization">
-            <div class="node-grid">
-                {node_sections}
-            </div>
-        </div>
-        """
+    def _iter_fleet_html_template(self, clusters: List["ClusterSnapshot"], inline_assets: bool = False,
+                                  generation: Optional[int] = None) -> Iterator[str]:
+        """Render the aggregated overview page as a stream of chunks"""
+        return get_templates().generate(
+            "fleet.html",
+            clusters=clusters,
+            total_pods=sum(len(cluster.kubernetes_pods) for cluster in clusters),
+            total_containers=sum(
+                cluster.pod_index.totals.total_containers for cluster in clusters if cluster.pod_index
+            ),
+            healthy_clusters=sum(1 for cluster in clusters if cluster.cluster_info and not cluster.error),
+            inline_assets=inline_assets,
+            generation=generation
+        )
     
     def _generate_container_sections(self, containers_by_type: Dict[str, List[ResourceInfo]]) -> str:
         """Generate HTML sections for container resources grouped by type"""
@@ -1512,22 +677,6 @@ class AKSDashboardGenerator:
         
         return sections
     
-    def _generate_resource_table_rows(self, resources: List[ResourceInfo]) -> str:
-        """Generate HTML table rows for resources"""
-        rows = ""
-        for resource in resources:
-            tags_str = ", ".join([f"{k}: {v}" for k, v in resource.tags.items()]) if resource.tags else "No tags"
-            rows += f"""
-                <tr>
-                    <td><strong>{resource.name}</strong></td>
-                    <td><span class="badge bg-primary">{resource.type.split('/')[-1]}</span></td>
-                    <td>{resource.location}</td>
-                    <td>{resource.resource_group}</td>
-                    <td><small>{tags_str}</small></td>
-                </tr>
-            """
-        return rows
-
 def main():
     """Main function"""
     print("🌐 AKS HTML Dashboard Generator")
@@ -1539,54 +688,64 @@ def main():
             config = json.load(f)
         
         azure_config = config['azure']
-        
-        # Initialize dashboard generator
-        generator = AKSDashboardGenerator(
-            subscription_id=azure_config['subscription_id'],
-            tenant_id=azure_config['tenant_id'],
-            client_id=azure_config['client_id'],
-            client_secret=azure_config['client_secret']
-        )
-        
-        # Get cluster info
-        print("🔍 Getting AKS cluster information...")
-        cluster_info = generator.get_aks_cluster_info("rg-modular-demo", "transact")
-        
-        if not cluster_info:
-            print("❌ Failed to get cluster information")
-            return False
-        
-        print(f"✅ Cluster: {cluster_info.name} ({cluster_info.node_count} nodes)")
-        
-        # Get resources
-        print("🔍 Getting resource group resources...")
-        resources = generator.get_resource_group_resources("rg-modular-demo")
-        print(f"✅ Found {len(resources)} resources")
-        
-        # Get Kubernetes pods
-        print("🔍 Getting Kubernetes pods and containers...")
-        kubernetes_pods = generator.get_kubernetes_containers("rg-modular-demo", "transact")
-        print(f"✅ Found {len(kubernetes_pods)} pods")
-        
-        # Generate HTML dashboard
-        print("🌐 Generating HTML dashboard...")
-        output_path = generator.generate_html_dashboard(cluster_info, resources, kubernetes_pods, "aks-dashboard.html")
-        
-        if output_path:
-            print(f"✅ HTML dashboard saved to: {output_path}")
+        targets = load_cluster_targets(config)
+        generators = {}
+        generated = 0
+        
+        for target in targets:
+            # One generator per subscription
+            if target.subscription_id not in generators:
+                generators[target.subscription_id] = AKSDashboardGenerator(
+                    subscription_id=target.subscription_id,
+                    tenant_id=azure_config['tenant_id'],
+                    client_id=azure_config['client_id'],
+                    client_secret=azure_config['client_secret']
+                )
+            generator = generators[target.subscription_id]
+            
+            # Get cluster info
+            print(f"🔍 Getting AKS cluster information for {target.key}...")
+            cluster_info = generator.get_aks_cluster_info(target.resource_group, target.name)
             
-            # Print summary
-            print(f"\n📊 Dashboard Summary:")
-            print(f"   • Cluster: {cluster_info.name}")
-            print(f"   • Resources: {len(resources)}")
-            print(f"   • Location: {cluster_info.location}")
-            print(f"   • Status: {cluster_info.power_state}")
-            print(f"\n🌐 Open {output_path} in your web browser to view the dashboard!")
+            if not cluster_info:
+                print(f"❌ Failed to get cluster information for {target.key}")
+                continue
             
-            return True
-        else:
-            print("❌ Failed to generate dashboard")
-            return False
+            print(f"✅ Cluster: {cluster_info.name} ({cluster_info.node_count} nodes)")
+            
+            # Get resources
+            print("🔍 Getting resource group resources...")
+            resources = generator.get_resource_group_resources(target.resource_group)
+            print(f"✅ Found {len(resources)} resources")
+            
+            # Get Kubernetes pods
+            print("🔍 Getting Kubernetes pods and containers...")
+            kubernetes_pods = generator.get_kubernetes_containers(target.resource_group, target.name)
+            print(f"✅ Found {len(kubernetes_pods)} pods")
+            
+            # Generate HTML dashboard
+            print("🌐 Generating HTML dashboard...")
+            if len(targets) == 1:
+                output_name = "aks-dashboard.html"
+            else:
+                output_name = f"aks-dashboard-{target.resource_group}-{target.name}.html"
+            output_path = generator.generate_html_dashboard(cluster_info, resources, kubernetes_pods, output_name)
+            
+            if output_path:
+                generated += 1
+                print(f"✅ HTML dashboard saved to: {output_path}")
+                
+                # Print summary
+                print(f"\n📊 Dashboard Summary:")
+                print(f"   • Cluster: {cluster_info.name}")
+                print(f"   • Resources: {len(resources)}")
+                print(f"   • Location: {cluster_info.location}")
+                print(f"   • Status: {cluster_info.power_state}")
+                print(f"\n🌐 Open {output_path} in your web browser to view the dashboard!")
+            else:
+                print(f"❌ Failed to generate dashboard for {target.key}")
+        
+        return generated == len(targets)
         
     except Exception as e:
         print(f"❌ Error: {e}")
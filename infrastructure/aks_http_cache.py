@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+AKS Dashboard HTTP Caching
+==========================
+
+Pre-encoded dashboard pages with a content-hash ETag. Each snapshot page is
+streamed from the template renderer through the hash and the compressors
+once, when the snapshot is built, so the uncompressed page is never held in
+memory. Requests pick the matching encoding, stream a decompressed copy, or
+answer 304 Not Modified.
+"""
+
+import hashlib
+import zlib
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Iterator, Optional
+
+from flask import Request, Response
+
+from aks_templates import STREAM_CHUNK_SIZE
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+# Pages must be revalidated, which is cheap thanks to the ETag
+PAGE_CACHE_CONTROL = "no-cache"
+
+# Compression levels of snapshot pages, built once in the background
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 11
+
+# Levels of pages built while a request waits, such as lazily loaded fragments
+FAST_GZIP_LEVEL = 6
+FAST_BROTLI_QUALITY = 4
+
+@dataclass(frozen=True)
+class CachedPage:
+    """One rendered page with its validators and compressed variants"""
+    etag: str
+    last_modified: float
+    # Length of the uncompressed UTF-8 body
+    size: int
+    # Always holds "gzip"; the identity body is streamed from it
+    encodings: Dict[str, bytes] = field(default_factory=dict)
+
+    @classmethod
+    def build(cls, html: str, modified_at: float, fast: bool = False) -> "CachedPage":
+        """Hash and compress a page"""
+        return cls.from_chunks([html], modified_at, fast)
+
+    @classmethod
+    def from_chunks(cls, chunks: Iterable[str], modified_at: float, fast: bool = False) -> "CachedPage":
+        """Hash and compress a streamed page chunk by chunk
+
+        `fast` trades compression ratio for speed, for pages built inside a request.
+        """
+        digest = hashlib.sha256()
+        gzip_compressor = zlib.compressobj(FAST_GZIP_LEVEL if fast else GZIP_LEVEL, zlib.DEFLATED, 31)
+        brotli_quality = FAST_BROTLI_QUALITY if fast else BROTLI_QUALITY
+        brotli_compressor = brotli.Compressor(quality=brotli_quality) if brotli else None
+        gzip_parts, brotli_parts, size = [], [], 0
+        for chunk in chunks:
+            data = chunk.encode("utf-8")
+            size += len(data)
+            digest.update(data)
+            gzip_parts.append(gzip_compressor.compress(data))
+            if brotli_compressor:
+                brotli_parts.append(brotli_compressor.process(data))
+
+        gzip_parts.append(gzip_compressor.flush())
+        encodings = {"gzip": b"".join(gzip_parts)}
+        if brotli_compressor:
+            brotli_parts.append(brotli_compressor.finish())
+            encodings["br"] = b"".join(brotli_parts)
+        return cls(etag=digest.hexdigest()[:32], last_modified=modified_at, size=size, encodings=encodings)
+
+    def iter_body(self) -> Iterator[bytes]:
+        """Yield the uncompressed body in chunks of at most STREAM_CHUNK_SIZE bytes"""
+        decompressor = zlib.decompressobj(31)
+        pending = self.encodings["gzip"]
+        while not decompressor.eof:
+            chunk = decompressor.decompress(pending, STREAM_CHUNK_SIZE)
+            pending = decompressor.unconsumed_tail
+            if chunk:
+                yield chunk
+            elif not pending:
+                break
+
+    def respond(self, request: Request, headers: Optional[Dict[str, str]] = None) -> Response:
+        """Build a 200 or 304 response for a request, using the best accepted encoding"""
+        encoding = self.negotiate(request)
+        if self.not_modified(request):
+            response = Response(status=304)
+        elif encoding:
+            response = Response(self.encodings[encoding], mimetype="text/html")
+            response.headers["Content-Encoding"] = encoding
+        else:
+            # Stream instead of materializing the uncompressed page per request
+            response = Response(self.iter_body(), mimetype="text/html")
+            response.content_length = self.size
+        response.set_etag(self.etag)
+        response.last_modified = datetime.fromtimestamp(int(self.last_modified), timezone.utc)
+        response.headers["Cache-Control"] = PAGE_CACHE_CONTROL
+        response.headers["Vary"] = "Accept-Encoding"
+        response.headers.update(headers or {})
+        return response
+
+    def not_modified(self, request: Request) -> bool:
+        """Evaluate If-None-Match, falling back to If-Modified-Since"""
+        if request.if_none_match:
+            return request.if_none_match.contains_weak(self.etag)
+        if request.if_modified_since:
+            return request.if_modified_since.timestamp() >= int(self.last_modified)
+        return False
+
+    def negotiate(self, request: Request) -> Optional[str]:
+        """Pick the precomputed encoding the client rates highest"""
+        best, best_quality = None, 0.0
+        for encoding in ("br", "gzip"):
+            quality = request.accept_encodings[encoding]
+            if encoding in self.encodings and quality > best_quality:
+                best, best_quality = encoding, quality
+        return best
@@ -0,0 +1,376 @@
+#!/usr/bin/env python3
+"""
+AKS Kubernetes API Client
+=========================
+
+Minimal Kubernetes API client built from a kubeconfig, with a pool of
+persistent HTTPS connections, plus pluggable pod sources (native API with
+kubectl as a fallback).
+"""
+
+import base64
+import gzip
+import http.client
+import json
+import logging
+import os
+import queue
+import socket
+import ssl
+import subprocess
+import tempfile
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+from urllib.parse import urlencode, urlparse
+
+import yaml
+
+from aks_kubeconfig import is_auth_failure
+
+logger = logging.getLogger(__name__)
+
+# Objects requested per LIST page; bounds memory held for one response
+DEFAULT_PAGE_SIZE = 500
+
+class KubeApiError(Exception):
+    """Error response from the Kubernetes API server"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(f"HTTP {status}: {message}")
+        self.status = status
+
+class KubeAuthError(KubeApiError):
+    """Credentials were rejected by the API server"""
+
+class KubeApiClient:
+    """Kubernetes API client with a pool of persistent connections"""
+
+    def __init__(self, server: str, ssl_context: Optional[ssl.SSLContext] = None,
+                 token: Optional[str] = None, pool_size: int = 4, timeout: float = 30.0,
+                 compression: bool = True):
+        parsed = urlparse(server)
+        self.scheme = parsed.scheme
+        self.host = parsed.hostname
+        self.port = parsed.port or (443 if parsed.scheme == "https" else 80)
+        self.base_path = parsed.path.rstrip("/")
+        self.ssl_context = ssl_context
+        self.token = token
+        self.timeout = timeout
+        # Ask for gzip-compressed responses; LIST bodies of pods shrink about tenfold
+        self.compression = compression
+        self.stats = {"requests": 0, "bytes": 0}
+        self._pool: "queue.LifoQueue[http.client.HTTPConnection]" = queue.LifoQueue(maxsize=pool_size)
+        self._watches = set()
+
+    @classmethod
+    def from_kubeconfig(cls, content: str, **kwargs) -> "KubeApiClient":
+        """Build a client for the current context of a kubeconfig document"""
+        config = yaml.safe_load(content)
+        context_name = config.get("current-context")
+        contexts = {c["name"]: c["context"] for c in config.get("contexts", [])}
+        context = contexts.get(context_name) or next(iter(contexts.values()))
+        cluster = {c["name"]: c["cluster"] for c in config["clusters"]}[context["cluster"]]
+        user = {u["name"]: u["user"] for u in config.get("users", [])}.get(context.get("user"), {})
+
+        ssl_context = None
+        if cluster["server"].startswith("https"):
+            ca_data = cluster.get("certificate-authority-data")
+            ssl_context = ssl.create_default_context(
+                cadata=base64.b64decode(ca_data).decode("ascii") if ca_data else None
+            )
+            if cluster.get("insecure-skip-tls-verify"):
+                ssl_context.check_hostname = False
+                ssl_context.verify_mode = ssl.CERT_NONE
+            if user.get("client-certificate-data") and user.get("client-key-data"):
+                _load_client_certificate(
+                    ssl_context,
+                    base64.b64decode(user["client-certificate-data"]),
+                    base64.b64decode(user["client-key-data"])
+                )
+
+        return cls(cluster["server"], ssl_context=ssl_context, token=user.get("token"), **kwargs)
+
+    def get_json(self, path: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """GET an API path and decode the JSON response"""
+        status, body = self.request("GET", path, params)
+        if status == 401:
+            raise KubeAuthError(status, body.decode("utf-8", "replace"))
+        if status >= 400:
+            raise KubeApiError(status, body.decode("utf-8", "replace"))
+        return json.loads(body)
+
+    def list_paged(self, path: str, limit: int = DEFAULT_PAGE_SIZE,
+                   params: Optional[Dict[str, Any]] = None) -> Iterator[Dict[str, Any]]:
+        """Yield the pages of a LIST, following continue tokens"""
+        page_params = dict(params or {}, limit=limit)
+        while True:
+            page = self.get_json(path, page_params)
+            yield page
+            continue_token = page.get("metadata", {}).get("continue")
+            if not continue_token:
+                return
+            page_params["continue"] = continue_token
+
+    def request(self, method: str, path: str, params: Optional[Dict[str, Any]] = None,
+                headers: Optional[Dict[str, str]] = None):
+        """Send a request over a pooled connection and return (status, body)"""
+        url = self.base_path + path
+        if params:
+            url += "?" + urlencode(params)
+        request_headers = {"Accept": "application/json"}
+        if self.compression:
+            request_headers["Accept-Encoding"] = "gzip"
+        if self.token:
+            request_headers["Authorization"] = f"Bearer {self.token}"
+        if headers:
+            request_headers.update(headers)
+
+        for attempt in range(2):
+            connection = self._acquire()
+            try:
+                connection.request(method, url, headers=request_headers)
+                response = connection.getresponse()
+                body = response.read()
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                # The server closed an idle keep-alive connection; retry on a fresh one
+                connection.close()
+                if attempt:
+                    raise
+                continue
+            except Exception:
+                connection.close()
+                raise
+            self._release(connection, response)
+            self.stats["requests"] += 1
+            self.stats["bytes"] += len(body)
+            if response.getheader("Content-Encoding") == "gzip":
+                body = gzip.decompress(body)
+            return response.status, body
+
+    def watch(self, path: str, params: Optional[Dict[str, Any]] = None,
+              timeout: float = 330.0) -> Iterator[Dict[str, Any]]:
+        """Stream watch events for an API path on a dedicated connection"""
+        url = self.base_path + path + "?" + urlencode(dict(params or {}, watch="true"))
+        headers = {"Accept": "application/json"}
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+
+        # Watches hold their connection open for minutes, so they don't use the pool
+        connection = self._connect(timeout)
+        self._watches.add(connection)
+        try:
+            connection.request("GET", url, headers=headers)
+            response = connection.getresponse()
+            if response.status >= 400:
+                message = response.read().decode("utf-8", "replace")
+                if response.status == 401:
+                    raise KubeAuthError(response.status, message)
+                raise KubeApiError(response.status, message)
+
+            for line in response:
+                if line.strip():
+                    yield json.loads(line)
+        finally:
+            self._watches.discard(connection)
+            connection.close()
+
+    def close(self):
+        """Close all pooled connections and interrupt open watches"""
+        for connection in list(self._watches):
+            if connection.sock:
+                try:
+                    connection.sock.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    # The watch already ended and closed its socket
+                    pass
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                return
+
+    def _acquire(self) -> http.client.HTTPConnection:
+        """Take an idle connection from the pool or open a new one"""
+        try:
+            return self._pool.get_nowait()
+        except queue.Empty:
+            return self._connect(self.timeout)
+
+    def _connect(self, timeout: float) -> http.client.HTTPConnection:
+        """Open a new connection to the API server"""
+        if self.scheme == "https":
+            return http.client.HTTPSConnection(self.host, self.port, timeout=timeout,
+                                               context=self.ssl_context)
+        return http.client.HTTPConnection(self.host, self.port, timeout=timeout)
+
+    def _release(self, connection: http.client.HTTPConnection, response: http.client.HTTPResponse):
+        """Return a connection to the pool unless the server asked to close it"""
+        if response.will_close:
+            connection.close()
+            return
+        try:
+            self._pool.put_nowait(connection)
+        except queue.Full:
+            connection.close()
+
+def _load_client_certificate(ssl_context: ssl.SSLContext, cert: bytes, key: bytes):
+    """Load an in-memory client certificate into an SSL context"""
+    # ssl only loads certificates from files; keep them on disk just long enough to load
+    paths = []
+    try:
+        for data in (cert, key):
+            fd, path = tempfile.mkstemp(prefix="aks-client-", suffix=".pem")
+            paths.append(path)
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+        ssl_context.load_cert_chain(paths[0], paths[1])
+    finally:
+        for path in paths:
+            os.unlink(path)
+
+class PodSource:
+    """Lists all pods in a cluster as a stream of Kubernetes pod objects"""
+    name = "base"
+
+    def iter_pods(self) -> Iterator[Dict[str, Any]]:
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+def project_pod(pod: Dict[str, Any]) -> Dict[str, Any]:
+    """Keep only the pod fields the dashboard reads"""
+    metadata, status = pod["metadata"], pod["status"]
+    projected = {
+        "phase": status["phase"],
+        "containerStatuses": [
+            {"name": c["name"], "image": c["image"], "ready": c["ready"],
+             "restartCount": c["restartCount"], "state": c.get("state", {})}
+            for c in status.get("containerStatuses", [])
+        ],
+    }
+    if "hostIP" in status:
+        projected["hostIP"] = status["hostIP"]
+    return {
+        "metadata": {"namespace": metadata["namespace"], "name": metadata["name"],
+                     "creationTimestamp": metadata.get("creationTimestamp")},
+        "status": projected,
+    }
+
+class KubeApiPodSource(PodSource):
+    """Lists pods directly from the API server, one page at a time"""
+    name = "api"
+
+    def __init__(self, client: KubeApiClient, page_size: int = DEFAULT_PAGE_SIZE, projection: bool = True):
+        self.client = client
+        self.page_size = page_size
+        # Hand out the same minimal objects as the kubectl projection, without
+        # managedFields, annotations and spec; the API has no server-side field selection
+        self.projection = projection
+
+    def iter_pods(self) -> Iterator[Dict[str, Any]]:
+        for page in self.client.list_paged("/api/v1/pods", self.page_size):
+            items = page.get("items", [])
+            yield from map(project_pod, items) if self.projection else items
+
+    def close(self):
+        self.client.close()
+
+# kubectl jsonpath template that prints only the fields the dashboard reads:
+# one tab-separated line per pod, containers separated by ';', container fields by '|'
+PROJECTED_POD_TEMPLATE = (
+    '{range .items[*]}'
+    '{.metadata.namespace}{"\\t"}{.metadata.name}{"\\t"}{.status.phase}{"\\t"}'
+    '{.status.hostIP}{"\\t"}{.metadata.creationTimestamp}{"\\t"}'
+    '{range .status.containerStatuses[*]}'
+    '{.name}{"|"}{.image}{"|"}{.ready}{"|"}{.restartCount}{"|"}'
+    '{.state.running.startedAt}{"|"}{.state.waiting.reason}{"|"}{.state.terminated.reason}{";"}'
+    '{end}{"\\n"}{end}'
+)
+
+def parse_projected_pods(lines: Iterable[str]) -> Iterator[Dict[str, Any]]:
+    """Expand PROJECTED_POD_TEMPLATE output into minimal pod objects"""
+    for line in lines:
+        if not line.strip():
+            continue
+        namespace, name, phase, host_ip, created, containers = line.rstrip("\n").split("\t")
+        statuses = []
+        for container in filter(None, containers.split(";")):
+            c_name, image, ready, restarts, running, waiting, terminated = container.split("|")
+            if running:
+                state = {"running": {}}
+            elif terminated:
+                state = {"terminated": {"reason": terminated}}
+            else:
+                state = {"waiting": {"reason": waiting} if waiting else {}}
+            statuses.append({
+                "name": c_name,
+                "image": image,
+                "ready": ready == "true",
+                "restartCount": int(restarts or 0),
+                "state": state,
+            })
+        status = {"phase": phase, "containerStatuses": statuses}
+        if host_ip:
+            status["hostIP"] = host_ip
+        yield {
+            "metadata": {"namespace": namespace, "name": name, "creationTimestamp": created},
+            "status": status,
+        }
+
+class KubectlPodSource(PodSource):
+    """Lists pods by running kubectl against a kubeconfig file"""
+    name = "kubectl"
+
+    def __init__(self, kubeconfig_path: str, timeout: float = 30.0, projection: bool = True):
+        self.kubeconfig_path = kubeconfig_path
+        self.timeout = timeout
+        # Print only the needed fields instead of full pod objects
+        self.projection = projection
+
+    def iter_pods(self) -> Iterator[Dict[str, Any]]:
+        output = f'jsonpath={PROJECTED_POD_TEMPLATE}' if self.projection else 'json'
+        # kubectl pages from the API server itself but prints one combined list
+        result = subprocess.run([
+            'kubectl', '--kubeconfig', self.kubeconfig_path, 'get', 'pods',
+            '--all-namespaces', '-o', output, f'--chunk-size={DEFAULT_PAGE_SIZE}'
+        ], capture_output=True, text=True, timeout=self.timeout)
+
+        if result.returncode != 0:
+            if is_auth_failure(result.stderr):
+                raise KubeAuthError(401, result.stderr)
+            raise KubeApiError(result.returncode, f"kubectl command failed: {result.stderr}")
+        if self.projection:
+            yield from parse_projected_pods(result.stdout.splitlines())
+        else:
+            yield from json.loads(result.stdout).get("items", [])
+
+class FallbackPodSource(PodSource):
+    """Tries each pod source in order until one succeeds"""
+    name = "fallback"
+
+    def __init__(self, sources: List[PodSource]):
+        self.sources = sources
+
+    def iter_pods(self) -> Iterator[Dict[str, Any]]:
+        last_error: Optional[Exception] = None
+        for source in self.sources:
+            started = False
+            try:
+                for pod in source.iter_pods():
+                    started = True
+                    yield pod
+                return
+            except KubeAuthError:
+                # A fallback would fail the same way; let the caller refresh credentials
+                raise
+            except Exception as e:
+                if started:
+                    # Pods were already handed out; mixing sources would duplicate them
+                    raise
+                logger.warning(f"Pod source '{source.name}' failed: {e}")
+                last_error = e
+        raise last_error or KubeApiError(0, "No pod sources configured")
+
+    def close(self):
+        for source in self.sources:
+            source.close()
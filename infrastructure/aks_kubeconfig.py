@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+AKS Kubeconfig Cache
+====================
+
+Keeps cluster admin credentials in one private kubeconfig file per cluster
+so pod listings don't fetch credentials and write a temp file every time.
+"""
+
+import atexit
+import logging
+import os
+import tempfile
+import threading
+import time
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+# How long fetched cluster credentials are reused before asking ARM again
+DEFAULT_CREDENTIAL_TTL = 900.0
+
+# How long a failed credential fetch is remembered before ARM is asked again
+DEFAULT_FAILURE_TTL = 60.0
+
+# kubectl / API server messages that mean the cached credentials are no longer valid
+AUTH_FAILURE_MARKERS = ("401", "unauthorized", "you must be logged in")
+
+def is_auth_failure(message: str) -> bool:
+    """Check whether a kubectl or API error message is an authentication failure"""
+    message = (message or "").lower()
+    return any(marker in message for marker in AUTH_FAILURE_MARKERS)
+
+class KubeconfigCache:
+    """TTL cache for a kubeconfig backed by a private file kept for the process lifetime"""
+
+    def __init__(self, fetch: Callable[[], Optional[str]], ttl: float = DEFAULT_CREDENTIAL_TTL,
+                 failure_ttl: float = DEFAULT_FAILURE_TTL):
+        self.fetch = fetch
+        self.ttl = ttl
+        self.failure_ttl = failure_ttl
+        self.path: Optional[str] = None
+        self._content: Optional[str] = None
+        self._fetched_at = 0.0
+        self._failed_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def get_content(self) -> Optional[str]:
+        """Return the kubeconfig content, fetching it if missing or expired"""
+        with self._lock:
+            now = time.monotonic()
+            if self._content is None and self._failed_at is not None and now - self._failed_at < self.failure_ttl:
+                # The last fetch failed recently; don't ask ARM again yet
+                return None
+            if self._content is None or now - self._fetched_at > self.ttl:
+                self._refresh()
+            return self._content
+
+    def get_path(self) -> Optional[str]:
+        """Return the path of the private kubeconfig file, or None if unavailable"""
+        if self.get_content() is None:
+            return None
+        return self.path
+
+    def invalidate(self):
+        """Drop the cached credentials so the next access fetches them again"""
+        with self._lock:
+            logger.info("Invalidating cached kubeconfig")
+            self._content = None
+            self._fetched_at = 0.0
+
+    def close(self):
+        """Remove the private kubeconfig file"""
+        with self._lock:
+            if self.path and os.path.exists(self.path):
+                os.unlink(self.path)
+            self.path = None
+            self._content = None
+
+    def _refresh(self):
+        """Fetch credentials and atomically rewrite the private kubeconfig file"""
+        try:
+            content = self.fetch()
+        except Exception:
+            self._content = None
+            self._failed_at = time.monotonic()
+            raise
+        if content is None:
+            self._content = None
+            self._failed_at = time.monotonic()
+            return
+
+        if self.path is None:
+            # mkstemp creates the file readable by the current user only
+            fd, self.path = tempfile.mkstemp(prefix="aks-kubeconfig-", suffix=".yaml")
+            os.close(fd)
+            atexit.register(self.close)
+
+        directory = os.path.dirname(self.path)
+        fd, staging_path = tempfile.mkstemp(prefix=".aks-kubeconfig-", suffix=".yaml", dir=directory)
+        with os.fdopen(fd, "w") as f:
+            f.write(content)
+        os.replace(staging_path, self.path)
+
+        self._content = content
+        self._fetched_at = time.monotonic()
+        self._failed_at = None
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+AKS Pod Index
+=============
+
+Pods grouped by namespace, by node and by namespace within each node, with
+health rollups at every level. The index is built once per snapshot: one pass
+over the pods fills the groups and the counts come from the vectorized rollups
+of aks_rollups. Every dashboard section reads its groups and counts from it.
+"""
+
+from dataclasses import asdict, dataclass, field
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List
+
+from aks_aggregates import PodCounts
+from aks_rollups import PodRollups
+
+if TYPE_CHECKING:
+    from aks_html_dashboard import PodInfo
+
+# Display name of the node group for pods that are not scheduled yet
+UNKNOWN_NODE = "Unknown Node"
+
+@dataclass
+class PodGroup:
+    """Pods sharing a namespace or node, with the health counts shown for the group"""
+    name: str
+    pods: List["PodInfo"] = field(default_factory=list)
+    counts: PodCounts = field(default_factory=PodCounts)
+    # Namespace groups within a node group, in order of first appearance
+    subgroups: Dict[str, "PodGroup"] = field(default_factory=dict)
+
+    @property
+    def groups(self) -> List["PodGroup"]:
+        return list(self.subgroups.values())
+
+    @property
+    def total_pods(self) -> int:
+        return self.counts.pods
+
+    @property
+    def healthy_pods(self) -> int:
+        return self.counts.running_pods
+
+    @property
+    def total_containers(self) -> int:
+        return self.counts.containers
+
+    @property
+    def healthy_containers(self) -> int:
+        return self.counts.ready_containers
+
+    @property
+    def healthy(self) -> bool:
+        """All containers ready (and at least one container)"""
+        return self.healthy_containers == self.total_containers and self.total_containers > 0
+
+class PodIndex:
+    """Namespace, node and node/namespace groups of one cluster's pods"""
+
+    def __init__(self, pods: Iterable["PodInfo"] = ()):
+        self.totals = PodGroup("cluster")
+        self.namespaces: Dict[str, PodGroup] = {}
+        # Keyed by the pod's node_name; the group name is what the page shows
+        self.nodes: Dict[str, PodGroup] = {}
+        for pod in pods:
+            self._place(pod)
+        # Counts of every group come from one set of vectorized rollups
+        self.rollups = PodRollups(self.totals.pods)
+        self.totals.counts = self.rollups.totals()
+        for name, counts in self.rollups.by_namespace().items():
+            self.namespaces[name].counts = counts
+        for name, counts in self.rollups.by_node().items():
+            self.nodes[name].counts = counts
+        for (node, namespace), counts in self.rollups.by_node_namespace().items():
+            self.nodes[node].subgroups[namespace].counts = counts
+
+    def _place(self, pod: "PodInfo"):
+        """Add a pod to the pod lists of its groups"""
+        node = self.nodes.get(pod.node_name)
+        if node is None:
+            node_name = pod.node_name if pod.node_name != "Unknown" else UNKNOWN_NODE
+            node = self.nodes[pod.node_name] = PodGroup(node_name)
+        namespace = self.namespaces.get(pod.namespace)
+        if namespace is None:
+            namespace = self.namespaces[pod.namespace] = PodGroup(pod.namespace)
+        subgroup = node.subgroups.get(pod.namespace)
+        if subgroup is None:
+            subgroup = node.subgroups[pod.namespace] = PodGroup(pod.namespace)
+        self.totals.pods.append(pod)
+        namespace.pods.append(pod)
+        node.pods.append(pod)
+        subgroup.pods.append(pod)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Counters in the same shape as PodAggregates.to_dict()"""
+        return {
+            "totals": asdict(self.totals.counts),
+            "namespaces": {name: asdict(group.counts) for name, group in sorted(self.namespaces.items())},
+            "nodes": {name: asdict(group.counts) for name, group in sorted(self.nodes.items())},
+        }
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+AKS Pod Informer
+================
+
+Informer-style pod cache: one initial LIST, then a resourceVersion-based
+WATCH that keeps a live PodInfo index keyed by namespace/name. Expired
+watches (410 Gone) trigger a relist.
+"""
+
+import logging
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional
+
+from aks_aggregates import PodAggregates
+from aks_kube_api import KubeApiClient, KubeApiError, KubeAuthError
+
+if TYPE_CHECKING:
+    from aks_html_dashboard import PodInfo
+
+logger = logging.getLogger(__name__)
+
+# Server-side watch timeout; the informer reconnects from the last resourceVersion
+WATCH_TIMEOUT_SECONDS = 300
+
+# Delay before reconnecting after an unexpected watch failure, doubled per consecutive failure
+RECONNECT_DELAY = 5.0
+MAX_RECONNECT_DELAY = 300.0
+
+# How long the watch may stay down before the index stops counting as synced
+STALE_AFTER = 120.0
+
+class PodInformer:
+    """Maintains a live pod index from a Kubernetes LIST + WATCH"""
+
+    def __init__(self, client_factory: Callable[[], KubeApiClient],
+                 parse_pod: Callable[[Dict[str, Any]], "PodInfo"],
+                 on_auth_failure: Optional[Callable[[], None]] = None):
+        self.client_factory = client_factory
+        self.parse_pod = parse_pod
+        self.on_auth_failure = on_auth_failure
+        self.resource_version: Optional[str] = None
+        self.synced = threading.Event()
+        # Monotonic time of the first failure since the watch last worked
+        self.failing_since: Optional[float] = None
+        self._failures = 0
+        self._client: Optional[KubeApiClient] = None
+        self._index: Dict[str, "PodInfo"] = {}
+        self._aggregates = PodAggregates()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def count(self) -> int:
+        """Number of pods currently in the index"""
+        return len(self._index)
+
+    def get(self, namespace: str, name: str) -> Optional["PodInfo"]:
+        """Look up one pod by namespace and name"""
+        return self._index.get(f"{namespace}/{name}")
+
+    def pods(self) -> List["PodInfo"]:
+        """Return a point-in-time copy of all indexed pods"""
+        with self._lock:
+            return list(self._index.values())
+
+    def aggregates(self) -> Dict[str, Any]:
+        """Return the live per-namespace and per-node counters"""
+        with self._lock:
+            return self._aggregates.to_dict()
+
+    def start(self):
+        """Start listing and watching in a background thread"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="pod-informer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        """Stop the informer; an open watch ends at its next event or timeout"""
+        self._stop.set()
+        if self._client:
+            self._client.close()
+        if self._thread:
+            self._thread.join(timeout)
+
+    def relist(self):
+        """Replace the index with a full LIST and remember its resourceVersion"""
+        index = {}
+        resource_version = None
+        for page in self._get_client().list_paged("/api/v1/pods"):
+            # Every page of a paginated LIST is served from the same resourceVersion
+            resource_version = resource_version or page.get("metadata", {}).get("resourceVersion")
+            for pod in page.get("items", []):
+                pod_info = self.parse_pod(pod)
+                index[f"{pod_info.namespace}/{pod_info.name}"] = pod_info
+        aggregates = PodAggregates(index.values())
+        with self._lock:
+            self._index = index
+            self._aggregates = aggregates
+        self.resource_version = resource_version
+        self._mark_healthy()
+        self.synced.set()
+        logger.info(f"Pod informer listed {len(index)} pods at resourceVersion {self.resource_version}")
+
+    def apply_event(self, event: Dict[str, Any]):
+        """Apply one watch event to the index"""
+        event_type = event.get("type")
+        obj = event.get("object", {})
+
+        if event_type == "ERROR":
+            raise KubeApiError(obj.get("code", 500), obj.get("message", "watch error"))
+
+        version = obj.get("metadata", {}).get("resourceVersion")
+        if event_type in ("ADDED", "MODIFIED"):
+            pod_info = self.parse_pod(obj)
+            key = f"{pod_info.namespace}/{pod_info.name}"
+            with self._lock:
+                self._aggregates.replace(self._index.get(key), pod_info)
+                self._index[key] = pod_info
+        elif event_type == "DELETED":
+            metadata = obj.get("metadata", {})
+            with self._lock:
+                removed = self._index.pop(f"{metadata.get('namespace')}/{metadata.get('name')}", None)
+                if removed:
+                    self._aggregates.remove(removed)
+        if version:
+            self.resource_version = version
+        self._mark_healthy()
+
+    def _get_client(self) -> KubeApiClient:
+        if self._client is None:
+            self._client = self.client_factory()
+        return self._client
+
+    def _run(self):
+        """List once, then watch from the last resourceVersion until stopped"""
+        while not self._stop.is_set():
+            try:
+                if self.resource_version is None:
+                    self.relist()
+                events = self._get_client().watch("/api/v1/pods", {
+                    "resourceVersion": self.resource_version,
+                    "allowWatchBookmarks": "true",
+                    "timeoutSeconds": WATCH_TIMEOUT_SECONDS,
+                })
+                for event in events:
+                    if self._stop.is_set():
+                        break
+                    self.apply_event(event)
+            except KubeAuthError as e:
+                logger.warning(f"Pod informer credentials rejected: {e}")
+                if self.on_auth_failure:
+                    self.on_auth_failure()
+                # Release the rejected client's pooled connections before building a new one
+                if self._client:
+                    self._client.close()
+                self._client = None
+                self.resource_version = None
+                self._wait_before_retry()
+            except KubeApiError as e:
+                if e.status == 410:
+                    # The watch window expired; start again from a fresh LIST
+                    logger.info("Pod informer watch expired, relisting")
+                    self.resource_version = None
+                else:
+                    logger.warning(f"Pod informer watch failed: {e}")
+                    self._wait_before_retry()
+            except Exception as e:
+                if self._stop.is_set():
+                    break
+                logger.warning(f"Pod informer watch failed: {e}")
+                self._wait_before_retry()
+
+    def _mark_healthy(self):
+        self.failing_since = None
+        self._failures = 0
+
+    def _wait_before_retry(self):
+        """Back off exponentially, and stop serving the index once the watch has been down too long"""
+        now = time.monotonic()
+        if self.failing_since is None:
+            self.failing_since = now
+        elif now - self.failing_since > STALE_AFTER and self.synced.is_set():
+            logger.warning(f"Pod informer down for {now - self.failing_since:.0f}s, falling back to listing")
+            self.synced.clear()
+            # Start again from a full LIST, which marks the index synced again
+            self.resource_version = None
+        delay = min(MAX_RECONNECT_DELAY, RECONNECT_DELAY * 2 ** self._failures)
+        self._failures += 1
+        self._stop.wait(delay)
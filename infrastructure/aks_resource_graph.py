@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+AKS Resource Graph Inventory
+============================
+
+Resource inventory backed by Azure Resource Graph. One query returns the
+resources of every configured resource group across subscriptions, with
+type and tag filters applied server-side, instead of paging through
+`resources.list_by_resource_group` once per group.
+"""
+
+import json
+import logging
+import threading
+import time
+import urllib.error
+import urllib.request
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from aks_html_dashboard import ResourceInfo
+
+logger = logging.getLogger(__name__)
+
+RESOURCE_GRAPH_ENDPOINT = "https://management.azure.com"
+RESOURCE_GRAPH_SCOPE = "https://management.azure.com/.default"
+RESOURCE_GRAPH_API_VERSION = "2022-10-01"
+
+# Rows per Resource Graph page; 1000 is the service maximum
+DEFAULT_PAGE_SIZE = 1000
+
+# How long one bulk query answers per-group lookups before it is repeated
+DEFAULT_MAX_AGE = 30.0
+
+class ResourceGraphError(Exception):
+    """Error response from the Resource Graph endpoint"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(f"HTTP {status}: {message}")
+        self.status = status
+
+def _kql_string(value: str) -> str:
+    """Quote a value as a KQL string literal"""
+    return "'" + value.replace("\\", "\\\\").replace("'", "\\'") + "'"
+
+def resource_type(row: Dict[str, Any]) -> Optional[str]:
+    """The resource type with ARM's casing, taken from the id; Resource Graph reports `type` in lower case"""
+    reported = row.get("type")
+    _, found, path = (row.get("id") or "").rpartition("/providers/")
+    segments = path.split("/") if found else []
+    # providers/<namespace>/<type>/<name>[/<child type>/<child name>...]
+    cased = "/".join(segments[:1] + segments[1::2])
+    if reported and cased.lower() == reported.lower():
+        return cased
+    return reported
+
+def build_query(resource_groups: Iterable[str], types: Optional[Iterable[str]] = None,
+                tags: Optional[Dict[str, str]] = None) -> str:
+    """Build the KQL query for the given resource groups and filters"""
+    groups = ", ".join(_kql_string(group) for group in sorted(set(resource_groups)))
+    clauses = ["Resources", f"where resourceGroup in~ ({groups})"]
+    if types:
+        clauses.append(f"where type in~ ({', '.join(_kql_string(t) for t in types)})")
+    for key, value in (tags or {}).items():
+        clauses.append(f"where tags[{_kql_string(key)}] =~ {_kql_string(value)}")
+    clauses.append("project id, subscriptionId, resourceGroup, name, type, location, tags")
+    return " | ".join(clauses)
+
+class ResourceGraphInventory:
+    """Fetches resources for many resource groups with one paged bulk query"""
+
+    def __init__(self, credential, endpoint: str = RESOURCE_GRAPH_ENDPOINT,
+                 types: Optional[List[str]] = None, tags: Optional[Dict[str, str]] = None,
+                 max_age: float = DEFAULT_MAX_AGE, page_size: int = DEFAULT_PAGE_SIZE,
+                 timeout: float = 30.0):
+        self.credential = credential
+        self.url = (f"{endpoint.rstrip('/')}/providers/Microsoft.ResourceGraph/resources"
+                    f"?api-version={RESOURCE_GRAPH_API_VERSION}")
+        self.types = types
+        self.tags = tags
+        self.max_age = max_age
+        self.page_size = page_size
+        self.timeout = timeout
+        self._groups: Set[Tuple[str, str]] = set()
+        self._resources: Dict[Tuple[str, str], List[ResourceInfo]] = {}
+        self._fetched_at = 0.0
+        self._lock = threading.Lock()
+
+    def register(self, subscription_id: str, resource_group: str):
+        """Include a resource group in every subsequent bulk query"""
+        with self._lock:
+            self._groups.add((subscription_id, resource_group))
+
+    def get_resources(self, subscription_id: str, resource_group: str) -> List[ResourceInfo]:
+        """Return one group's resources, refreshing the bulk result when it is stale"""
+        key = (subscription_id, resource_group)
+        # Concurrent per-cluster collections wait here and share one query
+        with self._lock:
+            if key not in self._groups or time.monotonic() - self._fetched_at > self.max_age:
+                self._groups.add(key)
+                self._resources = self.query(self._groups)
+                self._fetched_at = time.monotonic()
+            return list(self._resources.get(key, []))
+
+    def invalidate(self):
+        """Force the next lookup to run a fresh query"""
+        with self._lock:
+            self._fetched_at = 0.0
+
+    def query(self, groups: Iterable[Tuple[str, str]]) -> Dict[Tuple[str, str], List[ResourceInfo]]:
+        """Run one bulk query and return resources keyed by (subscription, resource group)"""
+        groups = set(groups)
+        # Resource Graph reports group names in lower case; map them back to the configured names
+        names = {(sub.lower(), group.lower()): (sub, group) for sub, group in groups}
+        resources = {group: [] for group in groups}
+
+        started = time.perf_counter()
+        rows = 0
+        query = build_query([group for _, group in groups], self.types, self.tags)
+        for row in self._rows(sorted({sub for sub, _ in groups}), query):
+            rows += 1
+            key = names.get((row.get("subscriptionId", "").lower(), row.get("resourceGroup", "").lower()))
+            if key is None:
+                # Same group name in another of the queried subscriptions
+                continue
+            resources[key].append(ResourceInfo(
+                name=row.get("name"),
+                type=resource_type(row),
+                location=row.get("location"),
+                resource_group=key[1],
+                tags=row.get("tags") or {}
+            ))
+        logger.info(f"Resource Graph returned {rows} resources for {len(groups)} resource groups "
+                    f"in {time.perf_counter() - started:.2f}s")
+        return resources
+
+    def _rows(self, subscriptions: List[str], query: str) -> Iterator[Dict[str, Any]]:
+        """Yield result rows, following $skipToken across pages"""
+        options: Dict[str, Any] = {"resultFormat": "objectArray", "$top": self.page_size}
+        while True:
+            page = self._post({"subscriptions": subscriptions, "query": query, "options": options})
+            yield from page.get("data", [])
+            skip_token = page.get("$skipToken")
+            if not skip_token:
+                return
+            options = dict(options, **{"$skipToken": skip_token})
+
+    def _post(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        token = self.credential.get_token(RESOURCE_GRAPH_SCOPE).token
+        request = urllib.request.Request(
+            self.url,
+            data=json.dumps(body).encode("utf-8"),
+            headers={
+                "Authorization": f"Bearer {token}",
+                "Content-Type": "application/json",
+                "Accept": "application/json",
+            },
+            method="POST"
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return json.loads(response.read())
+        except urllib.error.HTTPError as e:
+            raise ResourceGraphError(e.code, e.read().decode("utf-8", "replace")) from None
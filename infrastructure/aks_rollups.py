@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+AKS Health Rollups
+==================
+
+Container readiness, restart counts, pod phases and namespace/node codes of
+one snapshot, held in NumPy arrays. Every rollup (per namespace, per node,
+per namespace within a node, top restarters) is a vectorized group-by over
+those arrays instead of a Python loop over pods and containers.
+"""
+
+from dataclasses import asdict
+from typing import TYPE_CHECKING, Any, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from aks_aggregates import PodCounts
+
+if TYPE_CHECKING:
+    from aks_html_dashboard import ContainerInfo, PodInfo
+
+# Pod phases with their own code; any other phase is counted as "Unknown"
+PHASES = ("Running", "Pending", "Succeeded", "Failed", "Unknown")
+
+# Columns of a rollup, in PodCounts field order
+COUNT_FIELDS = ("pods", "running_pods", "containers", "ready_containers", "restarts")
+
+# Containers listed under top_restarters in the status API
+DEFAULT_TOP_RESTARTERS = 10
+
+def encode(values: Sequence[str]) -> Tuple[List[str], np.ndarray]:
+    """Distinct values in order of first appearance, and each value's code"""
+    codes: Dict[str, int] = {}
+    encoded = np.fromiter((codes.setdefault(value, len(codes)) for value in values), np.int32, len(values))
+    return list(codes), encoded
+
+class PodRollups:
+    """Columnar health of one snapshot's pods and containers"""
+
+    def __init__(self, pods: Sequence["PodInfo"]):
+        self.pods = list(pods)
+        count = len(self.pods)
+        self.namespaces, self.namespace_codes = encode([pod.namespace for pod in self.pods])
+        self.nodes, self.node_codes = encode([pod.node_name for pod in self.pods])
+        phase_codes = {phase: code for code, phase in enumerate(PHASES)}
+        unknown = phase_codes["Unknown"]
+        self.phase_codes = np.fromiter((phase_codes.get(pod.status, unknown) for pod in self.pods), np.int8, count)
+        self.container_counts = np.fromiter((len(pod.containers) for pod in self.pods), np.int32, count)
+
+        # One entry per container, grouped by pod in pod order
+        self.containers: List["ContainerInfo"] = [c for pod in self.pods for c in pod.containers]
+        total = len(self.containers)
+        self.ready = np.fromiter((c.ready for c in self.containers), np.bool_, total)
+        self.restarts = np.fromiter((c.restart_count for c in self.containers), np.int64, total)
+        self.container_pods = np.repeat(np.arange(count, dtype=np.int32), self.container_counts)
+
+    def __len__(self) -> int:
+        return len(self.pods)
+
+    def rollup(self, codes: np.ndarray, groups: int) -> np.ndarray:
+        """Counts per group as a (groups, len(COUNT_FIELDS)) array, for a group code per pod"""
+        container_codes = codes[self.container_pods]
+        return np.stack([
+            np.bincount(codes, minlength=groups),
+            np.bincount(codes, weights=self.phase_codes == 0, minlength=groups),
+            np.bincount(codes, weights=self.container_counts, minlength=groups),
+            np.bincount(container_codes, weights=self.ready, minlength=groups),
+            np.bincount(container_codes, weights=self.restarts, minlength=groups),
+        ], axis=1).astype(np.int64)
+
+    def totals(self) -> PodCounts:
+        return self._counts(self.rollup(np.zeros(len(self.pods), dtype=np.int32), 1)[0])
+
+    def by_namespace(self) -> Dict[str, PodCounts]:
+        table = self.rollup(self.namespace_codes, len(self.namespaces))
+        return {name: self._counts(row) for name, row in zip(self.namespaces, table)}
+
+    def by_node(self) -> Dict[str, PodCounts]:
+        table = self.rollup(self.node_codes, len(self.nodes))
+        return {name: self._counts(row) for name, row in zip(self.nodes, table)}
+
+    def by_node_namespace(self) -> Dict[Tuple[str, str], PodCounts]:
+        """Counts of each namespace within each node, for the pairs that have pods"""
+        pairs = self.node_codes.astype(np.int64) * len(self.namespaces) + self.namespace_codes
+        present, codes = np.unique(pairs, return_inverse=True)
+        table = self.rollup(codes.reshape(-1), len(present))
+        return {
+            (self.nodes[pair // len(self.namespaces)], self.namespaces[pair % len(self.namespaces)]): self._counts(row)
+            for pair, row in zip(present.tolist(), table)
+        }
+
+    def phases(self) -> Dict[str, Dict[str, int]]:
+        """Pods per phase of each namespace"""
+        table = np.zeros((len(self.namespaces), len(PHASES)), dtype=np.int64)
+        np.add.at(table, (self.namespace_codes, self.phase_codes), 1)
+        return {
+            name: {phase: count for phase, count in zip(PHASES, row.tolist()) if count}
+            for name, row in zip(self.namespaces, table)
+        }
+
+    def top_restarters(self, limit: int = DEFAULT_TOP_RESTARTERS) -> List[Tuple["ContainerInfo", int]]:
+        """The containers with the most restarts, most first; containers that never restarted are left out"""
+        limit = min(limit, len(self.containers))
+        if limit <= 0:
+            return []
+        # The limit-th largest count; of the containers tied at it, the first ones are kept
+        threshold = np.partition(self.restarts, len(self.restarts) - limit)[len(self.restarts) - limit]
+        above = np.flatnonzero(self.restarts > threshold)
+        tied = np.flatnonzero(self.restarts == threshold)[:limit - len(above)]
+        top = np.concatenate([above, tied])
+        top = top[np.lexsort((top, -self.restarts[top]))]
+        return [(self.containers[i], int(self.restarts[i])) for i in top.tolist() if self.restarts[i] > 0]
+
+    def health(self, limit: int = DEFAULT_TOP_RESTARTERS) -> Dict[str, Any]:
+        """Pod phases per namespace and the top restarting containers, for the status API"""
+        return {
+            "phases": self.phases(),
+            "top_restarters": [
+                {"namespace": c.namespace, "pod": c.pod_name, "container": c.name, "restarts": restarts}
+                for c, restarts in self.top_restarters(limit)
+            ]
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Counters in the same shape as PodAggregates.to_dict()"""
+        return {
+            "totals": asdict(self.totals()),
+            "namespaces": {name: asdict(counts) for name, counts in sorted(self.by_namespace().items())},
+            "nodes": {name: asdict(counts) for name, counts in sorted(self.by_node().items())},
+        }
+
+    @staticmethod
+    def _counts(row: np.ndarray) -> PodCounts:
+        return PodCounts(*row.tolist())
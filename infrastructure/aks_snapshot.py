@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+AKS Dashboard Snapshots
+=======================
+
+Background collection of dashboard data into immutable in-memory snapshots.
+Web routes read the latest snapshot instead of calling Azure and kubectl on
+every request.
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from aks_html_dashboard import ClusterInfo, ClusterTarget, ResourceInfo, PodInfo
+from aks_diff import PodHashes
+from aks_http_cache import CachedPage
+from aks_pod_index import PodIndex
+
+logger = logging.getLogger(__name__)
+
+# Default interval between scheduled collections (matches the page auto-refresh)
+DEFAULT_REFRESH_INTERVAL = 300.0
+
+# Refresh requests within this many seconds of the last collection reuse its snapshot
+DEFAULT_MIN_INTERVAL = 30.0
+
+@dataclass(frozen=True)
+class ClusterSnapshot:
+    """Immutable collected state of one cluster"""
+    target: ClusterTarget
+    collected_at: float
+    cluster_info: Optional[ClusterInfo]
+    resources: Tuple[ResourceInfo, ...]
+    kubernetes_pods: Tuple[PodInfo, ...]
+    timings: Dict[str, float] = field(default_factory=dict)
+    error: Optional[str] = None
+    # Sources (resources, kubernetes_pods) that failed; their data is carried over from the previous snapshot
+    source_errors: Dict[str, str] = field(default_factory=dict)
+    # PodIndex.to_dict() of kubernetes_pods, computed once when the snapshot is built
+    aggregates: Dict[str, Any] = field(default_factory=dict)
+    # PodRollups.health() of kubernetes_pods: phases and top restarters
+    health: Dict[str, Any] = field(default_factory=dict)
+    # Namespace/node groups and health rollups shared by every page section
+    pod_index: Optional[PodIndex] = None
+    # Per-pod hashes for diffing against the next snapshot
+    pod_hashes: Optional[PodHashes] = None
+    # Page hashed and compressed once for serving
+    page: Optional[CachedPage] = None
+
+    @property
+    def key(self) -> str:
+        return self.target.key
+
+    @property
+    def stale(self) -> bool:
+        """True when the latest collection (or one of its sources) failed and older data is being served"""
+        return (self.error is not None or bool(self.source_errors)) and self.cluster_info is not None
+
+@dataclass(frozen=True)
+class DashboardSnapshot:
+    """Immutable result of one dashboard collection across all clusters"""
+    generation: int
+    collected_at: float
+    clusters: Tuple[ClusterSnapshot, ...]
+    page: Optional[CachedPage] = None
+    # Loaded from the snapshot store at startup rather than collected by this process
+    restored: bool = False
+
+    @property
+    def age_seconds(self) -> float:
+        """Seconds elapsed since the snapshot was collected"""
+        return max(0.0, time.time() - self.collected_at)
+
+    @property
+    def primary(self) -> ClusterSnapshot:
+        """The first configured cluster"""
+        return self.clusters[0]
+
+    def cluster(self, key: str) -> Optional[ClusterSnapshot]:
+        """Look up a cluster by its key"""
+        for cluster in self.clusters:
+            if cluster.key == key:
+                return cluster
+        return None
+
+class SnapshotRefresher:
+    """Collects snapshots on a schedule or on explicit trigger in a background thread
+
+    Collection is single-flight: requests that arrive while a collection is
+    running attach to it instead of starting another one.
+    """
+
+    def __init__(self, collect: Callable[[int], DashboardSnapshot],
+                 interval: float = DEFAULT_REFRESH_INTERVAL,
+                 min_interval: float = DEFAULT_MIN_INTERVAL):
+        self.collect = collect
+        self.interval = interval
+        self.min_interval = min_interval
+        self.last_error: Optional[str] = None
+        self.stats = {"collections": 0, "coalesced": 0, "throttled": 0}
+        self._snapshot: Optional[DashboardSnapshot] = None
+        self._generation = 0
+        self._in_flight = False
+        self._last_collected: Optional[float] = None
+        self._trigger = threading.Event()
+        self._stop = threading.Event()
+        self._changed = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._listeners: List[Callable[[Optional[DashboardSnapshot], DashboardSnapshot], None]] = []
+
+    def add_listener(self, listener: Callable[[Optional[DashboardSnapshot], DashboardSnapshot], None]):
+        """Call `listener(previous, snapshot)` after each new snapshot is published"""
+        self._listeners.append(listener)
+
+    def start(self):
+        """Start the background worker; the first collection runs immediately"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._trigger.set()
+        self._thread = threading.Thread(target=self._run, name="snapshot-refresher", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        """Stop the background worker"""
+        self._stop.set()
+        self._trigger.set()
+        if self._thread:
+            self._thread.join(timeout)
+
+    def trigger(self) -> int:
+        """Request an asynchronous collection and return the generation to wait past
+
+        Joins a running collection, and returns an already satisfied generation
+        when the latest snapshot is younger than `min_interval`.
+        """
+        with self._changed:
+            if self._in_flight:
+                self.stats["coalesced"] += 1
+                return self._generation
+            if self._is_fresh():
+                self.stats["throttled"] += 1
+                return self._generation - 1
+            self._trigger.set()
+            return self._generation
+
+    def restore(self, snapshot: DashboardSnapshot):
+        """Serve a previously saved snapshot until the first collection replaces it
+
+        Does nothing once a snapshot has been collected. Restoring neither
+        counts as a collection nor delays the next one.
+        """
+        with self._changed:
+            if self._snapshot is not None:
+                return
+            self._snapshot = snapshot
+            self._generation = snapshot.generation
+            self._changed.notify_all()
+        logger.info(f"Restored snapshot {snapshot.generation} collected {snapshot.age_seconds:.0f}s ago")
+
+    def current(self) -> Optional[DashboardSnapshot]:
+        """Return the latest snapshot, or None before the first collection completes"""
+        return self._snapshot
+
+    def wait_for(self, generation: int, timeout: Optional[float] = None) -> Optional[DashboardSnapshot]:
+        """Block until a snapshot newer than `generation` exists or the timeout expires"""
+        with self._changed:
+            self._changed.wait_for(lambda: self._generation > generation, timeout)
+            return self._snapshot
+
+    def refresh_now(self) -> Optional[DashboardSnapshot]:
+        """Run one collection in the calling thread, or wait for the one already running"""
+        with self._changed:
+            if self._in_flight:
+                self.stats["coalesced"] += 1
+                generation = self._generation
+                self._changed.wait_for(lambda: not self._in_flight)
+                return self._snapshot if self._generation > generation else None
+            self._in_flight = True
+            generation = self._generation + 1
+
+        started = time.time()
+        try:
+            snapshot = self.collect(generation)
+        except Exception as e:
+            logger.error(f"Snapshot collection failed: {e}")
+            with self._changed:
+                self.last_error = str(e)
+                self._in_flight = False
+                self._changed.notify_all()
+            return None
+
+        with self._changed:
+            previous = self._snapshot
+            self._snapshot = snapshot
+            self._generation = snapshot.generation
+            self._last_collected = time.monotonic()
+            self._in_flight = False
+            self.stats["collections"] += 1
+            self.last_error = None
+            self._changed.notify_all()
+
+        logger.info(f"Snapshot {snapshot.generation} collected in {time.time() - started:.2f}s")
+        for listener in self._listeners:
+            try:
+                listener(previous, snapshot)
+            except Exception as e:
+                logger.error(f"Snapshot listener failed: {e}")
+        return snapshot
+
+    def _is_fresh(self) -> bool:
+        """True when the last successful collection finished less than `min_interval` ago"""
+        return (self._last_collected is not None
+                and time.monotonic() - self._last_collected < self.min_interval)
+
+    def _run(self):
+        """Worker loop: wait for the schedule or a trigger, then collect"""
+        while not self._stop.is_set():
+            self._trigger.wait(self.interval)
+            self._trigger.clear()
+            if self._stop.is_set():
+                break
+            if self._is_fresh():
+                # A trigger raced with the collection that just finished and is already satisfied
+                continue
+            self.refresh_now()
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+AKS Snapshot Store
+==================
+
+Persists the collected data of the latest snapshot in a SQLite file so a
+restarted server can serve it right away, marked stale, while the first new
+collection runs. Each save writes a complete database next to the target and
+moves it into place, so readers only ever see a whole snapshot.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field
+from sys import intern
+from typing import Dict, List, Optional
+
+from aks_html_dashboard import NO_RESOURCES, ClusterInfo, ClusterTarget, ContainerInfo, PodInfo, ResourceInfo
+
+logger = logging.getLogger(__name__)
+
+# Default file of the store, next to aks-dashboard.html
+DEFAULT_SNAPSHOT_PATH = "aks-dashboard-snapshot.db"
+
+# Bumped when the schema changes; stores of other versions are ignored
+FORMAT_VERSION = 2
+
+SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE clusters (
+    id INTEGER PRIMARY KEY, name TEXT NOT NULL, resource_group TEXT NOT NULL, subscription_id TEXT NOT NULL,
+    collected_at REAL NOT NULL, cluster_info TEXT, timings TEXT NOT NULL, error TEXT, source_errors TEXT
+);
+CREATE TABLE resources (
+    cluster_id INTEGER NOT NULL, name TEXT, type TEXT, location TEXT, resource_group TEXT, tags TEXT
+);
+CREATE TABLE pods (
+    id INTEGER PRIMARY KEY, cluster_id INTEGER NOT NULL, name TEXT, namespace TEXT, status TEXT, ready TEXT,
+    node_name TEXT, created_at INTEGER
+);
+CREATE TABLE containers (
+    pod_id INTEGER NOT NULL, name TEXT, image TEXT, status TEXT, ready INTEGER, restart_count INTEGER,
+    ports TEXT, resources TEXT
+);
+"""
+
+@dataclass
+class StoredCluster:
+    """Collected data of one cluster as it was saved"""
+    target: ClusterTarget
+    collected_at: float
+    cluster_info: Optional[ClusterInfo]
+    resources: List[ResourceInfo]
+    kubernetes_pods: List[PodInfo]
+    timings: Dict[str, float]
+    error: Optional[str] = None
+    source_errors: Dict[str, str] = field(default_factory=dict)
+
+@dataclass
+class StoredSnapshot:
+    """The last saved snapshot"""
+    generation: int
+    collected_at: float
+    clusters: List[StoredCluster]
+
+class SnapshotStore:
+    """Single-snapshot SQLite store, replaced atomically on every save"""
+
+    def __init__(self, path: str = DEFAULT_SNAPSHOT_PATH):
+        self.path = path
+        self.stats = {"saves": 0, "loads": 0, "failures": 0}
+
+    def save(self, snapshot: StoredSnapshot):
+        """Write a snapshot, replacing the stored one atomically"""
+        started = time.time()
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, staging_path = tempfile.mkstemp(prefix=".aks-snapshot-", suffix=".db", dir=directory)
+        os.close(fd)
+        try:
+            connection = sqlite3.connect(staging_path)
+            try:
+                # The staging file is fsynced below; no journal is needed while it is private
+                connection.execute("PRAGMA journal_mode = OFF")
+                connection.executescript(SCHEMA)
+                self._write(connection, snapshot)
+                connection.commit()
+            finally:
+                connection.close()
+            with open(staging_path, "rb") as f:
+                os.fsync(f.fileno())
+            os.replace(staging_path, self.path)
+        except Exception:
+            self.stats["failures"] += 1
+            os.unlink(staging_path)
+            raise
+        self.stats["saves"] += 1
+        logger.info(f"Saved snapshot {snapshot.generation} to {self.path} in {time.time() - started:.2f}s")
+
+    def load(self) -> Optional[StoredSnapshot]:
+        """Read the stored snapshot; None when there is none or it can't be read"""
+        if not os.path.exists(self.path):
+            return None
+        try:
+            # Read-only, so a damaged file is never modified
+            connection = sqlite3.connect(f"file:{os.path.abspath(self.path)}?mode=ro", uri=True)
+            try:
+                snapshot = self._read(connection)
+            finally:
+                connection.close()
+        except (sqlite3.Error, ValueError, KeyError, TypeError) as e:
+            self.stats["failures"] += 1
+            logger.warning(f"Ignoring unreadable snapshot store {self.path}: {e}")
+            return None
+        if snapshot:
+            self.stats["loads"] += 1
+        return snapshot
+
+    def _write(self, connection: sqlite3.Connection, snapshot: StoredSnapshot):
+        connection.executemany("INSERT INTO meta VALUES (?, ?)", [
+            ("format_version", str(FORMAT_VERSION)),
+            ("generation", str(snapshot.generation)),
+            ("collected_at", repr(snapshot.collected_at)),
+        ])
+        pod_id = 0
+        for cluster_id, cluster in enumerate(snapshot.clusters):
+            target = cluster.target
+            connection.execute("INSERT INTO clusters VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", (
+                cluster_id, target.name, target.resource_group, target.subscription_id, cluster.collected_at,
+                json.dumps(asdict(cluster.cluster_info)) if cluster.cluster_info else None,
+                json.dumps(cluster.timings), cluster.error,
+                json.dumps(cluster.source_errors) if cluster.source_errors else None
+            ))
+            connection.executemany("INSERT INTO resources VALUES (?, ?, ?, ?, ?, ?)", [
+                (cluster_id, r.name, r.type, r.location, r.resource_group, json.dumps(r.tags) if r.tags else None)
+                for r in cluster.resources
+            ])
+            pods, containers = [], []
+            for pod in cluster.kubernetes_pods:
+                pods.append((pod_id, cluster_id, pod.name, pod.namespace, pod.status, pod.ready,
+                             pod.node_name, pod.created_at))
+                containers.extend(
+                    (pod_id, c.name, c.image, c.status, int(c.ready), c.restart_count,
+                     # Parsed pods share the empty tuple; other values round-trip as lists
+                     None if c.ports == () else json.dumps(c.ports), json.dumps(c.resources) if c.resources else None)
+                    for c in pod.containers
+                )
+                pod_id += 1
+            connection.executemany("INSERT INTO pods VALUES (?, ?, ?, ?, ?, ?, ?, ?)", pods)
+            connection.executemany("INSERT INTO containers VALUES (?, ?, ?, ?, ?, ?, ?, ?)", containers)
+
+    def _read(self, connection: sqlite3.Connection) -> Optional[StoredSnapshot]:
+        meta = dict(connection.execute("SELECT key, value FROM meta"))
+        if int(meta["format_version"]) != FORMAT_VERSION:
+            logger.warning(f"Ignoring snapshot store {self.path} of format {meta['format_version']}")
+            return None
+
+        pods_by_id: Dict[int, PodInfo] = {}
+        pods: Dict[int, List[PodInfo]] = {}
+        # Pods and containers come back in the order they were saved
+        for pod_id, cluster_id, name, namespace, status, ready, node_name, created_at in connection.execute(
+                "SELECT * FROM pods ORDER BY id"):
+            pod = pods_by_id[pod_id] = PodInfo(
+                name=name, namespace=intern(namespace), status=intern(status), ready=intern(ready),
+                containers=[], node_name=intern(node_name), created_at=created_at
+            )
+            pods.setdefault(cluster_id, []).append(pod)
+        for pod_id, name, image, status, ready, restart_count, ports, resources in connection.execute(
+                "SELECT * FROM containers ORDER BY rowid"):
+            pod = pods_by_id[pod_id]
+            pod.containers.append(ContainerInfo(
+                name=intern(name), namespace=pod.namespace, pod_name=pod.name, image=intern(image),
+                status=intern(status), ready=bool(ready), restart_count=restart_count,
+                ports=json.loads(ports) if ports else (), resources=json.loads(resources) if resources else NO_RESOURCES
+            ))
+        resources: Dict[int, List[ResourceInfo]] = {}
+        for cluster_id, name, type_, location, resource_group, tags in connection.execute(
+                "SELECT * FROM resources ORDER BY rowid"):
+            resources.setdefault(cluster_id, []).append(ResourceInfo(
+                name=name, type=type_, location=location, resource_group=resource_group,
+                tags=json.loads(tags) if tags else {}
+            ))
+
+        clusters = []
+        for cluster_id, name, resource_group, subscription_id, collected_at, cluster_info, timings, error, \
+                source_errors in connection.execute("SELECT * FROM clusters ORDER BY id"):
+            clusters.append(StoredCluster(
+                target=ClusterTarget(name=name, resource_group=resource_group, subscription_id=subscription_id),
+                collected_at=collected_at,
+                cluster_info=ClusterInfo(**json.loads(cluster_info)) if cluster_info else None,
+                resources=resources.get(cluster_id, []),
+                kubernetes_pods=pods.get(cluster_id, []),
+                timings=json.loads(timings),
+                error=error,
+                source_errors=json.loads(source_errors) if source_errors else {}
+            ))
+        return StoredSnapshot(
+            generation=int(meta["generation"]),
+            collected_at=float(meta["collected_at"]),
+            clusters=clusters
+        )
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+AKS Dashboard Templates
+=======================
+
+Jinja2 templates for the dashboard pages, compiled once per process, with
+autoescaping. The static CSS/JS lives in separate files that are either
+linked with a content-versioned URL (served with immutable cache headers)
+or inlined for standalone HTML files.
+"""
+
+import hashlib
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterator
+
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+from markupsafe import Markup
+
+TEMPLATE_DIR = Path(__file__).resolve().parent / "templates"
+STATIC_DIR = Path(__file__).resolve().parent / "static"
+STATIC_URL = "/static"
+
+# Characters per streamed chunk; Jinja yields many tiny fragments that are batched up to this
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Status dot colour per pod phase; other phases are shown yellow
+POD_STATUS_COLORS = {"Running": "green", "Failed": "red"}
+
+# Versioned asset URLs never change content, so browsers may cache them for good
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+class DashboardTemplates:
+    """Compiled dashboard templates and their static assets"""
+
+    def __init__(self, template_dir: Path = TEMPLATE_DIR, static_dir: Path = STATIC_DIR,
+                 static_url: str = STATIC_URL):
+        self.static_url = static_url
+        self.assets: Dict[str, str] = {
+            path.name: path.read_text(encoding="utf-8")
+            for path in sorted(static_dir.iterdir()) if path.is_file()
+        }
+        self.asset_versions: Dict[str, str] = {
+            name: hashlib.sha256(content.encode("utf-8")).hexdigest()[:12]
+            for name, content in self.assets.items()
+        }
+
+        self.env = Environment(
+            loader=FileSystemLoader(str(template_dir)),
+            autoescape=select_autoescape(["html"]),
+            trim_blocks=True,
+            lstrip_blocks=True,
+            # Templates are compiled once; edits need a restart
+            auto_reload=False
+        )
+        self.env.globals.update(stylesheet=self.stylesheet, script=self.script, asset_url=self.asset_url)
+        self.env.filters["status_color"] = lambda status: POD_STATUS_COLORS.get(status, "yellow")
+        self.templates = {name: self.env.get_template(name) for name in self.env.list_templates()}
+
+    def render(self, name: str, **context) -> str:
+        """Render a template with `inline_assets` defaulting to False"""
+        context.setdefault("inline_assets", False)
+        return self.templates[name].render(**context)
+
+    def generate(self, name: str, **context) -> Iterator[str]:
+        """Render a template incrementally, yielding chunks of about STREAM_CHUNK_SIZE characters"""
+        context.setdefault("inline_assets", False)
+        buffer, size = [], 0
+        for fragment in self.templates[name].generate(**context):
+            buffer.append(fragment)
+            size += len(fragment)
+            if size >= STREAM_CHUNK_SIZE:
+                yield "".join(buffer)
+                buffer, size = [], 0
+        if buffer:
+            yield "".join(buffer)
+
+    def asset_url(self, name: str) -> str:
+        """URL of a static asset, versioned by its content hash"""
+        return f"{self.static_url}/{name}?v={self.asset_versions[name]}"
+
+    def stylesheet(self, name: str, inline: bool = False) -> Markup:
+        """Link a stylesheet, or embed it for pages opened without the server"""
+        if inline:
+            return Markup("<style>\n{}</style>").format(Markup(self.assets[name]))
+        return Markup('<link rel="stylesheet" href="{}">').format(self.asset_url(name))
+
+    def script(self, name: str, inline: bool = False) -> Markup:
+        """Link a script, or embed it for pages opened without the server"""
+        if inline:
+            return Markup("<script>\n{}</script>").format(Markup(self.assets[name]))
+        return Markup('<script src="{}"></script>').format(self.asset_url(name))
+
+@lru_cache(maxsize=None)
+def get_templates() -> DashboardTemplates:
+    """Shared template set, loaded on first use"""
+    return DashboardTemplates()
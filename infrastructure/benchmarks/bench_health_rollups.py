@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Health Rollup Benchmark
+=======================
+
+Computes the namespace, node, node/namespace and top-restarter rollups of
+synthetic pods three ways: the nested `sum(... for ...)` loops the section
+renderers used to run per group, one pass adding each pod's PodCounts to its
+groups, and the NumPy group-bys of PodRollups (including building its
+arrays). Prints the best time of each over a few repeats.
+
+    python3 benchmarks/bench_health_rollups.py --containers 100000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from dataclasses import replace
+from typing import Dict, List
+
+INFRASTRUCTURE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, INFRASTRUCTURE_DIR)
+# The stub API server lives with the tests
+sys.path.insert(0, os.path.join(INFRASTRUCTURE_DIR, "tests"))
+from aks_aggregates import PodCounts
+from aks_html_dashboard import AKSDashboardGenerator, PodInfo
+from aks_rollups import PodRollups
+from stub_kube_api import make_pod
+
+TOP = 10
+
+def group_counts(pods: List[PodInfo]) -> Dict[str, int]:
+    """The per-group sums the section renderers computed"""
+    return {
+        "pods": len(pods),
+        "running_pods": sum(1 for pod in pods if pod.status == 'Running'),
+        "containers": sum(len(pod.containers) for pod in pods),
+        "ready_containers": sum(1 for pod in pods for container in pod.containers if container.ready),
+        "restarts": sum(container.restart_count for pod in pods for container in pod.containers),
+    }
+
+def nested_loops(pods: List[PodInfo]):
+    """Group the pods, then sum every group separately"""
+    namespaces: Dict[str, List[PodInfo]] = {}
+    nodes: Dict[str, List[PodInfo]] = {}
+    for pod in pods:
+        namespaces.setdefault(pod.namespace, []).append(pod)
+        nodes.setdefault(pod.node_name, []).append(pod)
+    return (
+        {name: group_counts(group) for name, group in namespaces.items()},
+        {name: group_counts(group) for name, group in nodes.items()},
+        {(node, namespace): group_counts([pod for pod in group if pod.namespace == namespace])
+         for node, group in nodes.items() for namespace in dict.fromkeys(pod.namespace for pod in group)},
+        sorted((c for pod in pods for c in pod.containers), key=lambda c: -c.restart_count)[:TOP],
+    )
+
+def one_pass(pods: List[PodInfo]):
+    """Count each pod once and merge its counts into every group it belongs to"""
+    namespaces: Dict[str, PodCounts] = {}
+    nodes: Dict[str, PodCounts] = {}
+    pairs: Dict[tuple, PodCounts] = {}
+    for pod in pods:
+        counts = PodCounts()
+        counts.add(pod)
+        for groups, key in ((namespaces, pod.namespace), (nodes, pod.node_name),
+                            (pairs, (pod.node_name, pod.namespace))):
+            groups.setdefault(key, PodCounts()).merge(counts)
+    top = sorted((c for pod in pods for c in pod.containers), key=lambda c: -c.restart_count)[:TOP]
+    return namespaces, nodes, pairs, top
+
+def vectorized(pods: List[PodInfo]):
+    rollups = PodRollups(pods)
+    return rollups.by_namespace(), rollups.by_node(), rollups.by_node_namespace(), rollups.top_restarters(TOP)
+
+def best_of(work, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        work()
+        times.append(time.perf_counter() - started)
+    return min(times)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--containers", type=int, default=100000)
+    parser.add_argument("--per-pod", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    generator = AKSDashboardGenerator("sub", "tenant", "client", "secret")
+    rng = random.Random(1)
+    pods = []
+    for index in range(args.containers // args.per_pod):
+        pod = generator._parse_pod(make_pod(index, args.per_pod))
+        pods.append(replace(pod, containers=[
+            replace(c, restart_count=rng.choice([0, 0, 0, 1, 3, 40])) for c in pod.containers
+        ]))
+
+    # Every approach must agree before it is timed
+    expected = vectorized(pods)
+    loops = nested_loops(pods)
+    assert {name: PodCounts(**counts) for name, counts in loops[0].items()} == expected[0]
+    assert {key: PodCounts(**counts) for key, counts in loops[2].items()} == expected[2]
+    assert one_pass(pods)[:3] == expected[:3]
+
+    containers = sum(len(pod.containers) for pod in pods)
+    print(f"{len(pods)} pods, {containers} containers")
+    print(f"{'approach':<14} {'ms':>8}")
+    for name, work in (("nested loops", nested_loops), ("one pass", one_pass), ("numpy", vectorized)):
+        print(f"{name:<14} {best_of(lambda: work(pods), args.repeat) * 1000:>8.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Pod Memory Benchmark
+====================
+
+Measures the memory held by parsed pods: the slotted, interned PodInfo and
+ContainerInfo records against plain dataclasses with a per-instance
+__dict__, one string copy per occurrence and a formatted age string (the
+previous representation).
+Each pod is decoded from its own JSON document, as it is when listed from the
+API server, so repeated strings are separate objects unless interned.
+
+    python3 benchmarks/bench_pod_memory.py --pods 20000
+"""
+
+import argparse
+import gc
+import json
+import os
+import sys
+import tracemalloc
+from dataclasses import dataclass
+from typing import Dict, List
+
+INFRASTRUCTURE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, INFRASTRUCTURE_DIR)
+# The stub API server lives with the tests
+sys.path.insert(0, os.path.join(INFRASTRUCTURE_DIR, "tests"))
+from aks_ages import format_ages, parse_created_at
+from aks_html_dashboard import AKSDashboardGenerator
+from stub_kube_api import make_pod
+
+@dataclass
+class PlainContainerInfo:
+    name: str
+    namespace: str
+    pod_name: str
+    image: str
+    status: str
+    ready: bool
+    restart_count: int
+    ports: List[str]
+    resources: Dict[str, str]
+
+@dataclass
+class PlainPodInfo:
+    name: str
+    namespace: str
+    status: str
+    ready: str
+    containers: List[PlainContainerInfo]
+    node_name: str
+    age: str
+
+def parse_plain(generator: AKSDashboardGenerator, pod: Dict) -> PlainPodInfo:
+    """The parser before interning, building the unslotted records"""
+    statuses = pod['status'].get('containerStatuses', [])
+    ready = sum(1 for container in statuses if container.get('ready', False))
+    return PlainPodInfo(
+        name=pod['metadata']['name'],
+        namespace=pod['metadata']['namespace'],
+        status=pod['status']['phase'],
+        ready=f"{ready}/{len(statuses)}",
+        containers=[
+            PlainContainerInfo(
+                name=container['name'], namespace=pod['metadata']['namespace'], pod_name=pod['metadata']['name'],
+                image=container['image'], status=generator._container_state(container.get('state', {})),
+                ready=container['ready'], restart_count=container['restartCount'], ports=[], resources={}
+            )
+            for container in statuses
+        ],
+        node_name=pod['status'].get('hostIP', 'Unknown'),
+        age=format_ages([parse_created_at(pod['metadata']['creationTimestamp'])])[0]
+    )
+
+def retained(documents: List[str], parse) -> int:
+    """Bytes still allocated after parsing every document and dropping the decoded JSON"""
+    gc.collect()
+    tracemalloc.start()
+    pods = [parse(json.loads(document)) for document in documents]
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    assert len(pods) == len(documents)
+    return size
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pods", type=int, default=20000)
+    parser.add_argument("--containers", type=int, default=3)
+    args = parser.parse_args()
+
+    generator = AKSDashboardGenerator("sub", "tenant", "client", "secret")
+    documents = [json.dumps(make_pod(index, args.containers)) for index in range(args.pods)]
+
+    plain = retained(documents, lambda pod: parse_plain(generator, pod))
+    compact = retained(documents, generator._parse_pod)
+
+    print(f"{args.pods} pods x {args.containers} containers")
+    print(f"{'records':<10} {'MiB':>8} {'bytes/pod':>10}")
+    print(f"{'plain':<10} {plain / 2**20:>8.1f} {plain / args.pods:>10.0f}")
+    print(f"{'compact':<10} {compact / 2**20:>8.1f} {compact / args.pods:>10.0f}")
+    print(f"saved: {1 - compact / plain:.0%}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Pod Source Benchmark
+====================
+
+Compares listing pods through the pooled Kubernetes API client against
+forking kubectl, both talking to a local stub API server. The stub runs
+in this process, so its serving cost is included in both CPU figures.
+
+    python3 benchmarks/bench_pod_sources.py --pods 2000 --iterations 20
+"""
+
+import argparse
+import os
+import resource
+import shutil
+import sys
+import tempfile
+import time
+
+INFRASTRUCTURE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, INFRASTRUCTURE_DIR)
+# The stub API server lives with the tests
+sys.path.insert(0, os.path.join(INFRASTRUCTURE_DIR, "tests"))
+from aks_kube_api import KubeApiClient, KubeApiPodSource, KubectlPodSource
+from stub_kube_api import StubKubeApiServer
+
+def cpu_seconds() -> float:
+    """CPU time used by this process and its finished children"""
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return own.ru_utime + own.ru_stime + children.ru_utime + children.ru_stime
+
+def run(source, iterations: int):
+    """Time repeated pod listings and return (mean latency, CPU per call)"""
+    list(source.iter_pods())  # warm up connections and caches
+    started_wall = time.perf_counter()
+    started_cpu = cpu_seconds()
+    for _ in range(iterations):
+        for _ in source.iter_pods():
+            pass
+    wall = time.perf_counter() - started_wall
+    cpu = cpu_seconds() - started_cpu
+    return wall / iterations, cpu / iterations
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pods", type=int, default=2000)
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--api-only", action="store_true", help="only measure the API client")
+    args = parser.parse_args()
+    if not args.api_only and not shutil.which("kubectl"):
+        parser.error("kubectl not found on PATH; install it or pass --api-only")
+
+    with StubKubeApiServer(args.pods) as stub:
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".yaml", delete=False) as f:
+            f.write(stub.kubeconfig())
+            kubeconfig_path = f.name
+
+        try:
+            sources = [KubeApiPodSource(KubeApiClient.from_kubeconfig(stub.kubeconfig()))]
+            if not args.api_only:
+                sources.append(KubectlPodSource(kubeconfig_path))
+
+            print(f"{args.pods} pods, {args.iterations} iterations")
+            print(f"{'source':<10} {'latency ms':>12} {'cpu ms':>10}")
+            for source in sources:
+                latency, cpu = run(source, args.iterations)
+                print(f"{source.name:<10} {latency * 1000:>12.1f} {cpu * 1000:>10.1f}")
+                source.close()
+        finally:
+            os.unlink(kubeconfig_path)
+
+if __name__ == "__main__":
+    main()
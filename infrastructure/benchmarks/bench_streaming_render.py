@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Streaming Render Benchmark
+==========================
+
+Renders the cluster page for synthetic pods and compares building the whole
+page before compressing it with streaming the render chunks into
+CachedPage.from_chunks. Reports time to the first chunk, total time and the
+tracemalloc peak of each approach.
+
+    python3 benchmarks/bench_streaming_render.py --pods 1000 10000 50000
+"""
+
+import argparse
+import gzip
+import os
+import sys
+import time
+import tracemalloc
+
+INFRASTRUCTURE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, INFRASTRUCTURE_DIR)
+# The stub API server lives with the tests
+sys.path.insert(0, os.path.join(INFRASTRUCTURE_DIR, "tests"))
+from aks_html_dashboard import AKSDashboardGenerator, ClusterInfo
+from aks_http_cache import CachedPage
+from stub_kube_api import make_pod
+
+CLUSTER_INFO = ClusterInfo(
+    name="transact", location="westeurope", kubernetes_version="1.29.2", node_count=3,
+    vm_size="Standard_D4s_v5", power_state="Running", fqdn="transact.example.com",
+    resource_group="rg-modular-demo"
+)
+
+def measure(work):
+    """Run `work`, returning its result, elapsed seconds and peak traced bytes"""
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = work()
+    elapsed = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pods", type=int, nargs="+", default=[1000, 10000, 50000])
+    args = parser.parse_args()
+
+    generator = AKSDashboardGenerator("sub", "tenant", "client", "secret")
+    print(f"{'pods':>7} {'approach':<10} {'first ms':>9} {'total ms':>9} {'peak MiB':>9} {'page MiB':>9}")
+    for count in args.pods:
+        pods = [generator._parse_pod(make_pod(index)) for index in range(count)]
+
+        def buffered():
+            html = generator._create_html_template(CLUSTER_INFO, [], pods)
+            return gzip.compress(html.encode("utf-8"), 9), len(html)
+
+        (compressed, size), buffered_time, buffered_peak = measure(buffered)
+
+        started = time.perf_counter()
+        chunks = generator._iter_html_template(CLUSTER_INFO, [], pods)
+        first = next(chunks)
+        first_chunk_time = time.perf_counter() - started
+        chunks.close()
+
+        page, streamed_time, streamed_peak = measure(
+            lambda: CachedPage.from_chunks(generator._iter_html_template(CLUSTER_INFO, [], pods), 0)
+        )
+        assert first and page.size == size
+
+        print(f"{count:>7} {'buffered':<10} {buffered_time * 1000:>9.1f} {buffered_time * 1000:>9.1f} "
+              f"{buffered_peak / 2**20:>9.1f} {size / 2**20:>9.1f}")
+        print(f"{count:>7} {'streamed':<10} {first_chunk_time * 1000:>9.1f} {streamed_time * 1000:>9.1f} "
+              f"{streamed_peak / 2**20:>9.1f} {page.size / 2**20:>9.1f}")
+
+if __name__ == "__main__":
+    main()
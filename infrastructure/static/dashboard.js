@@ -0,0 +1,145 @@
+// Global state
+let isRefreshing = false;
+
+// Poll the status API until a snapshot newer than `generation` is available
+async function waitForSnapshot(generation) {
+    for (let attempt = 0; attempt < 6; attempt++) {
+        // Long-poll: the server answers as soon as a newer snapshot exists
+        const response = await fetch(`http://localhost:5055/api/status?since=${generation}&wait=20`);
+        if (response.ok) {
+            const status = await response.json();
+            if (status.generation > generation) return;
+        } else {
+            await new Promise(resolve => setTimeout(resolve, 2000));
+        }
+    }
+    throw new Error('Timed out waiting for refreshed data');
+}
+
+// Refresh function
+async function refreshDashboard() {
+    if (isRefreshing) return;
+
+    isRefreshing = true;
+    const refreshBtn = document.getElementById('refreshBtn');
+    const loading = document.getElementById('loading');
+    const metricsRow = document.getElementById('metrics-row');
+
+    // Update UI
+    refreshBtn.disabled = true;
+    refreshBtn.innerHTML = '<i class="fas fa-spinner fa-spin"></i> Refreshing...';
+    loading.style.display = 'block';
+    metricsRow.style.opacity = '0.5';
+
+    try {
+        // Call the Python script to refresh data
+        // Joins a refresh that is already running and waits for its result
+        const response = await fetch('http://localhost:5055/refresh-dashboard?wait=60', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json'
+            }
+        });
+
+        if (!response.ok) {
+            throw new Error('Failed to refresh data');
+        }
+
+        // 202 means the refresh is still running in the background
+        if (response.status === 202) {
+            const { generation } = await response.json();
+            await waitForSnapshot(generation);
+        }
+
+        if (window.liveUpdates) {
+            // The new snapshot is pushed over the event stream and patched in place
+            resetRefreshButton();
+            return;
+        }
+
+        // Reload the page with fresh data
+        window.location.reload();
+    } catch (error) {
+        console.error('Refresh failed:', error);
+        alert('Failed to refresh dashboard. Please try again.');
+
+        resetRefreshButton();
+    }
+}
+
+// Reset the refresh UI
+function resetRefreshButton() {
+    const refreshBtn = document.getElementById('refreshBtn');
+    refreshBtn.disabled = false;
+    refreshBtn.innerHTML = '<i class="fas fa-sync-alt"></i> Refresh Data';
+    document.getElementById('loading').style.display = 'none';
+    document.getElementById('metrics-row').style.opacity = '1';
+    isRefreshing = false;
+}
+
+// Load the pods of a namespace or node the first time it is expanded
+async function loadDetails(details) {
+    const source = details.dataset.src;
+    if (!source || details.dataset.loaded) return;
+
+    details.innerHTML = '<div class="text-muted"><i class="fas fa-spinner fa-spin"></i> Loading pods...</div>';
+    try {
+        const response = await fetch(source);
+        if (!response.ok) {
+            throw new Error(`Failed to load pods (${response.status})`);
+        }
+        details.innerHTML = await response.text();
+        details.dataset.loaded = 'true';
+    } catch (error) {
+        console.error('Loading pods failed:', error);
+        details.innerHTML = '<div class="text-danger">Failed to load pods. Collapse and expand to retry.</div>';
+    }
+}
+
+// Toggle the pod list of a node
+function toggleNodePods(box) {
+    const content = box.querySelector('.node-content');
+    const toggleBtn = box.querySelector('.toggle-btn');
+
+    if (content.style.display === 'block') {
+        content.style.display = 'none';
+        toggleBtn.innerHTML = '<i class="fas fa-chevron-down"></i> Show Pods';
+    } else {
+        content.style.display = 'block';
+        toggleBtn.innerHTML = '<i class="fas fa-chevron-up"></i> Hide Pods';
+        loadDetails(content);
+    }
+}
+
+// Toggle namespace details
+function toggleNamespace(namespaceId) {
+    const summary = document.getElementById(`summary-${namespaceId}`);
+    const details = document.getElementById(`details-${namespaceId}`);
+    const toggleBtn = document.getElementById(`toggle-${namespaceId}`);
+
+    if (summary.classList.contains('show')) {
+        // Hide everything
+        summary.classList.remove('show');
+        details.style.display = 'none';
+        toggleBtn.innerHTML = '<i class="fas fa-chevron-down"></i> Show Details';
+    } else {
+        // Show everything
+        summary.classList.add('show');
+        details.style.display = 'block';
+        toggleBtn.innerHTML = '<i class="fas fa-chevron-up"></i> Hide Details';
+        loadDetails(details);
+    }
+}
+
+// Auto-refresh every 5 minutes, unless updates are pushed over the event stream
+setInterval(() => {
+    if (!isRefreshing && !window.liveUpdates) {
+        console.log('Auto-refresh triggered');
+        refreshDashboard();
+    }
+}, 300000);
+
+// Initialize tooltips
+document.addEventListener('DOMContentLoaded', function() {
+    // Add any initialization code here
+});
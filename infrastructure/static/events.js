@@ -0,0 +1,161 @@
+// Live updates pushed by the server over Server-Sent Events.
+// Each event is the delta of a new snapshot, which is patched into the page in place.
+// Deltas the page can't patch (new namespaces or nodes, large changes) reload it instead.
+// Pod lists are loaded on demand, so changed pods only reload the lists that are shown.
+
+window.liveUpdates = false;
+
+function byData(selector, attribute, value) {
+    return document.querySelector(`${selector}[data-${attribute}="${CSS.escape(value)}"]`);
+}
+
+function setStat(root, stat, value) {
+    root.querySelectorAll(`[data-stat="${stat}"]`).forEach(element => { element.textContent = value; });
+}
+
+function nodeLabel(node) {
+    return node === 'Unknown' ? 'Unknown Node' : node;
+}
+
+function isHealthy(counts) {
+    return counts.ready_containers === counts.containers && counts.containers > 0;
+}
+
+// Loaded pods of a namespace or node are out of date; load them again if they are shown
+function invalidateDetails(details) {
+    if (details && details.dataset.loaded) {
+        delete details.dataset.loaded;
+        if (details.style.display === 'block') loadDetails(details);
+    }
+}
+
+function patchPods(pods) {
+    const changed = [...pods.added, ...pods.removed, ...pods.changed];
+    const nodes = new Set(changed.map(pod => nodeLabel(pod.node)));
+    // A changed pod may have moved off the node it is listed under
+    for (const pod of [...pods.removed, ...pods.changed]) {
+        const item = byData('.pod-item', 'pod', `${pod.namespace}/${pod.name}`);
+        const box = item && item.closest('.node-box');
+        if (box) nodes.add(box.dataset.node);
+    }
+    for (const node of nodes) {
+        invalidateDetails(byData('.node-content', 'node', node));
+    }
+    for (const namespace of new Set(changed.map(pod => pod.namespace))) {
+        invalidateDetails(byData('[id^="details-"]', 'namespace', namespace));
+    }
+}
+
+function patchCluster(delta) {
+    const { state, counters, pods } = delta;
+    const layoutChanged =
+        Object.entries(counters.namespaces).some(([name, counts]) =>
+            !counts || !byData('.container-type-header', 'namespace', name)) ||
+        Object.entries(counters.nodes).some(([node, counts]) =>
+            !counts || !byData('.node-box', 'node', nodeLabel(node)));
+    if (delta.truncated || layoutChanged) return false;
+
+    document.getElementById('metric-nodes').textContent = state.nodes;
+    document.getElementById('metric-pods').textContent = counters.totals.pods;
+    document.getElementById('metric-containers').textContent = counters.totals.containers;
+    const badge = document.querySelector('#metric-power-state .status-badge');
+    badge.textContent = state.power_state || 'Unavailable';
+    badge.className = `status-badge status-${(state.power_state || 'unknown').toLowerCase()}`;
+
+    for (const [name, counts] of Object.entries(counters.namespaces)) {
+        const header = byData('.container-type-header', 'namespace', name);
+        const summary = byData('.namespace-summary', 'namespace', name);
+        for (const root of [header, summary]) {
+            for (const stat of ['pods', 'running_pods', 'containers', 'ready_containers']) {
+                setStat(root, stat, counts[stat]);
+            }
+        }
+        setStat(summary, 'unhealthy_pods', counts.pods - counts.running_pods);
+        const healthy = isHealthy(counts);
+        header.querySelector('[data-stat="health"]').className =
+            `status-indicator ${healthy ? 'status-all-healthy' : 'status-has-issues'}`;
+        header.querySelector('[data-stat="health-icon"]').className =
+            healthy ? 'fas fa-check-circle' : 'fas fa-exclamation-triangle';
+    }
+
+    for (const [node, counts] of Object.entries(counters.nodes)) {
+        const box = byData('.node-box', 'node', nodeLabel(node));
+        const statusClass = isHealthy(counts) ? 'node-healthy' : 'node-unhealthy';
+        setStat(box, 'pods', counts.pods);
+        setStat(box, 'containers', counts.containers);
+        box.className = `node-box ${statusClass}`;
+        box.querySelector('[data-stat="health"]').className = `health-indicator ${statusClass}`;
+    }
+
+    patchPods(pods);
+    return true;
+}
+
+function patchFleetRow(key, delta) {
+    const row = byData('tr', 'cluster', key);
+    if (!row) return false;
+    const { state, counters } = delta;
+
+    row.querySelector('[data-field="nodes"]').textContent = state.power_state ? state.nodes : '-';
+    row.querySelector('[data-field="pods"]').textContent = counters.totals.pods || 0;
+    row.querySelector('[data-field="resources"]').textContent = state.resources;
+    row.dataset.containers = counters.totals.containers || 0;
+    row.dataset.healthy = state.power_state && !state.error ? 'true' : 'false';
+
+    const status = row.querySelector('[data-field="status"]');
+    const badge = document.createElement('span');
+    badge.className = `badge ${state.power_state ? 'bg-success' : 'bg-danger'}`;
+    badge.textContent = state.power_state || 'Unavailable';
+    status.replaceChildren(badge);
+    if (state.error) {
+        const error = document.createElement('small');
+        error.className = 'text-danger';
+        error.textContent = state.error;
+        status.append(' ', error);
+    }
+    return true;
+}
+
+function patchFleet(delta) {
+    for (const [key, clusterDelta] of Object.entries(delta.clusters)) {
+        if (!patchFleetRow(key, clusterDelta)) return false;
+    }
+    const rows = [...document.querySelectorAll('tr[data-cluster]')];
+    const sum = field => rows.reduce((total, row) => total + Number(row.dataset[field] ?? row.querySelector(`[data-field="${field}"]`).textContent), 0);
+    document.getElementById('metric-clusters').textContent =
+        `${rows.filter(row => row.dataset.healthy === 'true').length}/${rows.length}`;
+    document.getElementById('metric-pods').textContent = sum('pods');
+    document.getElementById('metric-containers').textContent = sum('containers');
+    return true;
+}
+
+function applyDelta(delta) {
+    const cluster = document.body.dataset.cluster;
+    if (!cluster) return patchFleet(delta);
+    const clusterDelta = delta.clusters[cluster];
+    return !clusterDelta || patchCluster(clusterDelta);
+}
+
+function connectEvents() {
+    const generation = document.body.dataset.generation;
+    if (!generation || !window.EventSource) return;
+
+    // EventSource reconnects by itself and resumes with the Last-Event-ID header
+    const source = new EventSource(`/events?since=${generation}`);
+    source.onopen = () => { window.liveUpdates = true; };
+    source.onerror = () => { window.liveUpdates = false; };
+    source.addEventListener('snapshot', event => {
+        const delta = JSON.parse(event.data);
+        if (!applyDelta(delta)) {
+            window.location.reload();
+            return;
+        }
+        document.body.dataset.generation = delta.generation;
+        const lastUpdated = document.getElementById('lastUpdated');
+        if (lastUpdated) lastUpdated.textContent = new Date(delta.collected_at * 1000).toLocaleString();
+    });
+    // Sent when the updates since this page was rendered are no longer available
+    source.addEventListener('reset', () => window.location.reload());
+}
+
+document.addEventListener('DOMContentLoaded', connectEvents);
@@ -0,0 +1,25 @@
+import os
+import sys
+
+import pytest
+
+# Infrastructure scripts are run from their own folder and import each other directly
+INFRASTRUCTURE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, INFRASTRUCTURE_DIR)
+
+from aks_html_dashboard import AKSDashboardGenerator  # noqa: E402
+from stub_kube_api import make_pod  # noqa: E402
+
+
+@pytest.fixture
+def generator():
+    """Generator with placeholder credentials; the tests never reach Azure"""
+    return AKSDashboardGenerator("sub", "tenant", "client", "secret")
+
+
+@pytest.fixture
+def make_pods(generator):
+    """Parse the stub API server's synthetic pods: make_pods(count, containers=2)"""
+    def make(count, containers=2):
+        return [generator._parse_pod(make_pod(i, containers)) for i in range(count)]
+    return make
@@ -0,0 +1,31 @@
+"""Builders of the clusters and snapshots shared by the test modules"""
+
+from aks_html_dashboard import ClusterInfo, ClusterTarget
+from aks_pod_index import PodIndex
+from aks_snapshot import ClusterSnapshot, DashboardSnapshot
+
+TARGET = ClusterTarget(name="transact", resource_group="rg-modular-demo", subscription_id="sub")
+
+
+def make_cluster_info():
+    return ClusterInfo(
+        name="transact",
+        location="westeurope",
+        kubernetes_version="1.29.0",
+        node_count=3,
+        vm_size="Standard_D4s_v3",
+        power_state="Running",
+        fqdn="transact.example.azmk8s.io",
+        resource_group="rg-modular-demo"
+    )
+
+
+def make_targets(count):
+    return [ClusterTarget(f"cluster-{i}", f"rg-{i}", "sub") for i in range(count)]
+
+
+def make_snapshot(generation, pods, collected_at, error=None):
+    cluster = ClusterSnapshot(target=TARGET, collected_at=collected_at, cluster_info=make_cluster_info(),
+                              resources=(), kubernetes_pods=tuple(pods), error=error,
+                              pod_index=PodIndex(pods))
+    return DashboardSnapshot(generation=generation, collected_at=collected_at, clusters=(cluster,))
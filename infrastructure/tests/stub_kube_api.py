@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Stub Kubernetes API Server
+==========================
+
+Local HTTP server that answers pod listings with synthetic pods, used by
+the benchmarks and tests instead of a real AKS cluster.
+"""
+
+import gzip
+import json
+import queue
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List
+from urllib.parse import parse_qs, urlparse
+
+STUB_TOKEN = "stub-token"
+
+# Discovery documents of a server that only has the core v1 pods resource
+DISCOVERY = {
+    "/api": {
+        "kind": "APIVersions",
+        "versions": ["v1"],
+        "serverAddressByClientCIDRs": [{"clientCIDR": "0.0.0.0/0", "serverAddress": "127.0.0.1"}],
+    },
+    "/apis": {"kind": "APIGroupList", "apiVersion": "v1", "groups": []},
+    "/api/v1": {
+        "kind": "APIResourceList",
+        "groupVersion": "v1",
+        "resources": [{
+            "name": "pods", "singularName": "pod", "namespaced": True, "kind": "Pod",
+            "verbs": ["get", "list", "watch"], "shortNames": ["po"], "categories": ["all"],
+        }],
+    },
+}
+
+def make_pod(index: int, containers: int = 2) -> Dict[str, Any]:
+    """Build a synthetic pod object shaped like the Kubernetes API output"""
+    namespace = f"namespace-{index % 20}"
+    name = f"service-{index % 500}-{index:06d}"
+    return {
+        "metadata": {
+            "name": name,
+            "namespace": namespace,
+            "uid": f"uid-{index}",
+            "resourceVersion": str(1000 + index),
+            "creationTimestamp": "2024-01-01T00:00:00Z",
+            "labels": {"app": f"service-{index % 500}"},
+            "annotations": {"kubectl.kubernetes.io/restartedAt": "2024-01-01T00:00:00Z"},
+            "managedFields": [{"manager": "kube-controller-manager", "operation": "Update"}],
+        },
+        "spec": {
+            "nodeName": f"aks-nodepool1-{index % 8:02d}",
+            "containers": [
+                {"name": f"container-{c}", "image": f"registry.example.com/service:{c}"}
+                for c in range(containers)
+            ],
+        },
+        "status": {
+            "phase": "Running" if index % 17 else "Pending",
+            "hostIP": f"10.0.0.{index % 8}",
+            "containerStatuses": [
+                {
+                    "name": f"container-{c}",
+                    "image": f"registry.example.com/service:{c}",
+                    "state": {"running": {"startedAt": "2024-01-01T00:00:00Z"}},
+                    "ready": bool(index % 17),
+                    "restartCount": index % 3,
+                }
+                for c in range(containers)
+            ],
+        },
+    }
+
+def make_pod_list(count: int) -> Dict[str, Any]:
+    """Build a synthetic PodList document"""
+    return {
+        "kind": "PodList",
+        "apiVersion": "v1",
+        "metadata": {"resourceVersion": str(1000 + count)},
+        "items": [make_pod(i) for i in range(count)],
+    }
+
+def render_projected_pods(pod_list: Dict[str, Any]) -> str:
+    """Render a PodList the way kubectl prints PROJECTED_POD_TEMPLATE"""
+    lines = []
+    for pod in pod_list["items"]:
+        metadata, status = pod["metadata"], pod["status"]
+        containers = ""
+        for c in status.get("containerStatuses", []):
+            state = c.get("state", {})
+            containers += "|".join([
+                c["name"], c["image"], "true" if c["ready"] else "false", str(c["restartCount"]),
+                state.get("running", {}).get("startedAt", ""),
+                state.get("waiting", {}).get("reason", ""),
+                state.get("terminated", {}).get("reason", ""),
+            ]) + ";"
+        lines.append("\t".join([
+            metadata["namespace"], metadata["name"], status["phase"],
+            status.get("hostIP", ""), metadata["creationTimestamp"], containers,
+        ]))
+    return "\n".join(lines) + "\n"
+
+class StubKubeApiServer:
+    """Threaded stub API server serving a fixed set of pods"""
+
+    def __init__(self, pod_count: int = 100):
+        self.pod_list = make_pod_list(pod_count)
+        self.requests: List[str] = []
+        # Watch events to stream; put None to end the current watch
+        self.watch_events: "queue.Queue[Dict[str, Any]]" = queue.Queue()
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.httpd.server_address[1]}"
+
+    def kubeconfig(self) -> str:
+        """Kubeconfig document pointing at the stub server"""
+        return (
+            "apiVersion: v1\n"
+            "kind: Config\n"
+            "clusters:\n"
+            f"- name: stub\n  cluster:\n    server: {self.url}\n"
+            "contexts:\n"
+            "- name: stub\n  context:\n    cluster: stub\n    user: stub\n"
+            "current-context: stub\n"
+            "users:\n"
+            f"- name: stub\n  user:\n    token: {STUB_TOKEN}\n"
+        )
+
+    def handle_get(self, handler: BaseHTTPRequestHandler):
+        """Answer one GET request"""
+        url = urlparse(handler.path)
+        query = parse_qs(url.query)
+        if url.path == "/api/v1/pods" and query.get("watch") == ["true"]:
+            self.stream_watch(handler)
+        elif url.path == "/api/v1/pods":
+            self.send_json(handler, 200, self.pod_page(query))
+        elif url.path in DISCOVERY:
+            # Legacy discovery that kubectl reads before it runs `get pods`
+            self.send_json(handler, 200, DISCOVERY[url.path])
+        else:
+            self.send_json(handler, 404, {"kind": "Status", "message": "not found"})
+
+    def pod_page(self, query: Dict[str, List[str]]) -> Dict[str, Any]:
+        """Answer a LIST, honouring limit/continue pagination"""
+        if "limit" not in query:
+            return self.pod_list
+        start = int(query.get("continue", ["0"])[0])
+        end = start + int(query["limit"][0])
+        items = self.pod_list["items"]
+        metadata = {"resourceVersion": self.pod_list["metadata"]["resourceVersion"]}
+        if end < len(items):
+            metadata["continue"] = str(end)
+        return dict(self.pod_list, metadata=metadata, items=items[start:end])
+
+    def stream_watch(self, handler: BaseHTTPRequestHandler):
+        """Stream queued watch events as newline-delimited JSON chunks"""
+        handler.send_response(200)
+        handler.send_header("Content-Type", "application/json")
+        handler.send_header("Transfer-Encoding", "chunked")
+        handler.end_headers()
+        while True:
+            event = self.watch_events.get()
+            if event is None:
+                break
+            line = json.dumps(event).encode("utf-8") + b"\n"
+            handler.wfile.write(f"{len(line):x}\r\n".encode("ascii") + line + b"\r\n")
+            handler.wfile.flush()
+        handler.wfile.write(b"0\r\n\r\n")
+
+    @staticmethod
+    def send_json(handler: BaseHTTPRequestHandler, status: int, document: Dict[str, Any]):
+        body = json.dumps(document).encode("utf-8")
+        # Like the API server (gzip level 1), compress for clients that accept gzip
+        compress = "gzip" in handler.headers.get("Accept-Encoding", "")
+        if compress:
+            body = gzip.compress(body, compresslevel=1)
+        handler.send_response(status)
+        handler.send_header("Content-Type", "application/json")
+        if compress:
+            handler.send_header("Content-Encoding", "gzip")
+        handler.send_header("Content-Length", str(len(body)))
+        handler.end_headers()
+        handler.wfile.write(body)
+
+    def _handler_class(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                stub.requests.append(self.path)
+                if self.headers.get("Authorization") != f"Bearer {STUB_TOKEN}":
+                    stub.send_json(self, 401, {"kind": "Status", "message": "Unauthorized"})
+                    return
+                stub.handle_get(self)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def __enter__(self) -> "StubKubeApiServer":
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.watch_events.put(None)
+        self.httpd.shutdown()
+        self.httpd.server_close()
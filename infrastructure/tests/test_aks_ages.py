@@ -0,0 +1,51 @@
+import math
+
+import pytest
+
+from aks_ages import UNKNOWN_AGE, age_seconds, format_ages, parse_age, parse_created_at, select_by_age
+
+
+NOW = 1_700_000_000
+
+
+def test_created_at_is_parsed_to_epoch_seconds():
+    assert parse_created_at("2023-11-14T22:13:20Z") == NOW
+    assert parse_created_at(None) is None
+    assert parse_created_at("yesterday") is None
+
+
+def test_ages_use_the_largest_unit():
+    created_at = [NOW - 42, NOW - 60, NOW - 61, NOW - 3600, NOW - 3601, NOW - 86399, NOW - 86400, NOW - 9 * 86400]
+    assert format_ages(created_at, NOW) == ["42s", "60s", "1m", "60m", "1h", "23h", "1d", "9d"]
+
+
+def test_unknown_and_future_creation_times():
+    assert format_ages([None, NOW + 30], NOW) == [UNKNOWN_AGE, "0s"]
+    seconds = age_seconds([None, NOW + 30, NOW - 5], NOW)
+    assert math.isnan(seconds[0])
+    assert seconds[1:].tolist() == [0, 5]
+
+
+def test_select_by_age():
+    seconds = age_seconds([NOW - 30, None, NOW - 7200, NOW - 600, NOW - 600], NOW)
+    assert select_by_age(seconds) == [0, 1, 2, 3, 4]
+    assert select_by_age(seconds, min_age=60) == [2, 3, 4]
+    assert select_by_age(seconds, max_age=600) == [0, 3, 4]
+    assert select_by_age(seconds, sort="age") == [0, 3, 4, 2, 1]
+    assert select_by_age(seconds, sort="-age") == [2, 3, 4, 0, 1]
+
+def test_batch_matches_one_at_a_time():
+    created_at = [NOW - offset for offset in range(0, 3 * 86400, 997)] + [None]
+    assert format_ages(created_at, NOW) == [format_ages([value], NOW)[0] for value in created_at]
+    assert format_ages([], NOW) == []
+
+
+@pytest.mark.parametrize("text, seconds", [("2d", 172800), ("6h", 21600), ("15m", 900), ("30s", 30), ("90", 90)])
+def test_parse_age(text, seconds):
+    assert parse_age(text) == seconds
+
+
+@pytest.mark.parametrize("text", ["", "d", "-1d", "2w", "1.5h"])
+def test_parse_age_rejects_invalid(text):
+    with pytest.raises(ValueError):
+        parse_age(text)
@@ -0,0 +1,52 @@
+import random
+
+from aks_aggregates import PodAggregates
+from aks_pod_informer import PodInformer
+from stub_kube_api import make_pod
+
+
+def make_informer(generator):
+    return PodInformer(lambda: None, generator._parse_pod)
+
+
+def test_counts_per_namespace_and_node(make_pods):
+    pods = make_pods(40)
+    aggregates = PodAggregates(pods).to_dict()
+
+    assert aggregates["totals"] == {
+        "pods": 40, "running_pods": 37, "containers": 80, "ready_containers": 74,
+        "restarts": 2 * sum(i % 3 for i in range(40))
+    }
+    assert sum(c["pods"] for c in aggregates["namespaces"].values()) == 40
+    assert aggregates["namespaces"]["namespace-0"]["pods"] == 2
+    assert len(aggregates["nodes"]) == 8
+
+
+def test_watch_events_keep_aggregates_in_step_with_index(generator):
+    informer = make_informer(generator)
+    rng = random.Random(7)
+    live = {}
+    for step in range(500):
+        index = rng.randrange(60)
+        if index in live and rng.random() < 0.3:
+            informer.apply_event({"type": "DELETED", "object": live.pop(index)})
+            continue
+        pod = make_pod(index)
+        pod["status"]["phase"] = rng.choice(["Running", "Pending", "Failed"])
+        for status in pod["status"]["containerStatuses"]:
+            status["ready"] = rng.random() < 0.5
+            status["restartCount"] = rng.randrange(10)
+        informer.apply_event({"type": "MODIFIED" if index in live else "ADDED", "object": pod})
+        live[index] = pod
+
+    assert informer.aggregates() == PodAggregates(informer.pods()).to_dict()
+    assert informer.aggregates()["totals"]["pods"] == len(live)
+
+
+def test_empty_groups_are_dropped(generator):
+    informer = make_informer(generator)
+    pod = make_pod(3)
+    informer.apply_event({"type": "ADDED", "object": pod})
+    informer.apply_event({"type": "DELETED", "object": pod})
+    assert informer.aggregates() == PodAggregates().to_dict()
+    assert informer.aggregates()["namespaces"] == {}
@@ -0,0 +1,88 @@
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+
+from aks_async_collector import AsyncFleetCollector
+from aks_html_dashboard import ClusterTarget
+
+
+class FakeManagedClusters:
+    def __init__(self, delays, threads):
+        self.delays = delays
+        self.threads = threads
+
+    async def get(self, resource_group, cluster_name):
+        self.threads.add(threading.current_thread().name)
+        await asyncio.sleep(self.delays.get(cluster_name, 0.2))
+        if cluster_name == "broken":
+            raise RuntimeError("ResourceNotFound")
+        return SimpleNamespace(
+            name=cluster_name, location="westeurope", kubernetes_version="1.29.0",
+            agent_pool_profiles=[SimpleNamespace(count=3, vm_size="Standard_D4s_v3")],
+            power_state=SimpleNamespace(code="Running"), fqdn=f"{cluster_name}.example"
+        )
+
+
+class FakeResources:
+    def list_by_resource_group(self, resource_group):
+        async def pages():
+            for i in range(3):
+                await asyncio.sleep(0.05)
+                yield SimpleNamespace(name=f"{resource_group}-{i}", type="Microsoft.Compute/disks",
+                                      location="westeurope", tags=None)
+        return pages()
+
+
+class FakeAsyncFleetCollector(AsyncFleetCollector):
+    def __init__(self, targets, delays=None, **kwargs):
+        super().__init__(targets, "tenant", "client", "secret", pods_for=lambda target: [], **kwargs)
+        self.threads = set()
+        self.fake_container_client = SimpleNamespace(managed_clusters=FakeManagedClusters(delays or {}, self.threads))
+        self.fake_resource_client = SimpleNamespace(resources=FakeResources())
+
+    async def _container_client(self, subscription_id):
+        return self.fake_container_client
+
+    async def _resource_client(self, subscription_id):
+        return self.fake_resource_client
+
+
+def make_targets(names):
+    return [ClusterTarget(name, f"rg-{name}", f"sub-{i % 3}") for i, name in enumerate(names)]
+
+
+def test_many_clusters_share_one_event_loop():
+    targets = make_targets([f"cluster-{i}" for i in range(30)])
+    collector = FakeAsyncFleetCollector(targets)
+    try:
+        started = time.perf_counter()
+        collections = collector.collect()
+        elapsed = time.perf_counter() - started
+    finally:
+        collector.shutdown()
+
+    assert list(collections) == [target.key for target in targets]
+    assert all(c.error is None for c in collections.values())
+    assert collections[targets[0].key].result.cluster_info.node_count == 3
+    assert len(collections[targets[0].key].result.resources) == 3
+    assert collector.threads == {"async-collector"}
+    # 30 clusters at 0.2s each, collected concurrently
+    assert elapsed < 1.5
+
+
+def test_failures_and_deadlines_are_per_cluster():
+    targets = make_targets(["healthy", "broken", "slow"])
+    collector = FakeAsyncFleetCollector(
+        targets, delays={"slow": 2.0}, deadlines={"cluster_info": 0.5}
+    )
+    try:
+        collections = collector.collect()
+    finally:
+        collector.shutdown()
+
+    assert collections[targets[0].key].error is None
+    assert collections[targets[1].key].error == "ResourceNotFound"
+    slow = collections[targets[2].key]
+    assert "Timed out" in slow.error
+    assert len(slow.result.resources) == 3
@@ -0,0 +1,61 @@
+import time
+
+from aks_collector import DashboardCollector
+from aks_html_dashboard import AKSDashboardGenerator
+from factories import make_cluster_info
+
+
+class SlowGenerator(AKSDashboardGenerator):
+    def __init__(self, delays):
+        super().__init__("sub", "tenant", "client", "secret")
+        self.delays = delays
+
+    def get_aks_cluster_info(self, resource_group, cluster_name):
+        time.sleep(self.delays["cluster_info"])
+        return make_cluster_info()
+
+    def get_resource_group_resources(self, resource_group, strict=False):
+        time.sleep(self.delays["resources"])
+        return []
+
+    def get_kubernetes_containers(self, resource_group, cluster_name, strict=False):
+        time.sleep(self.delays["kubernetes_pods"])
+        return self._get_mock_kubernetes_data()
+
+
+def test_sources_run_concurrently():
+    generator = SlowGenerator({"cluster_info": 0.3, "resources": 0.3, "kubernetes_pods": 0.4})
+    result = DashboardCollector(generator).collect("rg-modular-demo", "transact")
+
+    assert result.cluster_info.name == "transact"
+    assert len(result.kubernetes_pods) == 6
+    assert result.errors == {}
+    assert set(result.timings) == {"cluster_info", "resources", "kubernetes_pods"}
+    # Close to the slowest source rather than the 1.0s sum
+    assert result.elapsed < 0.8
+
+
+def test_source_past_deadline_is_reported_and_defaulted():
+    generator = SlowGenerator({"cluster_info": 0.0, "resources": 0.0, "kubernetes_pods": 2.0})
+    collector = DashboardCollector(generator, deadlines={"kubernetes_pods": 0.2})
+    result = collector.collect("rg-modular-demo", "transact")
+
+    assert result.cluster_info is not None
+    assert result.kubernetes_pods == []
+    assert "kubernetes_pods" in result.errors
+    assert result.elapsed < 1.0
+
+
+def test_failing_sources_are_reported_instead_of_defaulted(generator):
+    def unreachable(*args):
+        raise ConnectionError("Connection refused")
+
+    generator.get_aks_cluster_info = lambda resource_group, cluster_name: make_cluster_info()
+    generator._get_resource_client = unreachable
+    generator._get_pod_source = unreachable
+    result = DashboardCollector(generator).collect("rg-modular-demo", "transact")
+
+    assert result.errors == {"resources": "Connection refused", "kubernetes_pods": "Connection refused"}
+    assert result.resources == [] and result.kubernetes_pods == []
+    # The standalone dashboard still falls back to demo data
+    assert len(generator.get_kubernetes_containers("rg-modular-demo", "transact")) == 6
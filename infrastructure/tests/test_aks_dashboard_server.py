@@ -0,0 +1,219 @@
+import importlib.util
+import os
+import time
+from dataclasses import replace
+
+import pytest
+
+from aks_collector import CollectionResult, DashboardCollector
+from aks_fleet import FleetCollector
+from aks_snapshot import SnapshotRefresher
+from aks_snapshot_store import SnapshotStore
+from stub_kube_api import make_pod
+from factories import make_cluster_info, make_targets
+
+SERVER_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "aks-dashboard-server.py")
+
+
+class ScriptedCollector:
+    """Returns the queued results in order, repeating the last one"""
+
+    def __init__(self, results):
+        self.results = list(results)
+
+    def collect(self, resource_group, cluster_name):
+        return self.results.pop(0) if len(self.results) > 1 else self.results[0]
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch, generator):
+    # The server script writes its files to the working directory
+    monkeypatch.chdir(tmp_path)
+    spec = importlib.util.spec_from_file_location("aks_dashboard_server", SERVER_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    module.dashboard_generators["sub"] = generator
+    return module
+
+
+def start(server, results, count=1):
+    """Collect scripted results: one list for every cluster, or a list per cluster name"""
+    if isinstance(results, dict):
+        collectors = {name: ScriptedCollector(cluster_results) for name, cluster_results in results.items()}
+    else:
+        collectors = dict.fromkeys([target.name for target in make_targets(count)], ScriptedCollector(results))
+    server.fleet_collector = FleetCollector(make_targets(count), lambda target: collectors[target.name])
+    server.snapshot_refresher = SnapshotRefresher(server.collect_snapshot, min_interval=0)
+    return server.app.test_client()
+
+
+def test_failed_source_keeps_previous_data_and_marks_cluster_stale(server, make_pods):
+    pods = make_pods(20)
+    client = start(server, [
+        CollectionResult(cluster_info=make_cluster_info(), resources=[], kubernetes_pods=pods),
+        CollectionResult(cluster_info=make_cluster_info(), resources=[], kubernetes_pods=[],
+                         errors={"kubernetes_pods": "Timed out after 45s"}),
+    ])
+    server.snapshot_refresher.refresh_now()
+    server.snapshot_refresher.refresh_now()
+
+    cluster = server.snapshot_refresher.current().clusters[0]
+    assert cluster.kubernetes_pods == tuple(pods)
+    assert cluster.source_errors == {"kubernetes_pods": "Timed out after 45s"}
+    assert cluster.stale and cluster.error is None
+
+    status = client.get("/api/status").get_json()["clusters"][0]
+    assert status["stale"] is True
+    assert status["source_errors"] == {"kubernetes_pods": "Timed out after 45s"}
+    assert status["aggregates"]["totals"]["pods"] == 20
+
+
+class ListPodSource:
+    def __init__(self, pods):
+        self.pods = pods
+
+    def iter_pods(self):
+        return iter(self.pods)
+
+
+def test_raising_source_keeps_previous_data_instead_of_demo_pods(server, generator):
+    def unreachable(*args):
+        raise ConnectionError("Connection refused")
+
+    # The first collection lists real pods; the second finds no kubeconfig
+    sources = [ListPodSource([make_pod(i) for i in range(10)]), None]
+    generator.get_aks_cluster_info = lambda resource_group, cluster_name: make_cluster_info()
+    generator._get_resource_client = unreachable
+    generator._get_pod_source = lambda resource_group, cluster_name: sources.pop(0)
+    server.fleet_collector = FleetCollector(make_targets(1), lambda target: DashboardCollector(generator))
+    server.snapshot_refresher = SnapshotRefresher(server.collect_snapshot, min_interval=0)
+    first = server.snapshot_refresher.refresh_now()
+    second = server.snapshot_refresher.refresh_now()
+
+    cluster = second.clusters[0]
+    assert cluster.kubernetes_pods == first.clusters[0].kubernetes_pods
+    assert len(cluster.kubernetes_pods) == 10
+    assert cluster.source_errors == {"resources": "Connection refused",
+                                     "kubernetes_pods": "No kubeconfig available"}
+    assert cluster.stale
+
+
+def test_failed_cluster_page_carries_the_new_generation(server, make_pods):
+    client = start(server, [
+        CollectionResult(cluster_info=make_cluster_info(), resources=[], kubernetes_pods=make_pods(5)),
+        CollectionResult(cluster_info=None, resources=[], kubernetes_pods=[]),
+    ])
+    server.snapshot_refresher.refresh_now()
+    snapshot = server.snapshot_refresher.refresh_now()
+    assert snapshot.clusters[0].error and snapshot.clusters[0].stale
+
+    response = client.get("/")
+    assert response.headers["X-Snapshot-Generation"] == str(snapshot.generation)
+    assert f'data-generation="{snapshot.generation}"' in response.get_data(as_text=True)
+
+
+def test_cluster_page_subscribes_with_the_configured_key(server, make_pods):
+    target = replace(make_targets(1)[0], resource_group="RG-0")
+    collector = ScriptedCollector([
+        CollectionResult(cluster_info=replace(make_cluster_info(), resource_group="rg-0", name="cluster-0"),
+                         resources=[], kubernetes_pods=make_pods(5))
+    ])
+    server.fleet_collector = FleetCollector([target], lambda _: collector)
+    server.snapshot_refresher = SnapshotRefresher(server.collect_snapshot, min_interval=0)
+    server.snapshot_refresher.refresh_now()
+
+    # Deltas are keyed by the configured target, not Azure's spelling of the resource group
+    page = server.app.test_client().get("/cluster/RG-0/cluster-0").get_data(as_text=True)
+    assert 'data-cluster="RG-0/cluster-0"' in page
+
+
+def test_node_pods_are_served_as_a_fragment(server, make_pods):
+    pods = make_pods(12)
+    client = start(server, [CollectionResult(cluster_info=make_cluster_info(), resources=[], kubernetes_pods=pods)])
+    snapshot = server.snapshot_refresher.refresh_now()
+    node = pods[0].node_name
+
+    page = client.get("/").get_data(as_text=True)
+    assert "pod-item" not in page
+    assert f'data-src="/cluster/rg-0/cluster-0/fragment/node/{node}"' in page
+
+    fragment = client.get(f"/cluster/rg-0/cluster-0/fragment/node/{node}")
+    assert fragment.status_code == 200
+    assert fragment.headers["X-Snapshot-Generation"] == str(snapshot.generation)
+    on_node = [pod for pod in pods if pod.node_name == node]
+    assert fragment.get_data(as_text=True).count('class="pod-item"') == len(on_node)
+    assert client.get("/cluster/rg-0/cluster-0/fragment/node/missing").status_code == 404
+
+
+def test_api_pods_filters_and_sorts_by_age(server, make_pods):
+    now = time.time()
+    ages = [30, 7200, 3 * 86400, None, 600, 2 * 86400]
+    pods = [replace(pod, namespace="web" if i % 2 == 0 else "jobs",
+                    created_at=None if age is None else int(now - age))
+            for i, (pod, age) in enumerate(zip(make_pods(len(ages)), ages))]
+    client = start(server, [CollectionResult(cluster_info=make_cluster_info(), resources=[], kubernetes_pods=pods)])
+    server.snapshot_refresher.refresh_now()
+
+    oldest = client.get("/api/pods?min_age=1h&sort=-age").get_json()
+    # The pod without a creation time is left out once a bound is given
+    assert oldest["count"] == 3
+    assert [pod["name"] for pod in oldest["pods"]] == [pods[2].name, pods[5].name, pods[1].name]
+    assert oldest["pods"][0]["age"] == "3d"
+
+    youngest = client.get("/api/pods?namespace=web&sort=age").get_json()
+    assert [pod["name"] for pod in youngest["pods"]] == [pods[0].name, pods[4].name, pods[2].name]
+
+    unknown_last = client.get("/api/pods?namespace=jobs&sort=age&limit=5").get_json()["pods"]
+    assert [pod["name"] for pod in unknown_last] == [pods[1].name, pods[5].name, pods[3].name]
+    assert unknown_last[-1]["age_seconds"] is None
+
+    limited = client.get("/api/pods?max_age=1d&sort=name&limit=1").get_json()
+    assert limited["count"] == 3 and len(limited["pods"]) == 1
+
+    assert client.get("/api/pods?min_age=soon").status_code == 400
+    assert client.get("/api/pods?sort=size").status_code == 400
+    assert client.get("/api/pods?cluster=rg-9/cluster-9").status_code == 404
+
+
+def test_namespace_fragment_of_unknown_namespace_is_not_found(server, make_pods):
+    pods = make_pods(6)
+    client = start(server, [CollectionResult(cluster_info=make_cluster_info(), resources=[], kubernetes_pods=pods)])
+    assert client.get(f"/cluster/rg-0/cluster-0/fragment/namespace/{pods[0].namespace}").status_code == 503
+    server.snapshot_refresher.refresh_now()
+
+    known = client.get(f"/cluster/rg-0/cluster-0/fragment/namespace/{pods[0].namespace}")
+    assert known.status_code == 200
+    assert pods[0].name in known.get_data(as_text=True)
+    assert client.get("/cluster/rg-0/cluster-0/fragment/namespace/missing").status_code == 404
+    assert client.get(f"/cluster/rg-9/cluster-9/fragment/namespace/{pods[0].namespace}").status_code == 404
+
+
+def test_restored_snapshot_keeps_failed_clusters(server, make_pods):
+    pods = make_pods(8)
+    healthy = CollectionResult(cluster_info=make_cluster_info(), resources=[], kubernetes_pods=pods)
+    failed = CollectionResult(cluster_info=None, resources=[], kubernetes_pods=[])
+    start(server, {"cluster-0": [healthy], "cluster-1": [healthy, failed], "cluster-2": [failed]}, count=3)
+    server.snapshot_store = SnapshotStore("snapshot.db")
+    server.snapshot_refresher.add_listener(server.save_snapshot)
+    server.snapshot_refresher.refresh_now()
+    saved = server.snapshot_refresher.refresh_now()
+
+    restored = server.restore_snapshot(make_targets(3))
+    assert restored.restored and restored.generation == saved.generation
+    kept, never_collected = restored.clusters[1], restored.clusters[2]
+    assert kept.error == saved.clusters[1].error and kept.stale
+    assert kept.kubernetes_pods == tuple(pods)
+    assert never_collected.error and never_collected.cluster_info is None and never_collected.page is None
+
+    server.snapshot_refresher = SnapshotRefresher(server.collect_snapshot, min_interval=0)
+    server.snapshot_refresher.restore(restored)
+    client = server.app.test_client()
+    page = client.get("/cluster/rg-1/cluster-1")
+    assert page.status_code == 200
+    assert page.headers["X-Snapshot-Stale"] == "restored"
+    assert f'data-generation="{saved.generation}"' in page.get_data(as_text=True)
+    assert client.get("/cluster/rg-2/cluster-2").status_code == 502
+
+    statuses = {cluster["key"]: cluster for cluster in client.get("/api/status").get_json()["clusters"]}
+    assert statuses["rg-1/cluster-1"]["stale"] and statuses["rg-1/cluster-1"]["error"]
+    assert statuses["rg-0/cluster-0"]["stale"] and not statuses["rg-0/cluster-0"]["error"]
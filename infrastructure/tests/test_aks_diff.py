@@ -0,0 +1,132 @@
+import random
+from dataclasses import replace
+
+import aks_diff
+from aks_diff import CONTAINER_FIELDS, POD_FIELDS, PodHashes, diff_pods
+from aks_html_dashboard import ContainerInfo, PodInfo
+
+# Property-style tests: each seed builds a random snapshot pair and checks the
+# diff against a brute-force comparison of every pod and container
+SEEDS = range(200)
+
+STATUSES = ["Running", "Pending", "Failed", "Succeeded"]
+
+
+def random_container(rng, namespace, pod_name, index):
+    return ContainerInfo(name=f"c{index}", namespace=namespace, pod_name=pod_name,
+                         image=f"registry/app:{rng.randint(1, 3)}", status=rng.choice(["running", "waiting"]),
+                         ready=rng.random() < 0.8, restart_count=rng.randint(0, 3), ports=[], resources={})
+
+
+def random_pod(rng, index):
+    namespace, name = f"ns-{rng.randint(0, 4)}", f"pod-{index}"
+    containers = [random_container(rng, namespace, name, c) for c in range(rng.randint(0, 3))]
+    return PodInfo(name=name, namespace=namespace, status=rng.choice(STATUSES), ready="1/1",
+                   containers=containers, node_name=f"node-{rng.randint(0, 3)}",
+                   created_at=rng.randint(1_600_000_000, 1_700_000_000))
+
+
+def mutate(rng, pod):
+    """Randomly change compared fields, containers, or only fields the diff ignores"""
+    containers = list(pod.containers)
+    for _ in range(rng.randint(1, 3)):
+        action = rng.choice(["pod", "container", "add", "remove", "reorder", "age"])
+        if action == "pod":
+            pod = replace(pod, **{"status": rng.choice(STATUSES), "node_name": f"node-{rng.randint(0, 3)}",
+                                  "ready": rng.choice(["0/1", "1/1"])})
+        elif action == "container" and containers:
+            i = rng.randrange(len(containers))
+            name = rng.choice(CONTAINER_FIELDS)
+            value = {"image": f"registry/app:{rng.randint(1, 3)}", "status": rng.choice(["running", "waiting"]),
+                     "ready": rng.random() < 0.5, "restart_count": rng.randint(0, 3)}[name]
+            containers[i] = replace(containers[i], **{name: value})
+        elif action == "add":
+            # Container names are unique within a pod
+            index = max((int(c.name[1:]) for c in containers), default=0) + 10
+            containers.append(random_container(rng, pod.namespace, pod.name, index))
+        elif action == "remove" and containers:
+            containers.pop(rng.randrange(len(containers)))
+        elif action == "reorder":
+            rng.shuffle(containers)
+        elif action == "age":
+            pod = replace(pod, created_at=pod.created_at + 1)
+    return replace(pod, containers=containers)
+
+
+def random_snapshots(seed):
+    rng = random.Random(seed)
+    before = [random_pod(rng, i) for i in range(rng.randint(0, 40))]
+    after = []
+    for pod in before:
+        roll = rng.random()
+        if roll < 0.1:
+            continue
+        after.append(mutate(rng, pod) if roll < 0.5 else pod)
+    after.extend(random_pod(rng, 1000 + i) for i in range(rng.randint(0, 5)))
+    rng.shuffle(after)
+    return before, after
+
+
+def expected_changes(old, new):
+    fields = {name: (getattr(old, name), getattr(new, name))
+              for name in POD_FIELDS if getattr(old, name) != getattr(new, name)}
+    old_containers = {c.name: c for c in old.containers}
+    new_containers = {c.name: c for c in new.containers}
+    changed = {}
+    for name in old_containers.keys() & new_containers.keys():
+        diff = {f: (getattr(old_containers[name], f), getattr(new_containers[name], f))
+                for f in CONTAINER_FIELDS if getattr(old_containers[name], f) != getattr(new_containers[name], f)}
+        if diff:
+            changed[name] = diff
+    return (fields, sorted(new_containers.keys() - old_containers.keys()),
+            sorted(old_containers.keys() - new_containers.keys()), changed)
+
+
+def check_diff(seed):
+    before, after = random_snapshots(seed)
+    diff = diff_pods(PodHashes(before), PodHashes(after))
+
+    old = {(p.namespace, p.name): p for p in before}
+    new = {(p.namespace, p.name): p for p in after}
+    assert {(p.namespace, p.name) for p in diff.added} == new.keys() - old.keys()
+    assert {(p.namespace, p.name) for p in diff.removed} == old.keys() - new.keys()
+
+    expected = {}
+    for key in old.keys() & new.keys():
+        fields, added, removed, changed = expected_changes(old[key], new[key])
+        if fields or added or removed or changed:
+            expected[key] = (fields, added, removed, changed)
+    actual = {
+        change.key: (change.fields, sorted(change.added_containers), sorted(change.removed_containers),
+                     {c.name: c.fields for c in change.changed_containers})
+        for change in diff.changed
+    }
+    assert actual == expected
+    assert all(change.pod is new[change.key] for change in diff.changed)
+
+    # Identical snapshots have no changes, and swapping the snapshots swaps added and removed
+    assert not diff_pods(PodHashes(after), PodHashes(list(after)))
+    backward = diff_pods(PodHashes(after), PodHashes(before))
+    assert {p.name for p in diff.added} == {p.name for p in backward.removed}
+    assert {c.key for c in diff.changed} == {c.key for c in backward.changed}
+
+
+def test_diff_matches_brute_force():
+    for seed in SEEDS:
+        try:
+            check_diff(seed)
+        except AssertionError as e:
+            raise AssertionError(f"seed {seed}: {e}") from e
+
+
+def test_unchanged_pods_are_not_compared(monkeypatch):
+    rng = random.Random(7)
+    pods = [random_pod(rng, i) for i in range(100)]
+    changed = replace(pods[5], status="Failed" if pods[5].status != "Failed" else "Running")
+    compared = []
+    original = aks_diff.compare_pods
+    monkeypatch.setattr(aks_diff, "compare_pods", lambda old, new: compared.append(new) or original(old, new))
+
+    diff = diff_pods(PodHashes(pods), PodHashes(pods[:5] + [changed] + pods[6:]))
+    assert compared == [changed]
+    assert [change.fields for change in diff.changed] == [{"status": (pods[5].status, changed.status)}]
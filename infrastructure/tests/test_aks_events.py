@@ -0,0 +1,100 @@
+import json
+import threading
+import time
+from dataclasses import replace
+
+from aks_events import EventBroker, snapshot_delta
+from aks_pod_index import PodIndex
+from aks_snapshot import ClusterSnapshot, DashboardSnapshot
+from stub_kube_api import make_pod
+from factories import TARGET, make_cluster_info
+
+
+def make_snapshot(generation, pods):
+    cluster = ClusterSnapshot(target=TARGET, collected_at=time.time(), cluster_info=make_cluster_info(),
+                              resources=(), kubernetes_pods=tuple(pods),
+                              aggregates=PodIndex(pods).to_dict())
+    return DashboardSnapshot(generation=generation, collected_at=time.time(), clusters=(cluster,))
+
+
+def parse_events(chunks):
+    events = []
+    for chunk in chunks:
+        fields = dict(line.split(": ", 1) for line in chunk.strip().splitlines() if not line.startswith(":"))
+        if "event" in fields:
+            events.append((int(fields["id"]), fields["event"], json.loads(fields["data"])))
+    return events
+
+
+def test_delta_reports_pod_and_counter_changes(generator, make_pods):
+    pods = make_pods(30)
+    first = make_snapshot(1, pods)
+    changed = replace(pods[0], status="Failed")
+    added = generator._parse_pod(make_pod(99))
+    second = make_snapshot(2, [changed] + pods[1:-1] + [added])
+
+    delta = snapshot_delta(first, second)["clusters"][TARGET.key]
+    assert [pod["name"] for pod in delta["pods"]["changed"]] == [changed.name]
+    assert delta["pods"]["changed"][0]["status"] == "Failed"
+    assert [pod["name"] for pod in delta["pods"]["removed"]] == [pods[-1].name]
+    assert [pod["name"] for pod in delta["pods"]["added"]] == [added.name]
+    assert delta["counters"]["totals"] == second.clusters[0].aggregates["totals"]
+    # Only namespaces whose counters changed are sent
+    assert set(delta["counters"]["namespaces"]) <= {changed.namespace, pods[-1].namespace, added.namespace}
+    assert snapshot_delta(second, second)["clusters"] == {}
+
+
+def test_stream_replays_missed_events_and_sends_heartbeats():
+    broker = EventBroker(heartbeat=0.05, history=3)
+    for generation in range(1, 4):
+        broker.publish(generation, "snapshot", {"generation": generation})
+
+    stream = broker.connect(1)
+    chunks = iter(stream)
+    assert next(chunks).startswith("retry:")
+    assert [event[0] for event in parse_events([next(chunks), next(chunks)])] == [2, 3]
+    assert next(chunks) == ": heartbeat\n\n"
+
+    threading.Timer(0.01, broker.publish, (4, "snapshot", {"generation": 4})).start()
+    assert parse_events([next(chunks)]) == [(4, "snapshot", {"generation": 4})]
+    stream.close()
+    assert broker.stats["clients"] == 0
+
+
+def test_clients_that_fell_behind_are_reset():
+    broker = EventBroker(heartbeat=0.05, history=2)
+    for generation in range(1, 6):
+        broker.publish(generation, "snapshot", {})
+
+    chunks = iter(broker.connect(1))
+    next(chunks)
+    assert parse_events([next(chunks)]) == [(5, "reset", {})]
+    # An id from before a server restart is ahead of the broker
+    chunks = iter(broker.connect(40))
+    next(chunks)
+    assert parse_events([next(chunks)])[0][1] == "reset"
+    assert broker.stats["resets"] == 2
+
+
+def test_resumed_broker_continues_after_restored_generation():
+    broker = EventBroker(heartbeat=0.05)
+    broker.resume(12)
+    # A page from before the restart missed updates that were never buffered
+    older = iter(broker.connect(3))
+    next(older)
+    assert parse_events([next(older)])[0][1] == "reset"
+    # A page rendered from the restored snapshot waits for the next one
+    current = iter(broker.connect(12))
+    next(current)
+    threading.Timer(0.01, broker.publish, (13, "snapshot", {"generation": 13})).start()
+    assert parse_events([next(current)]) == [(13, "snapshot", {"generation": 13})]
+
+
+def test_client_cap():
+    broker = EventBroker(max_clients=1)
+    stream = broker.connect(None)
+    assert broker.connect(None) is None
+    assert broker.stats["rejected"] == 1
+    stream.close()
+    stream.close()
+    assert broker.connect(None) is not None
@@ -0,0 +1,95 @@
+import time
+
+from aks_collector import CollectionResult
+from aks_fleet import FleetCollector
+from aks_html_dashboard import ClusterTarget, load_cluster_targets
+from factories import make_cluster_info, make_targets
+
+
+class FakeCollector:
+    def __init__(self, delay=0.0, fail=False):
+        self.delay = delay
+        self.fail = fail
+
+    def collect(self, resource_group, cluster_name):
+        time.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("subscription not found")
+        return CollectionResult(cluster_info=make_cluster_info(), resources=[], kubernetes_pods=[])
+
+
+def test_clusters_are_collected_in_parallel():
+    targets = make_targets(4)
+    fleet = FleetCollector(targets, lambda target: FakeCollector(delay=0.3), max_workers=4)
+    started = time.perf_counter()
+    collections = fleet.collect()
+    elapsed = time.perf_counter() - started
+    fleet.shutdown()
+
+    assert list(collections) == [target.key for target in targets]
+    assert all(c.error is None for c in collections.values())
+    assert elapsed < 0.9
+
+
+def test_failing_and_slow_clusters_are_isolated():
+    targets = make_targets(3)
+    collectors = {
+        targets[0].key: FakeCollector(),
+        targets[1].key: FakeCollector(fail=True),
+        targets[2].key: FakeCollector(delay=2.0),
+    }
+    fleet = FleetCollector(targets, lambda target: collectors[target.key], cluster_deadline=0.3)
+    started = time.perf_counter()
+    collections = fleet.collect()
+    elapsed = time.perf_counter() - started
+    fleet.shutdown()
+
+    assert collections[targets[0].key].result.cluster_info is not None
+    assert collections[targets[1].key].error == "subscription not found"
+    assert "Timed out" in collections[targets[2].key].error
+    assert elapsed < 1.0
+
+
+def test_queued_clusters_get_their_full_deadline():
+    targets = make_targets(6)
+    fleet = FleetCollector(targets, lambda target: FakeCollector(delay=0.25), max_workers=2, cluster_deadline=0.4)
+    started = time.perf_counter()
+    collections = fleet.collect()
+    elapsed = time.perf_counter() - started
+    fleet.shutdown()
+
+    # The last pair starts about 0.5s after submission, past a deadline counted from then
+    assert all(c.error is None for c in collections.values())
+    assert 0.7 < elapsed < 1.2
+
+
+def test_clusters_stuck_behind_hung_workers_give_up():
+    targets = make_targets(3)
+    collectors = {
+        targets[0].key: FakeCollector(delay=2.0),
+        targets[1].key: FakeCollector(delay=2.0),
+        targets[2].key: FakeCollector(),
+    }
+    fleet = FleetCollector(targets, lambda target: collectors[target.key], max_workers=2, cluster_deadline=0.2)
+    started = time.perf_counter()
+    collections = fleet.collect()
+    elapsed = time.perf_counter() - started
+    fleet.shutdown()
+
+    errors = [c.error for c in collections.values()]
+    assert all(error.startswith("Timed out after") for error in errors[:2])
+    assert errors[2] == "Timed out waiting for a free worker"
+    assert elapsed < 1.0
+
+
+def test_cluster_targets_default_to_the_demo_cluster():
+    config = {"azure": {"subscription_id": "sub-a"}}
+    assert load_cluster_targets(config) == [ClusterTarget("transact", "rg-modular-demo", "sub-a")]
+
+    config["clusters"] = [
+        {"name": "transact", "resource_group": "rg-modular-demo"},
+        {"name": "payments", "resource_group": "rg-payments", "subscription_id": "sub-b"},
+    ]
+    targets = load_cluster_targets(config)
+    assert [t.key for t in targets] == ["rg-modular-demo/transact", "rg-payments/payments"]
+    assert targets[1].subscription_id == "sub-b"
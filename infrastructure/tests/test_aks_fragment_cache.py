@@ -0,0 +1,33 @@
+import re
+from dataclasses import replace
+
+from aks_fragment_cache import FragmentCache
+from factories import make_cluster_info
+
+
+def without_timestamp(html):
+    return re.sub(r'<td id="lastUpdated">[^<]*</td>', "", html)
+
+
+def test_only_changed_fragments_are_rendered(generator, make_pods):
+    pods = make_pods(40)
+    namespaces = {pod.namespace for pod in pods}
+    nodes = {pod.node_name for pod in pods}
+    fragments = FragmentCache()
+
+    "".join(generator._iter_html_template(make_cluster_info(), [], pods, fragments=fragments))
+    assert fragments.stats == {"hits": 0, "misses": len(namespaces) + len(nodes), "evictions": 0}
+
+    fragments.stats.update(hits=0, misses=0)
+    pods[0] = replace(pods[0], status="Failed")
+    cached = "".join(generator._iter_html_template(make_cluster_info(), [], pods, fragments=fragments))
+    # One namespace card and one node card changed
+    assert fragments.stats["misses"] == 2
+    assert fragments.stats["hits"] == len(namespaces) + len(nodes) - 2
+    uncached = generator._create_html_template(make_cluster_info(), [], pods)
+    assert without_timestamp(cached) == without_timestamp(uncached)
+
+    remaining = [pod for pod in pods if pod.namespace != pods[0].namespace]
+    "".join(generator._iter_html_template(make_cluster_info(), [], remaining, fragments=fragments))
+    assert fragments.stats["evictions"] == 1 + len(nodes - {pod.node_name for pod in remaining})
+    assert len(fragments) == len(namespaces) - 1 + len({pod.node_name for pod in remaining})
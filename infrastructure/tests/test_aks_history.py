@@ -0,0 +1,84 @@
+import time
+from dataclasses import replace
+
+import pytest
+
+from aks_history import ClusterHistory, HistoryTier, SnapshotHistory
+from aks_pod_index import PodIndex
+from factories import TARGET, make_snapshot
+
+
+def test_unchanged_series_are_stored_once():
+    tier = HistoryTier(0, 100)
+    state = {("pod", "ns", f"pod-{i}"): ("Running", "1/1") for i in range(50)}
+    for timestamp in range(40):
+        tier.record(timestamp, state)
+    assert tier.stored_values == 50
+
+    tier.record(40, {**state, ("pod", "ns", "pod-3"): ("Failed", "0/1")})
+    assert tier.stored_values == 51
+    assert tier.series(lambda key: key[2] == "pod-3")[("pod", "ns", "pod-3")][-2:] == [
+        (39, ("Running", "1/1")), (40, ("Failed", "0/1"))
+    ]
+
+
+def test_ring_buffer_folds_evicted_frames_into_the_base():
+    tier = HistoryTier(0, 3)
+    for timestamp in range(10):
+        state = {("container", "ns", "web", "app"): timestamp // 2}
+        if timestamp < 8:
+            # A pod that goes away in the 9th sample
+            state[("pod", "ns", "old")] = ("Running", "1/1")
+        tier.record(timestamp, state)
+
+    assert len(tier.frames) == 3
+    points = tier.series(lambda key: True)
+    assert points[("container", "ns", "web", "app")] == [(7, 3), (8, 4), (9, 4)]
+    assert points[("pod", "ns", "old")] == [(7, ("Running", "1/1"))]
+    # Once the frame that ended every series is evicted, the base is empty
+    for timestamp in range(10, 14):
+        tier.record(timestamp, {})
+    assert tier.base == {}
+
+
+def test_coarser_tiers_keep_the_last_sample_of_each_interval():
+    history = ClusterHistory({"1m": 10, "1h": 10})
+    for timestamp, value in [(0, 1), (30, 2), (59, 3), (61, 4), (150, 5), (3601, 6)]:
+        history.record(timestamp, {("cluster",): (value, 0, 0, 0, 0)})
+
+    def values(resolution, since=0.0):
+        return [(point[0], point[1]) for point in history.query("cluster", resolution=resolution, since=since)["points"]]
+
+    assert values("raw") == [(0, 1), (30, 2), (59, 3), (61, 4), (150, 5), (3601, 6)]
+    # The minute and hour still open are reported from their latest sample
+    assert values("1m") == [(0, 3), (60, 4), (120, 5), (3600, 6)]
+    assert values("1h") == [(0, 5), (3600, 6)]
+    assert values("1m", since=100) == [(120, 5), (3600, 6)]
+
+
+def test_snapshot_history_tracks_namespaces_and_pod_restarts(make_pods):
+    pods = make_pods(40)
+    history = SnapshotHistory()
+    now = time.time()
+    previous = None
+    for step in range(4):
+        pods[0] = replace(pods[0], containers=[replace(c, restart_count=step) for c in pods[0].containers])
+        snapshot = make_snapshot(step + 1, pods, now + step)
+        history.record_snapshot(previous, snapshot)
+        previous = snapshot
+    # A failed collection serves older data and is not a new sample
+    history.record_snapshot(previous, make_snapshot(5, pods, now + 10, error="timeout"))
+
+    namespace = history.query(TARGET.key, "namespace", pods[0].namespace)
+    assert len(namespace["points"]) == 4
+    assert namespace["points"][-1][1:] == list(PodIndex(pods).to_dict()["namespaces"][pods[0].namespace].values())
+
+    pod = history.query(TARGET.key, "pod", f"{pods[0].namespace}/{pods[0].name}", since=now + 2)
+    assert [point[1:] for point in pod["points"]] == [[pods[0].status, pods[0].ready]] * 2
+    assert pod["restarts"] == {c.name: [[now + 2, 2], [now + 3, 3]] for c in pods[0].containers}
+
+    assert history.query("rg/other", "cluster") is None
+    with pytest.raises(ValueError):
+        history.query(TARGET.key, "cluster", resolution="5m")
+    with pytest.raises(ValueError):
+        history.query(TARGET.key, "deployment", "web")
@@ -0,0 +1,63 @@
+from dataclasses import replace
+
+from aks_history import SnapshotHistory
+from aks_history_store import HistoryStore
+from factories import TARGET, make_snapshot
+
+RETENTION = {"raw": 5, "1m": 4, "1h": 3}
+
+
+def record_samples(history, pods, count, start=1_700_000_000.0):
+    previous = None
+    for step in range(count):
+        pods[step % 12] = replace(pods[step % 12], containers=[
+            replace(c, restart_count=step) for c in pods[step % 12].containers
+        ])
+        # A pod comes and goes, so series also end and restart
+        sample = pods if step % 3 else pods[:-1]
+        snapshot = make_snapshot(step + 1, sample, start + step * 45)
+        history.record_snapshot(previous, snapshot)
+        previous = snapshot
+    return pods
+
+
+def queries(history, pods):
+    pod = f"{pods[0].namespace}/{pods[0].name}"
+    return {
+        resolution: (history.query(TARGET.key, "cluster", resolution=resolution),
+                     history.query(TARGET.key, "namespace", pods[0].namespace, resolution=resolution),
+                     history.query(TARGET.key, "pod", pod, resolution=resolution))
+        for resolution in RETENTION
+    }
+
+
+def test_history_is_restored_from_the_store(tmp_path, make_pods):
+    path = str(tmp_path / "history.db")
+    history = SnapshotHistory(RETENTION, store=HistoryStore(path))
+    pods = record_samples(history, make_pods(12), 20)
+    assert history.store.stats == {"frames": 20 + 14, "failures": 0}
+    history.store.close()
+
+    restored = SnapshotHistory(RETENTION, store=HistoryStore(path))
+    assert restored.load() == 5 + 4 + 0
+    assert queries(restored, pods) == queries(history, pods)
+    for name, tier in restored.clusters[TARGET.key].tiers.items():
+        original = history.clusters[TARGET.key].tiers[name]
+        assert (tier.base, tier.state, tier.appended) == (original.base, original.state, original.appended)
+
+
+def test_lowered_retention_folds_stored_frames(tmp_path, make_pods):
+    path = str(tmp_path / "history.db")
+    history = SnapshotHistory(RETENTION, store=HistoryStore(path))
+    pods = record_samples(history, make_pods(12), 8)
+    history.store.close()
+
+    smaller = SnapshotHistory({"raw": 2}, store=HistoryStore(path))
+    smaller.load()
+    expected = smaller.query(TARGET.key, "pod", f"{pods[0].namespace}/{pods[0].name}")
+    smaller.store.close()
+
+    # Loading again reads the base that was rewritten for the smaller tier
+    again = SnapshotHistory({"raw": 2}, store=HistoryStore(path))
+    assert again.load() == 2 + 4
+    assert again.query(TARGET.key, "pod", f"{pods[0].namespace}/{pods[0].name}") == expected
@@ -0,0 +1,91 @@
+import gzip
+
+from flask import Flask, request
+
+from aks_http_cache import CachedPage
+
+HTML = "<html><body>" + "<div class='pod'>running</div>" * 500 + "</body></html>"
+
+
+def make_client(page):
+    app = Flask(__name__)
+
+    @app.route("/")
+    def index():
+        return page.respond(request, {"X-Snapshot-Generation": "3"})
+
+    return app.test_client()
+
+
+def test_compressed_once_and_negotiated():
+    page = CachedPage.build(HTML, 1700000000.0)
+    client = make_client(page)
+
+    response = client.get("/", headers={"Accept-Encoding": "gzip, deflate"})
+    assert response.status_code == 200
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.headers["Vary"] == "Accept-Encoding"
+    assert response.headers["X-Snapshot-Generation"] == "3"
+    assert gzip.decompress(response.data).decode("utf-8") == HTML
+    assert len(response.data) < len(HTML) / 10
+    # The bytes served are the precomputed ones
+    assert response.data == page.encodings["gzip"]
+
+    plain = client.get("/")
+    assert "Content-Encoding" not in plain.headers
+    assert plain.data.decode("utf-8") == HTML
+
+
+def test_conditional_requests_return_not_modified():
+    page = CachedPage.build(HTML, 1700000000.0)
+    client = make_client(page)
+
+    first = client.get("/")
+    etag = first.headers["ETag"]
+    assert etag == f'"{page.etag}"'
+
+    revalidated = client.get("/", headers={"If-None-Match": etag})
+    assert revalidated.status_code == 304
+    assert revalidated.data == b""
+
+    since = client.get("/", headers={"If-Modified-Since": first.headers["Last-Modified"]})
+    assert since.status_code == 304
+
+    changed = client.get("/", headers={"If-None-Match": '"something-else"'})
+    assert changed.status_code == 200
+
+
+def test_streamed_page_matches_built_page(monkeypatch):
+    monkeypatch.setattr("aks_http_cache.STREAM_CHUNK_SIZE", 1024)
+    chunks = [HTML[start:start + 700] for start in range(0, len(HTML), 700)]
+    streamed = CachedPage.from_chunks(chunks, 1700000000.0)
+    built = CachedPage.build(HTML, 1700000000.0)
+    assert streamed.etag == built.etag
+    assert streamed.size == len(HTML)
+
+    body = list(streamed.iter_body())
+    assert len(body) > 1
+    assert all(len(chunk) <= 1024 for chunk in body)
+    assert b"".join(body).decode("utf-8") == HTML
+
+
+def test_fast_pages_use_low_compression_levels(monkeypatch):
+    qualities = []
+
+    class FakeCompressor:
+        def __init__(self, quality):
+            qualities.append(quality)
+
+        def process(self, data):
+            return data
+
+        def finish(self):
+            return b""
+
+    monkeypatch.setattr("aks_http_cache.brotli", type("brotli", (), {"Compressor": FakeCompressor}))
+    snapshot_page = CachedPage.build(HTML, 1700000000.0)
+    fragment = CachedPage.build(HTML, 1700000000.0, fast=True)
+
+    assert qualities == [11, 4]
+    assert fragment.etag == snapshot_page.etag
+    assert gzip.decompress(fragment.encodings["gzip"]).decode("utf-8") == HTML
@@ -0,0 +1,79 @@
+import pytest
+
+from aks_kube_api import (
+    FallbackPodSource, KubeApiClient, KubeApiPodSource, KubeAuthError, PodSource
+)
+from stub_kube_api import StubKubeApiServer
+
+
+class FailingPodSource(PodSource):
+    name = "failing"
+
+    def iter_pods(self):
+        raise RuntimeError("boom")
+        yield
+
+
+def test_api_source_lists_pods_over_pooled_connection():
+    with StubKubeApiServer(pod_count=25) as stub:
+        client = KubeApiClient.from_kubeconfig(stub.kubeconfig())
+        source = KubeApiPodSource(client)
+        first = list(source.iter_pods())
+        connection = client._pool.queue[0]
+        second = list(source.iter_pods())
+
+        assert len(first) == 25
+        assert second == first
+        assert list(client._pool.queue) == [connection]
+        source.close()
+
+
+def test_stub_serves_the_discovery_kubectl_reads():
+    with StubKubeApiServer(pod_count=1) as stub:
+        client = KubeApiClient.from_kubeconfig(stub.kubeconfig())
+        assert client.get_json("/api", {"timeout": "32s"})["versions"] == ["v1"]
+        assert client.get_json("/apis")["kind"] == "APIGroupList"
+        resources = client.get_json("/api/v1")["resources"]
+        assert [(r["name"], r["namespaced"]) for r in resources] == [("pods", True)]
+
+
+def test_rejected_token_raises_auth_error():
+    with StubKubeApiServer(pod_count=1) as stub:
+        client = KubeApiClient(stub.url, token="expired")
+        with pytest.raises(KubeAuthError):
+            client.get_json("/api/v1/pods")
+
+
+def test_close_ignores_watches_whose_socket_already_closed():
+    with StubKubeApiServer(pod_count=1) as stub:
+        client = KubeApiClient.from_kubeconfig(stub.kubeconfig())
+        client.get_json("/api/v1/pods")
+        # A watch that just ended: its socket is closed but it is still registered
+        watch = client._connect(1.0)
+        watch.connect()
+        watch.sock.close()
+        client._watches.add(watch)
+
+        client.close()
+        assert client._pool.empty()
+
+
+def test_fallback_uses_next_source():
+    with StubKubeApiServer(pod_count=3) as stub:
+        api_source = KubeApiPodSource(KubeApiClient.from_kubeconfig(stub.kubeconfig()))
+        source = FallbackPodSource([FailingPodSource(), api_source])
+        assert len(list(source.iter_pods())) == 3
+
+
+def test_generator_lists_pods_through_api(generator):
+    with StubKubeApiServer(pod_count=40) as stub:
+        generator._fetch_kubeconfig = lambda resource_group, cluster_name: stub.kubeconfig()
+        try:
+            pods = generator.get_kubernetes_containers("rg-modular-demo", "transact")
+            pods = generator.get_kubernetes_containers("rg-modular-demo", "transact")
+        finally:
+            generator.kubeconfig_caches[("rg-modular-demo", "transact")].close()
+
+        assert len(pods) == 40
+        assert pods[1].ready == "2/2"
+        assert stub.requests == ["/api/v1/pods?limit=500", "/api/v1/pods?limit=500"]
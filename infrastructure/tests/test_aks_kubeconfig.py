@@ -0,0 +1,90 @@
+import os
+import stat
+
+from aks_kubeconfig import KubeconfigCache, is_auth_failure
+
+
+def make_cache(ttl=900.0):
+    calls = []
+
+    def fetch():
+        calls.append(len(calls))
+        return f"apiVersion: v1\n# fetch {len(calls)}\n"
+
+    return KubeconfigCache(fetch, ttl=ttl), calls
+
+
+def test_credentials_are_fetched_once_within_ttl():
+    cache, calls = make_cache()
+    try:
+        first = cache.get_path()
+        second = cache.get_path()
+        assert first == second
+        assert len(calls) == 1
+        with open(first) as f:
+            assert "fetch 1" in f.read()
+    finally:
+        cache.close()
+
+
+def test_kubeconfig_file_is_private():
+    cache, _ = make_cache()
+    try:
+        mode = stat.S_IMODE(os.stat(cache.get_path()).st_mode)
+        assert mode & 0o077 == 0
+    finally:
+        cache.close()
+
+
+def test_invalidate_refetches_into_the_same_file():
+    cache, calls = make_cache()
+    try:
+        path = cache.get_path()
+        cache.invalidate()
+        assert cache.get_path() == path
+        assert len(calls) == 2
+        with open(path) as f:
+            assert "fetch 2" in f.read()
+    finally:
+        cache.close()
+    assert not os.path.exists(path)
+
+
+def test_expired_credentials_are_refetched():
+    cache, calls = make_cache(ttl=0.0)
+    try:
+        cache.get_path()
+        cache.get_path()
+        assert len(calls) == 2
+    finally:
+        cache.close()
+
+
+def test_missing_credentials_return_none():
+    cache = KubeconfigCache(lambda: None)
+    assert cache.get_path() is None
+
+
+def test_failed_fetches_are_remembered_briefly():
+    calls = []
+
+    def fetch():
+        calls.append(len(calls))
+        return None
+
+    cache = KubeconfigCache(fetch)
+    assert cache.get_content() is None
+    assert cache.get_content() is None
+    assert len(calls) == 1
+
+    expired = KubeconfigCache(fetch, failure_ttl=0.0)
+    expired.get_content()
+    expired.get_content()
+    assert len(calls) == 3
+
+
+def test_auth_failure_detection():
+    assert is_auth_failure("error: You must be logged in to the server (Unauthorized)")
+    assert is_auth_failure("HTTP 401")
+    assert not is_auth_failure("Unable to connect to the server: dial tcp: i/o timeout")
+    assert not is_auth_failure(None)
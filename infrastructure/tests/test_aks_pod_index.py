@@ -0,0 +1,33 @@
+from aks_aggregates import PodAggregates
+from aks_pod_index import UNKNOWN_NODE, PodIndex
+
+
+def test_groups_and_rollups_at_every_level(make_pods):
+    pods = make_pods(60)
+    pods[0].node_name = "Unknown"
+    index = PodIndex(pods)
+
+    assert index.totals.total_pods == 60
+    assert index.totals.total_containers == sum(len(pod.containers) for pod in pods)
+    assert index.to_dict() == PodAggregates(pods).to_dict()
+
+    for namespace, group in index.namespaces.items():
+        expected = [pod for pod in pods if pod.namespace == namespace]
+        assert group.pods == expected
+        assert group.healthy_pods == sum(1 for pod in expected if pod.status == "Running")
+        assert group.healthy_containers == sum(c.ready for pod in expected for c in pod.containers)
+
+    for node_key, node in index.nodes.items():
+        node_pods = [pod for pod in pods if pod.node_name == node_key]
+        assert node.pods == node_pods
+        assert sum(group.total_pods for group in node.groups) == node.total_pods
+        for group in node.groups:
+            assert group.pods == [pod for pod in node_pods if pod.namespace == group.name]
+    assert index.nodes["Unknown"].name == UNKNOWN_NODE
+
+
+def test_groups_keep_first_appearance_order(make_pods):
+    pods = make_pods(12)
+    index = PodIndex(reversed(pods))
+    namespaces = list(dict.fromkeys(pod.namespace for pod in reversed(pods)))
+    assert list(index.namespaces) == namespaces
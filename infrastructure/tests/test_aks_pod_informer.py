@@ -0,0 +1,129 @@
+import time
+
+import aks_pod_informer
+from aks_kube_api import KubeApiClient
+from aks_pod_informer import PodInformer
+from stub_kube_api import STUB_TOKEN, StubKubeApiServer, make_pod
+
+
+def wait_until(condition, timeout=5.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def make_informer(stub, generator):
+    return PodInformer(lambda: KubeApiClient.from_kubeconfig(stub.kubeconfig()), generator._parse_pod)
+
+
+def test_initial_list_then_watch_events_update_index(generator):
+    with StubKubeApiServer(pod_count=10) as stub:
+        informer = make_informer(stub, generator)
+        informer.start()
+        try:
+            assert informer.synced.wait(5)
+            assert informer.count == 10
+
+            added = make_pod(500)
+            stub.watch_events.put({"type": "ADDED", "object": added})
+            assert wait_until(lambda: informer.count == 11)
+
+            modified = make_pod(3)
+            modified["status"]["phase"] = "Failed"
+            modified["metadata"]["resourceVersion"] = "9000"
+            stub.watch_events.put({"type": "MODIFIED", "object": modified})
+            pod_3 = modified["metadata"]
+            assert wait_until(lambda: informer.get(pod_3["namespace"], pod_3["name"]).status == "Failed")
+            assert informer.resource_version == "9000"
+
+            stub.watch_events.put({"type": "DELETED", "object": added})
+            assert wait_until(lambda: informer.count == 10)
+        finally:
+            stub.watch_events.put(None)
+            informer.stop(timeout=5)
+
+        watches = [r for r in stub.requests if "watch=true" in r]
+        assert "resourceVersion=1010" in watches[0]
+
+
+def test_expired_watch_triggers_relist(generator):
+    with StubKubeApiServer(pod_count=5) as stub:
+        informer = make_informer(stub, generator)
+        informer.start()
+        try:
+            assert informer.synced.wait(5)
+            stub.pod_list["items"].append(make_pod(77))
+            stub.watch_events.put({"type": "ERROR", "object": {"kind": "Status", "code": 410}})
+            assert wait_until(lambda: informer.count == 6)
+        finally:
+            stub.watch_events.put(None)
+            informer.stop(timeout=5)
+
+        lists = [r for r in stub.requests if r == "/api/v1/pods?limit=500"]
+        assert len(lists) == 2
+
+
+def test_failures_back_off_and_expire_the_index(monkeypatch, generator):
+    monkeypatch.setattr(aks_pod_informer, "STALE_AFTER", -1.0)
+    informer = PodInformer(lambda: None, generator._parse_pod)
+    delays = []
+    informer._stop.wait = delays.append
+    informer.synced.set()
+
+    informer._wait_before_retry()
+    assert informer.synced.is_set()
+    for _ in range(7):
+        informer._wait_before_retry()
+    assert delays == [5.0, 10.0, 20.0, 40.0, 80.0, 160.0, 300.0, 300.0]
+    # Collections list pods again instead of reading the frozen index
+    assert not informer.synced.is_set()
+
+    informer.apply_event({"type": "ADDED", "object": make_pod(1)})
+    informer._wait_before_retry()
+    assert delays[-1] == 5.0
+
+
+def test_rejected_credentials_close_the_old_client(generator):
+    with StubKubeApiServer(pod_count=3) as stub:
+        clients = []
+
+        def client_factory():
+            # The first client carries a revoked token, later ones the current one
+            token = "revoked" if not clients else STUB_TOKEN
+            clients.append(KubeApiClient(stub.url, token=token))
+            return clients[-1]
+
+        rejected = []
+        informer = PodInformer(client_factory, generator._parse_pod, on_auth_failure=lambda: rejected.append(1))
+        informer._stop.wait = lambda delay: None
+        informer.start()
+        try:
+            assert informer.synced.wait(5)
+        finally:
+            stub.watch_events.put(None)
+            informer.stop(timeout=5)
+
+    assert rejected == [1] and len(clients) == 2
+    assert clients[0]._pool.empty()
+    assert informer.count == 3
+
+
+def test_generator_reads_synced_informer_without_listing(generator):
+    with StubKubeApiServer(pod_count=8) as stub:
+        generator._fetch_kubeconfig = lambda resource_group, cluster_name: stub.kubeconfig()
+        informer = generator.start_pod_informer("rg-modular-demo", "transact")
+        try:
+            assert informer.synced.wait(5)
+            # The informer opens its watch right after syncing; count requests after that
+            assert wait_until(lambda: any("watch=true" in r for r in stub.requests))
+            requests_before = len(stub.requests)
+            pods = generator.get_kubernetes_containers("rg-modular-demo", "transact")
+            assert len(pods) == 8
+            assert len(stub.requests) == requests_before
+        finally:
+            stub.watch_events.put(None)
+            informer.stop(timeout=5)
+            generator.kubeconfig_caches[("rg-modular-demo", "transact")].close()
@@ -0,0 +1,80 @@
+import json
+import tracemalloc
+
+from aks_kube_api import KubeApiClient, KubeApiPodSource
+from stub_kube_api import StubKubeApiServer, make_pod
+
+POD_COUNT = 50000
+PAGE_SIZE = 500
+
+
+class SyntheticPagingClient(KubeApiClient):
+    """Serves a 50k-pod LIST page by page, building each page on demand"""
+
+    def __init__(self, pod_count):
+        super().__init__("http://127.0.0.1:1")
+        self.pod_count = pod_count
+        self.calls = []
+        self.largest_page = 0
+
+    def get_json(self, path, params=None):
+        self.calls.append(dict(params))
+        start = int(params.get("continue", 0))
+        end = min(start + params["limit"], self.pod_count)
+        metadata = {"resourceVersion": "123"}
+        if end < self.pod_count:
+            metadata["continue"] = str(end)
+        body = json.dumps({
+            "kind": "PodList",
+            "metadata": metadata,
+            "items": [make_pod(i, containers=1) for i in range(start, end)],
+        })
+        self.largest_page = max(self.largest_page, len(body))
+        return json.loads(body)
+
+
+def test_paged_listing_parses_50k_pods(generator):
+    client = SyntheticPagingClient(POD_COUNT)
+    pods = generator._parse_pods(KubeApiPodSource(client, page_size=PAGE_SIZE).iter_pods())
+
+    assert len(pods) == POD_COUNT
+    assert len({(pod.namespace, pod.name) for pod in pods}) == POD_COUNT
+    assert len(client.calls) == POD_COUNT // PAGE_SIZE
+    assert all(call["limit"] == PAGE_SIZE for call in client.calls)
+    assert client.calls[1]["continue"] == str(PAGE_SIZE)
+    assert pods[1].containers[0].status == "running"
+    assert pods[1].ready == "1/1"
+
+
+def peak_listing_memory(pod_count):
+    client = SyntheticPagingClient(pod_count)
+    tracemalloc.start()
+    try:
+        count = sum(1 for _ in KubeApiPodSource(client, page_size=PAGE_SIZE).iter_pods())
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert count == pod_count
+    return peak
+
+
+def test_peak_memory_is_bounded_by_page_size():
+    small = peak_listing_memory(2 * PAGE_SIZE)
+    large = peak_listing_memory(20 * PAGE_SIZE)
+
+    # Ten times the pods, but still only one page alive at a time
+    assert large < 1.5 * small
+
+
+def test_stub_server_pages_with_continue_tokens():
+    with StubKubeApiServer(pod_count=1200) as stub:
+        client = KubeApiClient.from_kubeconfig(stub.kubeconfig())
+        pods = list(KubeApiPodSource(client, page_size=PAGE_SIZE).iter_pods())
+        client.close()
+
+    assert len(pods) == 1200
+    assert stub.requests == [
+        "/api/v1/pods?limit=500",
+        "/api/v1/pods?limit=500&continue=500",
+        "/api/v1/pods?limit=500&continue=1000",
+    ]
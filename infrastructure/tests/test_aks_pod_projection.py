@@ -0,0 +1,45 @@
+from aks_kube_api import PROJECTED_POD_TEMPLATE, KubeApiClient, KubeApiPodSource, parse_projected_pods
+from stub_kube_api import StubKubeApiServer, make_pod, make_pod_list, render_projected_pods
+
+
+def test_projected_output_parses_to_the_same_records(generator):
+    pod_list = make_pod_list(50)
+    failing = make_pod(99)
+    failing["status"]["containerStatuses"][0]["state"] = {"waiting": {"reason": "CrashLoopBackOff"}}
+    failing["status"]["containerStatuses"][1]["state"] = {"terminated": {"reason": "Error"}}
+    del failing["status"]["hostIP"]
+    pod_list["items"].append(failing)
+
+    full = generator._parse_pods(pod_list["items"])
+    projected = generator._parse_pods(parse_projected_pods(render_projected_pods(pod_list).splitlines()))
+
+    assert projected == full
+    assert projected[-1].containers[0].status == "waiting (CrashLoopBackOff)"
+    assert projected[-1].containers[1].status == "terminated (Error)"
+    assert projected[-1].node_name == "Unknown"
+
+
+def test_pod_without_container_statuses():
+    line = "default\tpending-pod\tPending\t\t2024-01-01T00:00:00Z\t\n"
+    pod = next(parse_projected_pods([line]))
+    assert pod["status"] == {"phase": "Pending", "containerStatuses": []}
+
+
+def test_template_only_selects_needed_fields():
+    assert "managedFields" not in PROJECTED_POD_TEMPLATE
+    assert "annotations" not in PROJECTED_POD_TEMPLATE
+    assert ".spec" not in PROJECTED_POD_TEMPLATE
+
+
+def test_api_source_projects_compressed_pages(generator):
+    with StubKubeApiServer(pod_count=60) as stub:
+        full_client = KubeApiClient.from_kubeconfig(stub.kubeconfig(), compression=False)
+        full = list(KubeApiPodSource(full_client, page_size=25, projection=False).iter_pods())
+        client = KubeApiClient.from_kubeconfig(stub.kubeconfig())
+        projected = list(KubeApiPodSource(client, page_size=25).iter_pods())
+
+    assert generator._parse_pods(projected) == generator._parse_pods(full)
+    assert all(set(pod) == {"metadata", "status"} for pod in projected)
+    assert all(set(pod["metadata"]) == {"namespace", "name", "creationTimestamp"} for pod in projected)
+    assert client.stats["requests"] == full_client.stats["requests"] == 3
+    assert client.stats["bytes"] < full_client.stats["bytes"] / 5
@@ -0,0 +1,149 @@
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+import pytest
+
+from aks_html_dashboard import AKSDashboardGenerator, ResourceInfo
+from aks_resource_graph import ResourceGraphError, ResourceGraphInventory, build_query, resource_type
+
+
+class FakeCredential:
+    def get_token(self, *scopes):
+        return SimpleNamespace(token="graph-token", expires_on=0)
+
+
+class FakeResourceGraph:
+    """Local Resource Graph endpoint answering from a fixed row list in pages"""
+
+    def __init__(self, rows, page_size=2):
+        self.rows = rows
+        self.page_size = page_size
+        self.bodies = []
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                fake.bodies.append(body)
+                if self.headers.get("Authorization") != "Bearer graph-token":
+                    self.send_response(401)
+                    self.end_headers()
+                    self.wfile.write(b'{"error": "InvalidAuthenticationToken"}')
+                    return
+                offset = int(body["options"].get("$skipToken", 0))
+                page = {"data": fake.rows[offset:offset + fake.page_size]}
+                if offset + fake.page_size < len(fake.rows):
+                    page["$skipToken"] = str(offset + fake.page_size)
+                payload = json.dumps(page).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def __enter__(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def row(subscription, group, name, tags=None):
+    # Resource Graph lower-cases the group and type; the id keeps ARM's casing
+    return {"id": f"/subscriptions/{subscription}/resourceGroups/{group}/providers/Microsoft.Compute/disks/{name}",
+            "subscriptionId": subscription, "resourceGroup": group.lower(), "name": name,
+            "type": "microsoft.compute/disks", "location": "westeurope", "tags": tags}
+
+
+ROWS = [
+    row("sub-a", "rg-Payments", "disk-1", {"env": "demo"}),
+    row("sub-a", "rg-Payments", "disk-2"),
+    row("sub-a", "rg-modular-demo", "disk-3"),
+    row("sub-b", "rg-orders", "disk-4"),
+    row("sub-b", "rg-payments", "disk-5"),
+]
+
+
+def test_one_paged_query_covers_all_groups():
+    with FakeResourceGraph(ROWS) as graph:
+        inventory = ResourceGraphInventory(FakeCredential(), endpoint=graph.url)
+        resources = inventory.query([("sub-a", "rg-Payments"), ("sub-a", "rg-modular-demo"),
+                                     ("sub-b", "rg-orders")])
+
+    assert len(graph.bodies) == 3
+    assert graph.bodies[0]["subscriptions"] == ["sub-a", "sub-b"]
+    assert graph.bodies[2]["options"]["$skipToken"] == "4"
+    assert resources[("sub-a", "rg-Payments")] == [
+        ResourceInfo("disk-1", "Microsoft.Compute/disks", "westeurope", "rg-Payments", {"env": "demo"}),
+        ResourceInfo("disk-2", "Microsoft.Compute/disks", "westeurope", "rg-Payments", {}),
+    ]
+    assert [r.name for r in resources[("sub-b", "rg-orders")]] == ["disk-4"]
+    # rg-payments in sub-b wasn't asked for even though the group name matches
+    assert ("sub-b", "rg-payments") not in resources
+
+
+def test_resource_types_keep_arm_casing():
+    subnet = {"id": "/subscriptions/s/resourceGroups/rg/providers/Microsoft.Network/virtualNetworks/vnet/subnets/aks",
+              "type": "microsoft.network/virtualnetworks/subnets"}
+    assert resource_type(subnet) == "Microsoft.Network/virtualNetworks/subnets"
+    # Without a matching id the reported type is kept
+    assert resource_type({"type": "microsoft.compute/disks"}) == "microsoft.compute/disks"
+    assert resource_type({"id": "/subscriptions/s/resourceGroups/rg/providers/Microsoft.Web/sites/app",
+                          "type": "microsoft.compute/disks"}) == "microsoft.compute/disks"
+
+
+def test_filters_are_sent_in_the_query():
+    query = build_query(["rg-b", "rg-a", "rg-a"], types=["Microsoft.Compute/disks"],
+                        tags={"owner": "o'brien"})
+    assert query == (
+        "Resources | where resourceGroup in~ ('rg-a', 'rg-b')"
+        " | where type in~ ('Microsoft.Compute/disks')"
+        " | where tags['owner'] =~ 'o\\'brien'"
+        " | project id, subscriptionId, resourceGroup, name, type, location, tags"
+    )
+
+
+def test_concurrent_lookups_share_one_query():
+    with FakeResourceGraph(ROWS, page_size=10) as graph:
+        inventory = ResourceGraphInventory(FakeCredential(), endpoint=graph.url)
+        groups = [("sub-a", "rg-Payments"), ("sub-a", "rg-modular-demo"), ("sub-b", "rg-orders")]
+        for subscription, group in groups:
+            inventory.register(subscription, group)
+
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            results = list(executor.map(lambda g: inventory.get_resources(*g), groups))
+        assert [len(r) for r in results] == [2, 1, 1]
+        assert len(graph.bodies) == 1
+
+        inventory.invalidate()
+        inventory.get_resources("sub-a", "rg-Payments")
+        assert len(graph.bodies) == 2
+
+
+def test_generator_reads_resources_from_inventory():
+    with FakeResourceGraph(ROWS) as graph:
+        inventory = ResourceGraphInventory(FakeCredential(), endpoint=graph.url)
+        generator = AKSDashboardGenerator("sub-a", "tenant", "client", "secret", resource_inventory=inventory)
+        resources = generator.get_resource_group_resources("rg-modular-demo")
+
+    assert [r.name for r in resources] == ["disk-3"]
+
+
+def test_error_response_raises():
+    with FakeResourceGraph(ROWS) as graph:
+        credential = SimpleNamespace(get_token=lambda *scopes: SimpleNamespace(token="expired"))
+        inventory = ResourceGraphInventory(credential, endpoint=graph.url)
+        with pytest.raises(ResourceGraphError) as error:
+            inventory.query([("sub-a", "rg-Payments")])
+    assert error.value.status == 401
@@ -0,0 +1,63 @@
+import random
+from dataclasses import replace
+
+from aks_aggregates import PodAggregates, PodCounts
+from aks_rollups import PodRollups
+from stub_kube_api import make_pod
+
+
+def random_pods(generator, seed, count=300):
+    rng = random.Random(seed)
+    pods = []
+    for i in range(count):
+        pod = generator._parse_pod(make_pod(i, rng.randint(0, 4)))
+        containers = [replace(c, ready=rng.random() < 0.7, restart_count=rng.choice([0, 0, 1, 5, 20]))
+                      for c in pod.containers]
+        pods.append(replace(pod, status=rng.choice(["Running", "Pending", "Failed", "Evicted"]),
+                            namespace=f"ns-{rng.randint(0, 5)}", node_name=rng.choice(["Unknown", "n1", "n2"]),
+                            containers=containers))
+    return pods
+
+
+def loop_counts(pods):
+    counts = PodCounts()
+    for pod in pods:
+        counts.add(pod)
+    return counts
+
+
+def test_rollups_match_per_pod_counting(generator):
+    for seed in range(20):
+        pods = random_pods(generator, seed)
+        rollups = PodRollups(pods)
+
+        assert rollups.to_dict() == PodAggregates(pods).to_dict()
+        assert list(rollups.by_namespace()) == list(dict.fromkeys(pod.namespace for pod in pods))
+        pairs = rollups.by_node_namespace()
+        assert set(pairs) == {(pod.node_name, pod.namespace) for pod in pods}
+        for (node, namespace), counts in pairs.items():
+            assert counts == loop_counts(p for p in pods if p.node_name == node and p.namespace == namespace)
+        for namespace, phases in rollups.phases().items():
+            statuses = [p.status if p.status != "Evicted" else "Unknown" for p in pods if p.namespace == namespace]
+            assert phases == {phase: statuses.count(phase) for phase in set(statuses)}
+
+
+def test_top_restarters_are_ordered_and_break_ties_by_position(generator):
+    pods = random_pods(generator, 3)
+    rollups = PodRollups(pods)
+    containers = [c for pod in pods for c in pod.containers]
+    expected = sorted(range(len(containers)), key=lambda i: (-containers[i].restart_count, i))[:15]
+
+    top = rollups.top_restarters(15)
+    assert [restarts for _, restarts in top] == [containers[i].restart_count for i in expected]
+    assert [c for c, _ in top] == [containers[i] for i in expected]
+    assert rollups.health(2)["top_restarters"][0]["restarts"] == 20
+
+
+def test_empty_and_restart_free_snapshots(generator):
+    rollups = PodRollups([])
+    assert rollups.to_dict() == PodAggregates([]).to_dict()
+    assert rollups.by_node_namespace() == {} and rollups.top_restarters() == []
+
+    pods = [replace(pod, containers=[replace(c, restart_count=0) for c in pod.containers]) for pod in random_pods(generator, 1, 10)]
+    assert PodRollups(pods).top_restarters() == []
@@ -0,0 +1,129 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+
+from aks_snapshot import ClusterSnapshot, DashboardSnapshot, SnapshotRefresher
+from factories import TARGET, make_cluster_info
+
+
+def make_collector(calls, generator):
+
+    def collect(generation):
+        calls.append(generation)
+        pods = generator._get_mock_kubernetes_data()
+        cluster = ClusterSnapshot(
+            target=TARGET,
+            collected_at=time.time(),
+            cluster_info=make_cluster_info(),
+            resources=(),
+            kubernetes_pods=tuple(pods)
+        )
+        return DashboardSnapshot(
+            generation=generation,
+            collected_at=time.time(),
+            clusters=(cluster,)
+        )
+
+    return collect
+
+
+def test_first_collection_runs_on_start(generator):
+    calls = []
+    refresher = SnapshotRefresher(make_collector(calls, generator), interval=60)
+    refresher.start()
+    try:
+        snapshot = refresher.wait_for(0, timeout=5)
+        assert snapshot.generation == 1
+        assert calls == [1]
+        assert snapshot.age_seconds < 5
+    finally:
+        refresher.stop(timeout=5)
+
+
+def test_trigger_collects_asynchronously(generator):
+    calls = []
+    refresher = SnapshotRefresher(make_collector(calls, generator), interval=60, min_interval=0)
+    refresher.start()
+    try:
+        refresher.wait_for(0, timeout=5)
+        generation = refresher.trigger()
+        snapshot = refresher.wait_for(generation, timeout=5)
+        assert snapshot.generation == generation + 1
+        assert calls == [1, 2]
+    finally:
+        refresher.stop(timeout=5)
+
+
+def test_failed_collection_keeps_previous_snapshot(generator):
+    calls = []
+    collect = make_collector(calls, generator)
+    refresher = SnapshotRefresher(collect)
+    first = refresher.refresh_now()
+
+    def failing(generation):
+        raise RuntimeError("Failed to get cluster info")
+
+    refresher.collect = failing
+    assert refresher.refresh_now() is None
+    assert refresher.current() is first
+    assert refresher.last_error == "Failed to get cluster info"
+
+
+def test_concurrent_refreshes_share_one_collection(generator):
+    calls = []
+    collect = make_collector(calls, generator)
+    release = threading.Event()
+
+    def slow_collect(generation):
+        release.wait(5)
+        return collect(generation)
+
+    refresher = SnapshotRefresher(slow_collect)
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        futures = [executor.submit(refresher.refresh_now) for _ in range(8)]
+        time.sleep(0.2)
+        release.set()
+        snapshots = [future.result() for future in futures]
+
+    assert calls == [1]
+    assert all(snapshot is snapshots[0] for snapshot in snapshots)
+    assert refresher.stats == {"collections": 1, "coalesced": 7, "throttled": 0}
+
+
+def test_trigger_respects_min_interval(generator):
+    calls = []
+    refresher = SnapshotRefresher(make_collector(calls, generator), interval=60, min_interval=60)
+    refresher.start()
+    try:
+        refresher.wait_for(0, timeout=5)
+        generation = refresher.trigger()
+        # Already satisfied by the snapshot collected moments ago
+        assert refresher.wait_for(generation, timeout=0).generation == 1
+        time.sleep(0.2)
+        assert calls == [1]
+        assert refresher.stats["throttled"] == 1
+    finally:
+        refresher.stop(timeout=5)
+
+
+def test_restored_snapshot_is_served_until_the_first_collection(generator):
+    calls = []
+    collect = make_collector(calls, generator)
+    restored = replace(collect(7), restored=True)
+    calls.clear()
+    refresher = SnapshotRefresher(collect, interval=60, min_interval=60)
+    refresher.restore(restored)
+    assert refresher.current() is restored
+    assert refresher.stats["collections"] == 0
+
+    # Restoring neither throttles the first collection nor restarts the generations
+    refresher.start()
+    try:
+        snapshot = refresher.wait_for(7, timeout=5)
+        assert snapshot.generation == 8 and not snapshot.restored
+        assert calls == [8]
+    finally:
+        refresher.stop(timeout=5)
+    refresher.restore(restored)
+    assert refresher.current() is snapshot
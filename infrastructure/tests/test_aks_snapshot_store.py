@@ -0,0 +1,70 @@
+import os
+import sqlite3
+from dataclasses import replace
+
+import pytest
+
+import aks_snapshot_store
+from aks_html_dashboard import NO_RESOURCES, ResourceInfo
+from aks_snapshot_store import SnapshotStore, StoredCluster, StoredSnapshot
+from stub_kube_api import make_pod
+from factories import TARGET, make_cluster_info
+
+
+def make_stored(generator, generation=3):
+    pods = [generator._parse_pod(make_pod(i, i % 3)) for i in range(25)] + generator._get_mock_kubernetes_data()
+    pods[0] = replace(pods[0], created_at=None)
+    failed = replace(TARGET, name="payments")
+    return StoredSnapshot(generation=generation, collected_at=1_700_000_000.25, clusters=[
+        StoredCluster(target=TARGET, collected_at=1_700_000_000.0, cluster_info=make_cluster_info(),
+                      resources=[ResourceInfo("kv", "Microsoft.KeyVault/vaults", "westeurope", "rg", {"env": "prod"})],
+                      kubernetes_pods=pods, timings={"pods": 0.5, "total": 1.25},
+                      source_errors={"resources": "Timed out after 30s"}),
+        StoredCluster(target=failed, collected_at=1_699_999_990.0, cluster_info=None, resources=[],
+                      kubernetes_pods=[], timings={}, error="Failed to get cluster info"),
+    ])
+
+
+def test_round_trip(tmp_path, generator):
+    store = SnapshotStore(str(tmp_path / "snapshot.db"))
+    assert store.load() is None
+    snapshot = make_stored(generator)
+    store.save(snapshot)
+
+    loaded = store.load()
+    assert loaded == snapshot
+    pod = loaded.clusters[0].kubernetes_pods[1]
+    assert all(c.namespace is pod.namespace and c.pod_name == pod.name for c in pod.containers)
+    # Parsed and restored containers share the one empty resources mapping
+    assert all(c.resources is NO_RESOURCES for stored in (snapshot, loaded)
+               for c in stored.clusters[0].kubernetes_pods[1].containers)
+    assert store.stats == {"saves": 1, "loads": 1, "failures": 0}
+
+
+def test_failed_save_keeps_the_previous_snapshot(tmp_path, generator):
+    store = SnapshotStore(str(tmp_path / "snapshot.db"))
+    store.save(make_stored(generator, 3))
+    broken = make_stored(generator, 4)
+    broken.clusters[0].kubernetes_pods[1].containers[0].resources = {"limits": object()}
+
+    with pytest.raises(TypeError):
+        store.save(broken)
+    assert store.load().generation == 3
+    assert os.listdir(tmp_path) == ["snapshot.db"]
+
+
+def test_unreadable_stores_are_ignored(tmp_path, monkeypatch, generator):
+    path = tmp_path / "snapshot.db"
+    path.write_bytes(b"not a database")
+    store = SnapshotStore(str(path))
+    assert store.load() is None
+    assert store.stats["failures"] == 1
+
+    path.unlink()
+    store.save(make_stored(generator))
+    saved_version = aks_snapshot_store.FORMAT_VERSION
+    monkeypatch.setattr(aks_snapshot_store, "FORMAT_VERSION", saved_version + 1)
+    assert store.load() is None
+    # Loading never writes to the file
+    with sqlite3.connect(str(path)) as connection:
+        assert connection.execute("SELECT value FROM meta WHERE key = 'format_version'").fetchone() == (str(saved_version),)
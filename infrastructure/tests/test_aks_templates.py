@@ -0,0 +1,78 @@
+import pytest
+
+from aks_html_dashboard import ContainerInfo, PodInfo, ResourceInfo
+from aks_pod_index import PodIndex
+from aks_templates import get_templates
+from factories import make_cluster_info
+
+
+def make_pod(name, namespace="default"):
+    container = ContainerInfo(name="app", namespace=namespace, pod_name=name, image="nginx:1.25",
+                              status="running", ready=True, restart_count=0, ports=[], resources={})
+    return PodInfo(name=name, namespace=namespace, status="Running", ready="1/1",
+                   containers=[container], node_name="10.0.0.4", created_at=1_700_000_000)
+
+
+def test_page_links_versioned_assets(generator):
+    templates = get_templates()
+    html = generator._create_html_template(make_cluster_info(), [], [make_pod("web-1")])
+
+    assert f'href="/static/dashboard.css?v={templates.asset_versions["dashboard.css"]}"' in html
+    assert f'src="/static/dashboard.js?v={templates.asset_versions["dashboard.js"]}"' in html
+    assert ".metric-card {" not in html
+    assert "Namespace: default (<span data-stat=\"pods\">1</span> pods)" in html
+
+
+def test_standalone_page_inlines_assets(generator):
+    html = generator._create_html_template(make_cluster_info(), [], [], inline_assets=True)
+
+    assert ".metric-card {" in html
+    assert "async function refreshDashboard()" in html
+    assert "/static/" not in html
+    assert "No Kubernetes pods found" in html
+
+
+def test_values_are_escaped(generator):
+    resource = ResourceInfo("disk<1>", "Microsoft.Compute/disks", "westeurope", "rg",
+                            {"owner": "<script>alert(1)</script>"})
+    html = generator._create_html_template(make_cluster_info(), [resource], [make_pod("web-<b>")])
+
+    assert "<script>alert(1)</script>" not in html
+    assert "owner: &lt;script&gt;alert(1)&lt;/script&gt;" in html
+    assert "disk&lt;1&gt;" in html
+    assert "web-&lt;b&gt;" in html
+
+
+def test_lazy_page_carries_namespace_summaries_only(generator):
+    pods = [make_pod(f"web-{i}", namespace=f"team-{i % 2}") for i in range(6)]
+    html = "".join(generator._iter_html_template(make_cluster_info(), [], pods,
+                                                 fragment_url="/cluster/rg/aks/fragment/"))
+
+    assert 'data-src="/cluster/rg/aks/fragment/namespace/team-0"' in html
+    assert "Namespace: team-1 (<span data-stat=\"pods\">3</span> pods)" in html
+    assert "nginx:1.25" not in html
+    assert 'data-src="/cluster/rg/aks/fragment/node/10.0.0.4"' in html
+    assert "pod-item" not in html
+
+    team = PodIndex(pods).namespaces["team-0"]
+    details = get_templates().render("_namespace_details.html", namespace=team, ages=["2d"] * len(team.pods))
+    assert details.count("nginx:1.25") == 3
+    assert "web-0" in details and "web-1" not in details
+    assert details.count(">2d<") == 3
+
+
+def test_failed_render_keeps_the_previous_dashboard_file(generator, tmp_path, monkeypatch):
+    output = tmp_path / "aks-dashboard.html"
+    generator.generate_html_dashboard(make_cluster_info(), [], [make_pod("web-1")], str(output))
+    written = output.read_text(encoding="utf-8")
+    assert "web-1" in written
+
+    def failing_render(*args, **kwargs):
+        yield "<html>"
+        raise RuntimeError("render failed")
+
+    monkeypatch.setattr(generator, "_iter_html_template", failing_render)
+    with pytest.raises(RuntimeError):
+        generator.generate_html_dashboard(make_cluster_info(), [], [make_pod("web-2")], str(output))
+    assert output.read_text(encoding="utf-8") == written
+    assert [path.name for path in tmp_path.iterdir()] == ["aks-dashboard.html"]